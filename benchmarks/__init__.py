@@ -0,0 +1,9 @@
+#!/usr/bin/python
+# -*-coding: utf-8 -*-
+
+# Benchmarks of Validator on synthetic CSV files, run them with
+#
+#   python -m benchmarks --rows 100000 --output results.json
+#   python -m benchmarks --rows 100000 --compare results.json
+#
+# Benchmarks are not shipped with the package.
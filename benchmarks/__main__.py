@@ -0,0 +1,116 @@
+#!/usr/bin/python
+# -*-coding: utf-8 -*-
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+
+from benchmarks import suite
+
+
+def git_commit():
+    try:
+        return (
+            subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True
+            )
+            .stdout.decode()
+            .strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark pycsvschema Validator")
+    parser.add_argument("--features", nargs="+", choices=list(suite.FEATURES), help="Features to run, default: all")
+    parser.add_argument("--rows", type=int, default=10000, help="Rows of each CSV file")
+    parser.add_argument("--width", type=int, default=10, help="Columns of each CSV file")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a cell being invalid")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs of each feature")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the CSV generator")
+    parser.add_argument("--batch-size", type=int, default=None, help="batch_size of Validator")
+    parser.add_argument("--jobs", type=int, default=None, help="jobs of Validator")
+    parser.add_argument("--cache-size", type=int, default=None, help="cache_size of Validator")
+    parser.add_argument("--memory-map", action="store_true", help="memory_map of Validator")
+    parser.add_argument("--output", help="Write results into this JSON file")
+    parser.add_argument("--compare", help="Compare rows_per_sec and peak_memory with results in this JSON file")
+    return parser.parse_args(argv)
+
+
+def print_table(results, baseline=None):
+    columns = "{0:<14}{1:>14}{2:>10}{3:>14}{4:>10}{5:>10}"
+    print(columns.format("feature", "rows/sec", "speedup", "peak memory", "memory", "errors"))
+    for feature, result in results.items():
+        speedup = memory = ""
+        previous = (baseline or {}).get(feature)
+        if previous and previous["rows_per_sec"] and result["rows_per_sec"]:
+            speedup = "{0:.2f}x".format(result["rows_per_sec"] / previous["rows_per_sec"])
+        if previous and previous["peak_memory"]:
+            memory = "{0:.2f}x".format(result["peak_memory"] / previous["peak_memory"])
+        print(
+            columns.format(
+                feature,
+                "{0:,.0f}".format(result["rows_per_sec"] or 0),
+                speedup,
+                "{0:,}".format(result["peak_memory"]),
+                memory,
+                result["errors"],
+            )
+        )
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    options = {}
+    if args.batch_size is not None:
+        options["batch_size"] = args.batch_size
+    if args.jobs is not None:
+        options["jobs"] = args.jobs
+    if args.cache_size is not None:
+        options["cache_size"] = args.cache_size
+    if args.memory_map:
+        options["memory_map"] = True
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = suite.run(
+            directory,
+            features=args.features,
+            rows=args.rows,
+            width=args.width,
+            error_rate=args.error_rate,
+            repeat=args.repeat,
+            seed=args.seed,
+            **options,
+        )
+
+    parameters = {key: value for key, value in vars(args).items() if key not in ("output", "compare")}
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        # Results are only comparable when they are run with the same parameters
+        if baseline["parameters"] != parameters:
+            print("Warning: parameters differ from {0}: {1}".format(args.compare, baseline["parameters"]))
+        baseline = baseline["results"]
+    print_table(results, baseline)
+
+    if args.output:
+        report = {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": parameters,
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/python
+# -*-coding: utf-8 -*-
+
+import csv
+import datetime
+import random as random_module
+import string
+import uuid
+
+from pycsvschema import defaults, utilities
+
+# Generate synthetic CSV rows from a schema
+#
+# Values are generated from the options of each field schema. Fields with `pattern` are generated from `examples`,
+# since values can not be generated from an arbitrary regex. With error_rate, cells are replaced by values failing
+# one of the options of the field.
+
+INVALID_VALUE = "#invalid"
+DATETIME_START = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+DATETIME_RANGE = 20 * 365 * 24 * 3600
+
+
+def resolve_field_schema(schema, field_schema):
+    if "$ref" in field_schema:
+        return schema.get("definitions", defaults.DEFINITIONS)[field_schema["$ref"]]
+    return field_schema
+
+
+def column_schemas(schema, header):
+    """
+    Find the field schema of each column in header, by `fields` first and then `patternFields`
+
+    :return: List of field schemas, None for columns without field schema
+    """
+    fields = {}
+    for field_schema in schema.get("fields", defaults.FIELDS):
+        fields.setdefault(field_schema["name"], resolve_field_schema(schema, field_schema))
+
+    field_schemas = []
+    for column in header:
+        field_schema = fields.get(column)
+        if field_schema is None:
+            for pattern, pattern_schema in schema.get("patternFields", defaults.PATTERNFIELDS).items():
+                if utilities.compile_regex(pattern).match(column):
+                    field_schema = resolve_field_schema(schema, pattern_schema)
+                    break
+        field_schemas.append(field_schema)
+    return field_schemas
+
+
+def random_word(random, minlength=1, maxlength=12):
+    return "".join(random.choice(string.ascii_lowercase) for _ in range(random.randint(minlength, maxlength)))
+
+
+def number_range(field_schema, step):
+    minimum = field_schema.get("minimum", 0)
+    maximum = field_schema.get("maximum", minimum + 1000)
+    if field_schema.get("exclusiveMinimum", defaults.FIELDS_EXCLUSIVEMININUM):
+        minimum += step
+    if field_schema.get("exclusiveMaximum", defaults.FIELDS_EXCLUSIVEMAXIMUM):
+        maximum -= step
+    return minimum, maximum
+
+
+def string_value(field_schema, random):
+    value_format = field_schema.get("format", defaults.FIELDS_FORMAT)
+    if value_format == "email":
+        return "{0}.{1}@example.com".format(random_word(random), random.randrange(10000))
+    if value_format == "uri":
+        return "https://example.com/{0}".format(random_word(random))
+    if value_format == "uuid":
+        return str(uuid.UUID(int=random.getrandbits(128), version=4))
+    if value_format == "ipv4":
+        return ".".join(str(random.randrange(256)) for _ in range(4))
+    if value_format == "ipv6":
+        return ":".join("{0:x}".format(random.randrange(1 << 16)) for _ in range(8))
+    if value_format == "hostname":
+        return "{0}.example.com".format(random_word(random))
+    if value_format == "datetime":
+        pattern = field_schema.get("datetimePattern", defaults.FIELDS_FORMAT_DATETIME_PATTERN)
+        return (DATETIME_START + datetime.timedelta(seconds=random.randrange(DATETIME_RANGE))).strftime(pattern)
+
+    if field_schema.get("pattern", defaults.FIELDS_TYPE_STRING_PATTERN):
+        if not field_schema.get("examples"):
+            raise ValueError("Can not generate values of pattern {0} without examples".format(field_schema["pattern"]))
+        return random.choice(field_schema["examples"])
+
+    minlength = field_schema.get("minLength", 1)
+    return random_word(random, minlength, field_schema.get("maxLength", max(minlength, 12)))
+
+
+def valid_value(field_schema, random):
+    """
+    Generate a string value passing all options of field_schema
+    """
+    if field_schema is None:
+        return random_word(random)
+
+    if "enum" in field_schema:
+        return str(random.choice(field_schema["enum"]))
+
+    type_name = field_schema.get("type", defaults.FIELDS_TYPE)
+    if type_name == "boolean":
+        return random.choice(
+            sorted(field_schema.get("trueValues", defaults.FIELDS_TRUEVALUES))
+            + sorted(field_schema.get("falseValues", defaults.FIELDS_FALSEVALUES))
+        )
+    if type_name == "integer":
+        step = field_schema.get("multipleOf", 1)
+        minimum, maximum = number_range(field_schema, 1)
+        return str(random.randint(-(-minimum // step), maximum // step) * step)
+    if type_name == "number":
+        if "multipleOf" in field_schema:
+            step = field_schema["multipleOf"]
+            minimum, maximum = number_range(field_schema, step)
+            return str(random.randint(int(-(-minimum // step)), int(maximum // step)) * step)
+        minimum, maximum = number_range(field_schema, 0.001)
+        return str(round(random.uniform(minimum, maximum), 3))
+    return string_value(field_schema, random)
+
+
+def invalid_value(field_schema):
+    """
+    Generate a string value failing one option of field_schema, or None if every value passes
+    """
+    if field_schema is None:
+        return None
+
+    type_name = field_schema.get("type", defaults.FIELDS_TYPE)
+    if type_name != "string" or "enum" in field_schema:
+        return INVALID_VALUE
+    if field_schema.get("format", defaults.FIELDS_FORMAT) or field_schema.get("pattern"):
+        return INVALID_VALUE
+    if "maxLength" in field_schema:
+        return "x" * (field_schema["maxLength"] + 1)
+    if field_schema.get("minLength", 0) > 1:
+        return "x"
+    return None
+
+
+def generate_rows(schema, header, rows, error_rate=0.0, seed=0):
+    """
+    Generate rows of header
+
+    :param schema: CSV schema
+    :param header: List of column names
+    :param rows: Number of rows
+    :param error_rate: Probability of each cell being replaced by an invalid value
+    :param seed: Seed of the random generator, the same arguments always generate the same rows
+    """
+    random = random_module.Random(seed)
+    field_schemas = column_schemas(schema, header)
+    invalid_values = [invalid_value(field_schema) for field_schema in field_schemas]
+
+    for _ in range(rows):
+        row = []
+        for field_schema, invalid in zip(field_schemas, invalid_values):
+            if invalid is not None and error_rate and random.random() < error_rate:
+                row.append(invalid)
+            else:
+                row.append(valid_value(field_schema, random))
+        yield row
+
+
+def write_csv(csvfile, schema, header, rows, error_rate=0.0, seed=0):
+    with open(csvfile, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(generate_rows(schema=schema, header=header, rows=rows, error_rate=error_rate, seed=seed))
@@ -0,0 +1,139 @@
+#!/usr/bin/python
+# -*-coding: utf-8 -*-
+
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+from pycsvschema import collectors
+from pycsvschema.checker import Validator
+
+from benchmarks import generators
+
+# Each feature builds a schema and a header of `width` columns exercising one group of schema options, so features
+# can be compared with each other and the same feature can be compared across commits.
+
+
+def fields_feature(field_schema):
+    def build(width):
+        header = ["c{0}".format(i) for i in range(width)]
+        return {"fields": [dict(field_schema, name=column) for column in header]}, header
+
+    return build
+
+
+def patternfields_feature(width):
+    header = ["p{0}".format(i) for i in range(width)]
+    schema = {
+        "patternFields": {
+            "^q\\d+$": {"type": "string", "format": "email"},
+            "^p\\d+$": {"type": "number", "minimum": 0, "maximum": 1000},
+        }
+    }
+    return schema, header
+
+
+def definitions_feature(width):
+    header = ["c{0}".format(i) for i in range(width)]
+    schema = {
+        "definitions": {"amount": {"type": "number", "minimum": 0, "maximum": 1000}},
+        "fields": [{"name": column, "$ref": "amount"} for column in header],
+    }
+    return schema, header
+
+
+FEATURES = {
+    "string": fields_feature({"type": "string"}),
+    "number": fields_feature({"type": "number"}),
+    "integer": fields_feature({"type": "integer"}),
+    "boolean": fields_feature({"type": "boolean"}),
+    "email": fields_feature({"type": "string", "format": "email"}),
+    "uuid": fields_feature({"type": "string", "format": "uuid"}),
+    "ipv4": fields_feature({"type": "string", "format": "ipv4"}),
+    "datetime": fields_feature({"type": "string", "format": "datetime"}),
+    "pattern": fields_feature({"type": "string", "pattern": "[A-Z]{2}-\\d{4}", "examples": ["AB-1234", "ZZ-0001"]}),
+    "length": fields_feature({"type": "string", "minLength": 2, "maxLength": 8}),
+    "enum": fields_feature({"type": "string", "enum": ["new", "open", "closed", "void", "pending"]}),
+    "minmax": fields_feature({"type": "number", "minimum": 0, "maximum": 1000}),
+    "multipleof": fields_feature({"type": "integer", "multipleOf": 5, "minimum": 0, "maximum": 1000}),
+    "unique": fields_feature({"type": "string", "format": "uuid", "unique": True}),
+    "patternfields": patternfields_feature,
+    "definitions": definitions_feature,
+}
+
+
+def prepare(feature, directory, rows, width, error_rate=0.0, seed=0):
+    """
+    Write the CSV file of a feature into directory
+
+    :return: Tuple of (schema, path to CSV file)
+    """
+    schema, header = FEATURES[feature](width)
+    csvfile = os.path.join(directory, "{0}-{1}x{2}-{3}.csv".format(feature, rows, width, error_rate))
+    generators.write_csv(csvfile=csvfile, schema=schema, header=header, rows=rows, error_rate=error_rate, seed=seed)
+    return schema, csvfile
+
+
+def validate(csvfile, schema, **options):
+    """
+    Validate the whole file, errors are only counted
+
+    :return: Number of errors
+    """
+    collector = collectors.ErrorCollector(keep_errors=False)
+    Validator(csvfile=csvfile, schema=schema, collector=collector, **options).validate()
+    return collector.total
+
+
+def measure(csvfile, schema, rows, repeat=3, **options):
+    """
+    Time validations of csvfile, then measure memory in one more run, since tracing memory slows the validation down
+
+    The best time of repeat runs is used for rows_per_sec, as it is the least affected by other processes.
+
+    Peak memory and allocated blocks are measured with tracemalloc. tracemalloc does not count allocations, so
+    allocated_blocks is the number of memory blocks still allocated after the validation, which catches leaks and
+    caches growing with the file, while peak_memory catches temporary allocations.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        errors = validate(csvfile, schema, **options)
+        times.append(time.perf_counter() - start)
+
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    try:
+        validate(csvfile, schema, **options)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    allocated_blocks = sys.getallocatedblocks() - blocks
+
+    best = min(times)
+    return {
+        "rows": rows,
+        "errors": errors,
+        "seconds": best,
+        "median_seconds": statistics.median(times),
+        "rows_per_sec": rows / best if best else None,
+        "peak_memory": peak_memory,
+        "allocated_blocks": allocated_blocks,
+    }
+
+
+def run(directory, features=None, rows=10000, width=10, error_rate=0.0, repeat=3, seed=0, **options):
+    """
+    Benchmark features, CSV files are written into directory
+
+    :param features: List of feature names. Default: None, all features.
+    :param options: Other options of Validator, e.g. batch_size, jobs
+    :return: Dict of feature name and its measurements
+    """
+    results = {}
+    for feature in features or FEATURES:
+        schema, csvfile = prepare(feature, directory, rows=rows, width=width, error_rate=error_rate, seed=seed)
+        results[feature] = measure(csvfile, schema, rows=rows, repeat=repeat, **options)
+    return results
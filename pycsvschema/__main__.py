@@ -0,0 +1,9 @@
+#!/usr/bin/python
+# -*-coding: utf-8 -*-
+
+import sys
+
+from pycsvschema.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
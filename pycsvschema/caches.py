@@ -0,0 +1,52 @@
+#!/usr/bin/python
+# -*-coding: utf-8 -*-
+
+import collections
+
+# Check results of a column are cached by raw value, so repeated values in low-cardinality columns, e.g. country codes
+# and status flags, skip missingValues, type conversion and all other checks. The cache turns itself off for columns
+# whose values rarely repeat, where it would only cost time and memory.
+
+# Number of lookups before the hit rate is judged
+CACHE_WARMUP = 1024
+CACHE_MIN_HIT_RATE = 0.5
+
+
+class ValueCache(object):
+    def __init__(self, size, warmup=CACHE_WARMUP, min_hit_rate=CACHE_MIN_HIT_RATE):
+        """
+        Bounded LRU cache of check results of one column, keyed by raw value
+
+        :param size: Maximum number of cached values
+        :param warmup: Number of lookups before the hit rate is judged
+        :param min_hit_rate: The cache is disabled after warmup lookups if its hit rate is lower than min_hit_rate
+        """
+        self.size = size
+        self.warmup = warmup
+        self.min_hit_rate = min_hit_rate
+        self.enabled = True
+        self.lookups = 0
+        self.hits = 0
+        self.entries = collections.OrderedDict()
+
+    def get(self, key):
+        """
+        :return: Cached entry, or None if key is not cached
+        """
+        self.lookups += 1
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        # Judged whether lookup number warmup is a hit or a miss
+        if self.lookups == self.warmup and self.hits < self.min_hit_rate * self.lookups:
+            self.enabled = False
+            self.entries.clear()
+        return entry
+
+    def put(self, key, entry):
+        if not self.enabled:
+            return
+        self.entries[key] = entry
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
@@ -1,20 +1,85 @@
 #!/usr/bin/python
 # -*-coding: utf-8 -*-
 
+import asyncio
+import collections
+import concurrent.futures
 import csv
+import functools
+import hashlib
 import json
+import os
+import threading
+import time
 from itertools import chain
-from typing import Dict, Optional
+from operator import itemgetter
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import jsonschema
-from pycsvschema import defaults, definitions, validators, utilities
+from pycsvschema import (
+    caches,
+    checkpoints,
+    collectors,
+    defaults,
+    definitions,
+    exceptions,
+    instruments,
+    keys,
+    parallel,
+    profiles,
+    readers,
+    sampling,
+    validators,
+    utilities,
+)
+
+# Number of distinct valid schemas memoized by validate_schema
+SCHEMA_CACHE_SIZE = 1024
+
+_valid_schemas = collections.OrderedDict()
+_valid_schemas_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def load_meta_schema(meta_schema_path: str):
+    """
+    Load the meta schema and build its jsonschema validator once per process
+    """
+    with open(meta_schema_path, "r") as meta_schema_file:
+        meta_schema = json.load(meta_schema_file)
 
+    validator_class = jsonschema.validators.validator_for(meta_schema)
+    validator_class.check_schema(meta_schema)
+    return validator_class(meta_schema)
 
-class Cell(object):
-    def __init__(self, value, row_number: int, column_name: str):
-        self.value = value
-        self.row_number = row_number
-        self.column_name = column_name
+
+def validate_schema(schema: Dict, meta_schema_path: str = definitions.META_SCHEMA_PATH):
+    """
+    Validate schema against the meta schema, raise jsonschema.ValidationError like jsonschema.validate does
+
+    Valid schemas are memoized by the hash of their content, so a schema is only validated once per process.
+    """
+    try:
+        content = json.dumps(schema, sort_keys=True).encode("utf-8")
+    except (TypeError, ValueError):
+        # Schema which can not be serialized is always validated
+        key = None
+    else:
+        key = (meta_schema_path, hashlib.sha256(content).digest())
+        with _valid_schemas_lock:
+            if key in _valid_schemas:
+                _valid_schemas.move_to_end(key)
+                return
+
+    error = jsonschema.exceptions.best_match(load_meta_schema(meta_schema_path).iter_errors(schema))
+    if error is not None:
+        raise error
+
+    if key is not None:
+        with _valid_schemas_lock:
+            _valid_schemas[key] = None
+            if len(_valid_schemas) > SCHEMA_CACHE_SIZE:
+                _valid_schemas.popitem(last=False)
 
 
 class RFCDialect(csv.Dialect):
@@ -32,14 +97,71 @@ class RFCDialect(csv.Dialect):
 
 
 class Validator:
-    def __init__(self, csvfile: str, schema: Dict, output: Optional[str] = None, errors: str = "raise", strict=True):
+    def __init__(
+        self,
+        csvfile: Union[str, os.PathLike, bytes, IO, Iterable],
+        schema: Dict,
+        output: Optional[str] = None,
+        errors: str = "raise",
+        strict=True,
+        batch_size: Optional[int] = None,
+        jobs: Optional[int] = None,
+        encoding: Optional[str] = None,
+        collector: Optional[collectors.ErrorCollector] = None,
+        profiler: Optional[profiles.Profiler] = None,
+        instruments: Optional[instruments.Instruments] = None,
+        cache_size: Optional[int] = None,
+        memory_map: bool = False,
+        key_memory: Optional[int] = None,
+        key_directory: Optional[str] = None,
+        key_bloom_filter: bool = False,
+        sampler: Optional[sampling.Sampler] = None,
+        checkpoint: Optional[str] = None,
+        checkpoint_interval: float = checkpoints.CHECKPOINT_INTERVAL,
+        resume: bool = False,
+    ):
         """
-        :param csvfile: Path to CSV file
+        :param csvfile: Path to CSV file, bytes, text or binary file-like object, or iterable of lines, bytes chunks or
+        pre-split rows. Binary input is decoded incrementally. See pycsvschema.readers.
         :param schema: CSV Schema in dict
         :param output: Path to output file of errors. If output is None, print the error message. Default: None.
         :param errors: {'raise', 'coerce'} If error is 'raise', stop the validation when it meets the first error. If
         error is 'coerce', output all errors.
         :param strict: Whether to follow RFC 4180 strictly when parsing CSV file
+        :param batch_size: If batch_size is None, check rows one by one. Otherwise, read batch_size rows at a time and
+        check them column by column, numeric checks are vectorized if numpy is installed. Default: None.
+        :param jobs: If jobs is None, check rows in current process. Otherwise, split csvfile into chunks of records
+        and check them in jobs processes, header is still checked once in current process. csvfile must be a path,
+        compressed files are checked in current process. Default: None.
+        :param encoding: Encoding of csvfile. Default: None, the locale encoding for path and utf-8 for binary input.
+        :param collector: If collector is given, errors are added to it instead of being raised or written, output and
+        errors are ignored, and reading stops once the collector reaches its max_errors. Default: None.
+        :param profiler: If profiler is given, profile columns in it while checking rows, e.g. missing values, value
+        ranges and distinct counts. Default: None.
+        :param instruments: If instruments is given, record calls, failures and time of every validator of every
+        column in it, and time of parsing and checking rows. Default: None.
+        :param cache_size: If cache_size is given, cache check results of up to cache_size distinct values of each
+        column when rows are checked one by one, so repeated values are checked only once. The cache of a column turns
+        itself off if values rarely repeat, see pycsvschema.caches. Default: None.
+        :param memory_map: Whether to map csvfile into memory and parse records from the mapped bytes, only fields of
+        columns with validators are decoded. It is used if csvfile is an uncompressed path in an ASCII compatible
+        encoding, see pycsvschema.readers.MappedReader. Default: False.
+        :param key_memory: Memory limit in bytes for checking `unique` and `primaryKey`, keys are spilled to disk
+        beyond it. Default: None, pycsvschema.keys.KEY_MEMORY_LIMIT.
+        :param key_directory: Directory to spill keys into. Default: None, the system temporary directory.
+        :param key_bloom_filter: Whether to prefilter spilled keys with Bloom filters, see pycsvschema.keys.KeyIndex.
+        Default: False.
+        :param sampler: If sampler is given, check the header and a sample of rows instead of every row, and estimate
+        error rates of columns in it, see pycsvschema.sampling. jobs is ignored. Default: None.
+        :param checkpoint: Path to checkpoint file. If checkpoint is given, the offset, row number and state of the
+        validation are written into it every checkpoint_interval seconds, and it is removed when the validation
+        finishes, see pycsvschema.checkpoints. csvfile must be an uncompressed path in an ASCII compatible encoding,
+        jobs and sampler are not supported. The state is pickled, so only resume from a checkpoint in a location no one
+        else can write to, a checkpoint owned by another user or writable by others is refused. Default: None.
+        :param checkpoint_interval: Seconds between two checkpoints. Default: 60.
+        :param resume: Whether to resume from checkpoint if it exists. Collector, profiler and instruments must be new,
+        they are restored from the checkpoint, and output is cut back to its size at the checkpoint. Errors which are
+        yielded after the checkpoint by the interrupted validation are yielded again. Default: False.
         """
 
         self.csvfile = csvfile
@@ -54,10 +176,56 @@ class Validator:
             raise ValueError("Unknown value for parameter errors")
         self.errors = errors
 
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        self.batch_size = batch_size
+
+        if jobs is not None and jobs < 1:
+            raise ValueError("jobs must be a positive integer")
+        self.jobs = jobs
+
+        self.encoding = encoding
+
+        self.collector = collector
+
+        self.profiler = profiler
+
+        self.instruments = instruments
+
+        if cache_size is not None and cache_size < 1:
+            raise ValueError("cache_size must be a positive integer")
+        self.cache_size = cache_size
+
+        self.memory_map = memory_map
+
+        if key_memory is not None and key_memory < 1:
+            raise ValueError("key_memory must be a positive integer")
+        self.key_memory = key_memory
+        self.key_directory = key_directory
+        self.key_bloom_filter = key_bloom_filter
+        # Keys of the file being checked, see create_key_checker
+        self.key_checker = None
+
+        self.sampler = sampler
+
+        if checkpoint is not None and (jobs is not None or sampler is not None):
+            raise ValueError("checkpoint does not support jobs or sampler")
+        if checkpoint_interval < 0:
+            raise ValueError("checkpoint_interval must not be negative")
+        self.checkpoint = checkpoint
+        self.checkpoint_interval = checkpoint_interval
+        self.resume = resume
+        # File errors are written into by validate, its size is kept in checkpoints
+        self.output_file = None
+
         self.header = []
         self.header_length = None
 
         self.column_validators = {"columns": {}, "unfoundfields": {}}
+        # Compiled check functions of columns, keyed by whether they are compiled for batches
+        self.column_checks = {}
+        # Column validators, column checks and header errors prepared for each header
+        self._headers = {}
 
         self._meta_schema_path = definitions.META_SCHEMA_PATH
 
@@ -81,27 +249,168 @@ class Validator:
         )
 
     def validate_schema(self):
-        with open(self._meta_schema_path, "r") as meta_schema:
-            jsonschema.validate(self.schema, json.load(meta_schema))
+        validate_schema(schema=self.schema, meta_schema_path=self._meta_schema_path)
 
     def validate(self):
-        with open(self.csvfile, "r") as csvfile:
-            csv_reader = csv.reader(csvfile, dialect=self.csv_dialect)
-
-            # Read first line as header
-            self.header = next(csv_reader)
-            self.header_length = len(self.header)
-
-            self.prepare_field_schema()
-
-            with utilities.file_writer(self.output) as output:
-                # Concat errors from header checking and row checking
-                for error in chain(self.check_header(), self.check_rows(csv_reader)):
+        if self.collector is not None:
+            for _ in self.collector.collect(self.iter_errors()):
+                pass
+            return
+
+        resumed = checkpoints.load_header(self)
+        position = None if resumed is None or self.output is None else resumed["output_size"]
+        with utilities.file_writer(self.output, position=position) as output:
+            self.output_file = None if self.output is None else output
+            try:
+                for error in self.iter_errors():
                     if self.errors == "raise":
-                        raise error
+                        raise error.to_exception()
                     else:
                         output.write(str(error))
                         output.write("\n")
+            finally:
+                self.output_file = None
+
+    def check_file(self, csvfile) -> List[exceptions.ValidationError]:
+        """
+        Point this validator to another CSV file and return all errors of it
+
+        Schema, dialect and prepared validators of this validator are reused, see prepare_header.
+        """
+        self.csvfile = csvfile
+        return list(self.iter_errors())
+
+    def iter_errors(self):
+        """
+        Yield errors of csvfile, errors from header checking come before errors from row checking
+        """
+        # A sample is always checked in current process
+        jobs = None if self.sampler is not None else self.jobs
+        if jobs is not None and not readers.is_path(self.csvfile):
+            raise ValueError("csvfile must be a path to check rows in multiple processes")
+        # Compressed file can not be split into byte ranges, nor a file whose record boundaries can not be found by
+        # counting quote chars, they are checked in current process
+        chunked = (
+            jobs is not None
+            and readers.detect_compression(self.csvfile) is None
+            and parallel.can_split(self.csv_dialect)
+        )
+        if self.checkpoint is not None and not readers.can_map(self.csvfile, self.csv_dialect, self.encoding):
+            raise ValueError("csvfile must be an uncompressed path in an ASCII compatible encoding to checkpoint")
+        resumed = checkpoints.load_state(self)
+        finished = False
+
+        try:
+            with readers.open_rows(
+                self.csvfile, dialect=self.csv_dialect, encoding=self.encoding, memory_map=self.memory_map
+            ) as csv_reader:
+                # Read first line as header
+                self.header = next(csv_reader, None)
+                if self.header is None:
+                    raise ValueError("CSV file has no header")
+                self.header_length = len(self.header)
+
+                # Header errors are yielded before the checkpoint
+                for error in self.prepare_header():
+                    if resumed is None:
+                        yield error
+
+                if isinstance(csv_reader, readers.MappedReader):
+                    # Fields of columns without validators or keys are never read
+                    csv_reader.select(self.read_columns(), self.header_length)
+
+                self.key_checker = self.create_key_checker()
+                if self.checkpoint is not None:
+                    yield from checkpoints.check_rows(validator=self, resumed=resumed)
+                elif self.sampler is not None:
+                    yield from sampling.check_rows(validator=self, sampler=self.sampler, csv_reader=csv_reader)
+                elif chunked:
+                    yield from parallel.check_rows(validator=self, jobs=self.jobs)
+                elif self.batch_size is not None:
+                    yield from self.check_batches(csv_reader)
+                else:
+                    yield from self.check_rows(csv_reader)
+
+                # Duplicates of keys spilled to disk are found after all rows
+                if self.key_checker is not None:
+                    yield from self.key_checker.finish()
+                finished = True
+        finally:
+            if self.checkpoint is not None and finished:
+                checkpoints.remove(self)
+            # Keys spilled to disk are kept for the checkpoint of an interrupted validation
+            if self.key_checker is not None and (self.checkpoint is None or finished):
+                self.key_checker.close()
+            self.key_checker = None
+            if self.instruments is not None:
+                self.instruments.finish()
+
+    async def iter_errors_async(self, stream, executor: Optional[concurrent.futures.Executor] = None):
+        """
+        Async generator of errors of CSV data read from an async stream, e.g. aiohttp StreamReader
+
+        Data is checked in pieces of at most readers.READ_SIZE. Between two pieces, control goes back to the event loop,
+        or pieces are checked in executor if it is given, so the event loop is never blocked for long.
+
+        :param stream: Object with coroutine read(size), or async iterable of str or bytes chunks
+        :param executor: Executor to check data in. Default: None, check data in the event loop.
+        """
+        loop = asyncio.get_event_loop()
+        feed = FeedValidator.from_validator(self)
+
+        async def run(function, *args):
+            if executor is None:
+                errors = function(*args)
+                await asyncio.sleep(0)
+                return errors
+            return await loop.run_in_executor(executor, function, *args)
+
+        async for chunk in readers.iter_async_chunks(stream):
+            for piece in readers.split_chunk(chunk):
+                for error in await run(feed.push, piece):
+                    yield error
+
+        for error in await run(feed.close):
+            yield error
+
+    async def validate_async(self, stream, executor: Optional[concurrent.futures.Executor] = None):
+        """
+        Async version of validate, reading CSV data from an async stream, see iter_errors_async
+        """
+        if self.collector is not None:
+            errors = self.iter_errors_async(stream, executor=executor)
+            async for error in errors:
+                if not self.collector.add(error):
+                    await errors.aclose()
+                    return
+            return
+
+        with utilities.file_writer(self.output) as output:
+            async for error in self.iter_errors_async(stream, executor=executor):
+                if self.errors == "raise":
+                    raise error.to_exception()
+                else:
+                    output.write(str(error))
+                    output.write("\n")
+
+    def prepare_header(self):
+        """
+        Prepare validators for self.header and check the header
+
+        Column validators, compiled column checks and header errors only depend on the schema and the header, so they
+        are prepared once for each header and reused when this validator checks other files with the same header.
+
+        :return: List of errors from header checking
+        """
+        key = tuple(self.header)
+        if key not in self._headers:
+            self.column_validators = {"columns": {}, "unfoundfields": {}}
+            self.column_checks = {}
+            self.prepare_field_schema()
+            self._headers[key] = (self.column_validators, self.column_checks, list(self.check_header()))
+
+        self.column_validators, self.column_checks, header_errors = self._headers[key]
+        return header_errors
 
     def prepare_field_schema(self):
         """
@@ -183,28 +492,410 @@ class Validator:
         yield from validators.header_validators.field_required(
             header=self.header, schema=self.schema, column_validators=self.column_validators
         )
+        yield from validators.header_validators.field_keys(
+            header=self.header, schema=self.schema, column_validators=self.column_validators
+        )
 
-    # TODO: document for callback
-    def check_rows(self, csvreader, callback=lambda *args: None):
-        for row_index, row in enumerate(csvreader):
-            row_number = row_index + 1
+    def read_columns(self):
+        """
+        :return: Set of indexes of columns read when checking rows, that is, columns with validators or in keys
+        """
+        return set(self.column_validators["columns"]).union(*(key["indexes"] for key in self.column_validators["keys"]))
 
-            validators.rfc4180_validators.number_of_fields(
-                row=row, row_number=row_number, header_length=self.header_length
-            )
+    def create_key_checker(self):
+        """
+        Create a KeyChecker for `unique` and `primaryKey` of the current header, a new one is needed for every file
+
+        :return: KeyChecker, or None if there is no key to check
+        """
+        if not self.column_validators["keys"]:
+            return None
+        return keys.KeyChecker(
+            self.column_validators["keys"],
+            missing_values=validators.data_validators.find_missing_values(self.schema),
+            memory_limit=self.key_memory,
+            directory=self.key_directory,
+            bloom_filter=self.key_bloom_filter,
+            stable_fingerprints=self.checkpoint is not None,
+        )
 
-            for index, column_info in self.column_validators["columns"].items():
-                # TODO: replace cell
-                # cell = Cell(value=row[index], row_number=row_number, column_name=self.header[index])
-                cell = {"value": row[index], "row_number": row_number, "column_name": self.header[index]}
+    def compile_column_validators(self, batch=False):
+        """
+        Compile validators of every column into check functions, so options in field schema are resolved only once
+        instead of once per cell. If batch is True, compile them into batch check functions.
+
+        Header validators (definitions, patternFields and exactFields) update self.column_validators, so this must run
+        after check_header.
+
+        Sample return value
+        [
+            (
+                0,
+                '<COLUMN_NAME>',
+                [<function field_type.<locals>.check>, <function field_maximum.<locals>.check>],
+                ['field_type', 'field_maximum'],
+            ),
+        ]
+        """
+        if batch in self.column_checks:
+            return self.column_checks[batch]
+
+        # Columns with the same name share one column_info, compile it once
+        compiled = {}
+        column_checks = []
+        for index, column_info in self.column_validators["columns"].items():
+            checks, names = compiled.get(id(column_info), (None, None))
+            if checks is None:
+                if batch:
+                    compilers = (
+                        functools.partial(
+                            validators.batch_validators.find_batch_validator(validator), column_name=self.header[index]
+                        )
+                        for validator in column_info["validators"]
+                    )
+                else:
+                    compilers = column_info["validators"]
+                checks = []
+                names = []
+                for validator, compiler in zip(column_info["validators"], compilers):
+                    check = compiler(schema=self.schema, field_schema=column_info["field_schema"])
+                    if check is not None:
+                        checks.append(check)
+                        names.append(validator.__name__)
+                compiled[id(column_info)] = checks, names
+            column_checks.append((index, self.header[index], checks, names))
+
+        self.column_checks[batch] = column_checks
+        return column_checks
+
+    def compile_row_checker(self):
+        """
+        Compile a function checking one row, which accepts the row and its row number and returns a list of errors
 
-                # Update cell['value'] to None if value is in missingValues
-                yield from validators.data_validators.missingvalues(
-                    cell=cell, schema=self.schema, column_validators=self.column_validators
+        This must run after check_header, see compile_column_validators.
+        """
+        column_checks = self.compile_column_validators()
+        if self.instruments is not None:
+            column_checks = self.instruments.instrument(column_checks)
+        # missingValues is looked up in place, instead of calling validators.data_validators.missingvalues every cell
+        missing_values = validators.data_validators.find_missing_values(self.schema)
+        header_length = self.header_length
+        profiler = self.profiler
+        cache_size = self.cache_size
+        key_checker = self.key_checker
+        # One cell object per column is reused by every row, check functions never keep it
+        column_cells = [
+            (
+                index,
+                validators.data_validators.Cell(column_name=column_name, column_index=index),
+                checks,
+                None if profiler is None else profiler.column(index, column_name),
+                None if cache_size is None else caches.ValueCache(size=cache_size),
+            )
+            for index, column_name, checks, _ in column_checks
+        ]
+
+        def check_row(row, row_number):
+            if profiler is not None:
+                profiler.rows += 1
+
+            if len(row) != header_length:
+                if profiler is not None:
+                    profiler.malformed_rows += 1
+                return list(
+                    validators.rfc4180_validators.number_of_fields(
+                        row=row, row_number=row_number, header_length=header_length
+                    )
                 )
 
-                for validator in column_info["validators"]:
+            errors = []
+            for index, cell, checks, profile, cache in column_cells:
+                raw = row[index]
+                if cache is not None and cache.enabled:
+                    entry = cache.get(raw)
+                    if entry is not None:
+                        value, missing, failed = entry
+                        for error in failed:
+                            errors.append(error.at_row(row_number))
+                            if profile is not None:
+                                profile.errors[error.rule] += 1
+                        if profile is not None:
+                            profile.add(raw, value, missing)
+                        continue
+
+                start = len(errors)
+                # Update cell.value to None if value is in missingValues
+                missing = raw in missing_values
+                cell.value = None if missing else raw
+                cell.row_number = row_number
+
+                for check in checks:
                     # Type validator convert cell value into target type, other validators don't accept None value
-                    yield from validator(cell=cell, schema=self.schema, field_schema=column_info["field_schema"])
+                    error = check(cell)
+                    if error is not None:
+                        errors.append(error)
+                        if profile is not None:
+                            profile.errors[error.rule] += 1
+
+                if cache is not None and cache.enabled:
+                    # Converted value, whether it is missing, and errors which are copied into later rows
+                    cache.put(raw, (cell.value, missing, errors[start:]))
+                if profile is not None:
+                    profile.add(raw, cell.value, missing)
+
+            if key_checker is not None:
+                errors.extend(key_checker.check(row, row_number))
+            return errors
+
+        if self.instruments is not None:
+            return timed_row_checker(check_row, self.instruments)
+        return check_row
+
+    # TODO: document for callback
+    def check_rows(self, csvreader, callback=lambda *args: None, row_number=0):
+        """
+        :param row_number: Number of rows before csvreader, e.g. of a resumed validation
+        """
+        check_row = self.compile_row_checker()
+        if self.instruments is not None:
+            csvreader = self.instruments.time_rows(csvreader)
+
+        for row_index, row in enumerate(csvreader, start=row_number):
+            yield from check_row(row, row_index + 1)
 
             callback(row_index, row)
+
+    def check_batches(self, csvreader, callback=lambda *args: None, row_number=0):
+        """
+        Check rows in batches of self.batch_size rows. Rows of a batch are transposed into columns, so every validator
+        checks all values of a column at once. Errors are sorted as if rows were checked one by one.
+
+        :param row_number: Number of rows before csvreader, see check_rows
+        """
+        column_checks = self.compile_column_validators(batch=True)
+        missingvalues = validators.batch_validators.missingvalues(
+            schema=self.schema, column_validators=self.column_validators
+        )
+        header_length = self.header_length
+        profiler = self.profiler
+        instruments = self.instruments
+        key_checker = self.key_checker
+        if instruments is not None:
+            column_checks = instruments.instrument(column_checks, batch=True)
+            csvreader = instruments.time_rows(csvreader)
+
+        for rows in utilities.step_slice(csvreader, self.batch_size):
+            start = time.perf_counter()
+            # Sort key of error is (row number, column position, validator position)
+            errors = []
+            valid_rows = []
+            row_numbers = []
+            for row in rows:
+                row_number += 1
+                if len(row) != header_length:
+                    if profiler is not None:
+                        profiler.malformed_rows += 1
+                    for error in validators.rfc4180_validators.number_of_fields(
+                        row=row, row_number=row_number, header_length=header_length
+                    ):
+                        errors.append(((row_number, -1, 0), error))
+                    continue
+                valid_rows.append(row)
+                row_numbers.append(row_number)
+
+            if profiler is not None:
+                profiler.rows += len(rows)
+
+            if valid_rows:
+                for column_position, (index, column_name, checks, _) in enumerate(column_checks):
+                    raws = list(map(itemgetter(index), valid_rows))
+                    batch = validators.batch_validators.ColumnBatch(
+                        values=raws, row_numbers=row_numbers, column_name=column_name, column_index=index
+                    )
+                    missingvalues(batch)
+                    profile = None if profiler is None else profiler.column(index, column_name)
+                    if profile is not None:
+                        missing = [value is None for value in batch.values]
+
+                    for check_position, check in enumerate(checks):
+                        for position, error in check(batch):
+                            errors.append(((row_numbers[position], column_position, check_position), error))
+                            if profile is not None:
+                                profile.errors[error.rule] += 1
+
+                    if profile is not None:
+                        profile.add_batch(raws, batch.values, missing)
+
+                if key_checker is not None:
+                    for row, number in zip(valid_rows, row_numbers):
+                        for error in key_checker.check(row, number):
+                            errors.append(((number, len(column_checks), 0), error))
+
+            errors.sort(key=itemgetter(0))
+            if instruments is not None:
+                instruments.rows += len(rows)
+                instruments.check_seconds += time.perf_counter() - start
+            for _, error in errors:
+                yield error
+
+            for row_index, row in enumerate(rows, start=row_number - len(rows)):
+                callback(row_index, row)
+
+
+def timed_row_checker(check_row, instruments):
+    perf_counter = time.perf_counter
+
+    def check(row, row_number):
+        start = perf_counter()
+        errors = check_row(row, row_number)
+        instruments.check_seconds += perf_counter() - start
+        instruments.rows += 1
+        return errors
+
+    return check
+
+
+class FilesValidator:
+    def __init__(
+        self,
+        schema: Dict,
+        strict=True,
+        batch_size: Optional[int] = None,
+        jobs: Optional[int] = None,
+        encoding: Optional[str] = None,
+        memory_map: bool = False,
+    ):
+        """
+        Validate many CSV files against one schema
+
+        The schema is validated against the meta schema and the dialect is prepared only once. Column validators are
+        prepared and compiled once for each distinct header, and reused by all files with that header.
+
+        :param schema: CSV Schema in dict
+        :param strict: Whether to follow RFC 4180 strictly when parsing CSV file
+        :param batch_size: Number of rows checked at a time in each file, see Validator. Default: None.
+        :param jobs: If jobs is None, validate files one by one in current process. Otherwise, validate files in jobs
+        processes, each process prepares the schema once. csvfiles must be paths or bytes. Default: None.
+        :param encoding: Encoding of CSV files, see Validator. Default: None.
+        :param memory_map: Whether to map CSV files into memory, see Validator. Default: False.
+        """
+        if jobs is not None and jobs < 1:
+            raise ValueError("jobs must be a positive integer")
+        self.jobs = jobs
+
+        self.options = {
+            "schema": schema,
+            "strict": strict,
+            "batch_size": batch_size,
+            "encoding": encoding,
+            "memory_map": memory_map,
+        }
+
+        self.validator = Validator(csvfile=None, **self.options)
+
+    def validate(self, csvfiles: Iterable) -> Iterator[Tuple[object, List[exceptions.ValidationError]]]:
+        """
+        Validate CSV files, and yield (csvfile, errors) for every file in the order of csvfiles
+
+        :param csvfiles: Iterable of CSV files, each one can be anything accepted by csvfile of Validator
+        """
+        if self.jobs is None:
+            for csvfile in csvfiles:
+                yield csvfile, self.validator.check_file(csvfile)
+            return
+
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.jobs, initializer=_init_files_worker, initargs=(self.options,)
+        ) as executor:
+            csvfiles = list(csvfiles)
+            yield from zip(csvfiles, executor.map(_check_file, csvfiles, chunksize=FILES_PER_TASK))
+
+
+FILES_PER_TASK = 16
+
+_files_validator = None
+
+
+def _init_files_worker(options):
+    global _files_validator
+
+    _files_validator = Validator(csvfile=None, **options)
+
+
+def _check_file(csvfile):
+    return _files_validator.check_file(csvfile)
+
+
+class FeedValidator:
+    def __init__(self, schema: Dict, strict=True, encoding: Optional[str] = None):
+        """
+        Validate CSV data pushed chunk by chunk, e.g. as it arrives from a socket
+
+        Header is checked once the first record is complete, then every complete record is checked as a row. Records
+        split across chunks are kept until they are complete.
+
+        :param schema: CSV Schema in dict
+        :param strict: Whether to follow RFC 4180 strictly when parsing CSV file
+        :param encoding: Encoding of bytes chunks. Default: None, utf-8.
+        """
+        self.setup(Validator(csvfile=None, schema=schema, strict=strict, encoding=encoding))
+
+    @classmethod
+    def from_validator(cls, validator: Validator) -> "FeedValidator":
+        """
+        Create a FeedValidator checking pushed data with the schema and options of an existing validator
+        """
+        feed = cls.__new__(cls)
+        feed.setup(validator)
+        return feed
+
+    def setup(self, validator):
+        self.validator = validator
+        self.reader = readers.PushReader(dialect=validator.csv_dialect, encoding=validator.encoding)
+        self.row_number = 0
+        self.closed = False
+        self._check_row = None
+
+    def push(self, chunk: Union[str, bytes]) -> List[exceptions.ValidationError]:
+        """
+        Push a str or bytes chunk and return errors of the records completed by it
+        """
+        if self.closed:
+            raise ValueError("Push to a closed FeedValidator")
+        return self.check(self.reader.push(chunk))
+
+    def close(self) -> List[exceptions.ValidationError]:
+        """
+        Finish the data and return errors of the remaining records
+        """
+        if self.closed:
+            return []
+        self.closed = True
+        key_checker = self.validator.key_checker
+        try:
+            errors = self.check(self.reader.close())
+            # Duplicates of keys spilled to disk are found after all rows
+            if key_checker is not None:
+                errors.extend(key_checker.finish())
+        finally:
+            if key_checker is not None:
+                key_checker.close()
+                self.validator.key_checker = None
+        if self.validator.instruments is not None:
+            self.validator.instruments.finish()
+        return errors
+
+    def check(self, rows):
+        errors = []
+        for row in rows:
+            if self._check_row is None:
+                self.validator.header = row
+                self.validator.header_length = len(row)
+                errors.extend(self.validator.prepare_header())
+                self.validator.key_checker = self.validator.create_key_checker()
+                self._check_row = self.validator.compile_row_checker()
+                continue
+
+            self.row_number += 1
+            errors.extend(self._check_row(row, self.row_number))
+        return errors
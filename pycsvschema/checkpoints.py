@@ -0,0 +1,202 @@
+#!/usr/bin/python
+# -*-coding: utf-8 -*-
+
+import collections
+import csv
+import hashlib
+import json
+import locale
+import os
+import pickle
+import stat
+import time
+
+from pycsvschema import instruments, parallel, readers
+
+# Checkpoint and resume a validation of a large CSV file
+#
+# Rows are read from the file in binary, so the byte offset after every record is known. Every checkpoint_interval
+# seconds, between two rows, or two batches if rows are checked in batches, the offset and the number of rows checked
+# are written into the checkpoint file, with the state of the collector, profiler, instruments and keys, and the size
+# of the output file. A resumed validation cuts the output file back to that size, restores the state, and continues
+# from the offset with the next row number, so its errors and reports are the same as of a validation without break.
+#
+# The checkpoint file holds two pickles: a small header to check the checkpoint against the file and the schema, and
+# the state. It is replaced atomically, so an interrupted write leaves the previous checkpoint.
+#
+# Loading a pickle can run arbitrary code, so a checkpoint must only be resumed from a trusted location. It is written
+# readable and writable by its owner only, and on POSIX a checkpoint owned by another user, or writable by group or
+# others, is refused.
+
+CHECKPOINT_INTERVAL = 60.0
+CHECKPOINT_VERSION = 1
+
+
+def schema_digest(schema):
+    return hashlib.blake2b(json.dumps(schema, sort_keys=True).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def file_identity(path):
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+
+def check_trusted(path):
+    """
+    Refuse a checkpoint which someone else could have written, before it is unpickled
+    """
+    if not hasattr(os, "getuid"):
+        return
+    status = os.stat(path)
+    if status.st_uid != os.getuid() or status.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise ValueError(
+            "Checkpoint {0} is not owned by the current user or is writable by others, it is not loaded".format(path)
+        )
+
+
+def load_header(validator):
+    """
+    Read the header of the checkpoint of validator, if validator resumes from it
+
+    :return: Dict of header, or None if validator does not resume or there is no checkpoint yet
+    """
+    if validator.checkpoint is None or not validator.resume or not os.path.exists(validator.checkpoint):
+        return None
+    check_trusted(validator.checkpoint)
+    with open(validator.checkpoint, "rb") as f:
+        header = pickle.load(f)
+
+    if header.get("version") != CHECKPOINT_VERSION:
+        raise ValueError("Checkpoint {0} is written by another version".format(validator.checkpoint))
+    if header["file"] != file_identity(validator.csvfile):
+        raise ValueError(
+            "Checkpoint {0} is not of {1}, or the file is changed".format(validator.checkpoint, validator.csvfile)
+        )
+    if header["schema"] != schema_digest(validator.schema):
+        raise ValueError("Checkpoint {0} is not of this schema".format(validator.checkpoint))
+    return header
+
+
+def load_state(validator):
+    """
+    :return: Tuple of (header, state) of the checkpoint of validator, or None, see load_header
+    """
+    header = load_header(validator)
+    if header is None:
+        return None
+    with open(validator.checkpoint, "rb") as f:
+        pickle.load(f)
+        state = pickle.load(f)
+    return header, state
+
+
+def save(validator, offset, row_number):
+    """
+    Write a checkpoint after row_number rows, which end at offset of the file
+    """
+    output_size = None
+    if validator.output_file is not None:
+        validator.output_file.flush()
+        output_size = validator.output_file.tell()
+
+    checkpoint_instruments = None
+    if validator.instruments is not None:
+        # Callback of instruments might not be picklable
+        checkpoint_instruments = instruments.Instruments()
+        checkpoint_instruments.merge(validator.instruments)
+    collector = None
+    if validator.collector is not None:
+        collector = {name: value for name, value in vars(validator.collector).items() if name != "callback"}
+    if validator.key_checker is not None:
+        validator.key_checker.checkpoint()
+
+    header = {
+        "version": CHECKPOINT_VERSION,
+        "file": file_identity(validator.csvfile),
+        "schema": schema_digest(validator.schema),
+        "offset": offset,
+        "row_number": row_number,
+        "output_size": output_size,
+    }
+    state = {
+        "collector": collector,
+        "profiler": validator.profiler,
+        "instruments": checkpoint_instruments,
+        "key_checker": validator.key_checker,
+    }
+    temporary = validator.checkpoint + ".tmp"
+    with open(os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as f:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, validator.checkpoint)
+
+
+def restore(validator, state):
+    """
+    Restore the state of a checkpoint into validator, its collector, profiler and instruments must be new
+    """
+    if state["collector"] is not None and validator.collector is not None:
+        vars(validator.collector).update(state["collector"])
+    if state["profiler"] is not None and validator.profiler is not None:
+        validator.profiler.merge(state["profiler"])
+    if state["instruments"] is not None and validator.instruments is not None:
+        validator.instruments.merge(state["instruments"])
+    if state["key_checker"] is not None:
+        if validator.key_checker is not None:
+            validator.key_checker.close()
+        validator.key_checker = state["key_checker"]
+        validator.key_checker.restore()
+
+
+def remove(validator):
+    """
+    Remove the checkpoint once the validation finishes
+    """
+    if os.path.exists(validator.checkpoint):
+        os.remove(validator.checkpoint)
+
+
+def check_rows(validator, resumed=None):
+    """
+    Check rows of validator.csvfile after the header, writing checkpoints, or after the rows of a checkpoint
+
+    validator.check_header must have run, see compile_row_checker.
+
+    :param resumed: Tuple of (header, state) of the checkpoint to resume from. Default: None, check all rows.
+    """
+    encoding = validator.encoding or locale.getpreferredencoding(False)
+    codec, _ = readers.mapped_encoding(validator.csv_dialect, encoding)
+    if resumed is not None:
+        header, state = resumed
+        restore(validator, state)
+        offset, row_number = header["offset"], header["row_number"]
+    else:
+        offset = parallel.find_header_end(validator.csvfile, validator.csv_dialect, codec)
+        if offset is None:
+            offset = os.path.getsize(validator.csvfile)
+        row_number = 0
+
+    # Offsets after the rows read but not yet checked, rows of a batch are read before any of them is checked
+    offsets = collections.deque()
+    due = [time.monotonic() + validator.checkpoint_interval]
+
+    with open(validator.csvfile, "rb") as f:
+        f.seek(offset)
+        consumed = [offset]
+
+        def read_rows():
+            for row in csv.reader(readers.read_lines(f, codec, consumed), validator.csv_dialect):
+                offsets.append(consumed[0])
+                yield row
+
+        def checkpoint(row_index, row):
+            row_offset = offsets.popleft()
+            # Errors of later rows of a batch are already yielded, so checkpoints are only written after batches
+            if not offsets and time.monotonic() >= due[0]:
+                save(validator, row_offset, row_index + 1)
+                due[0] = time.monotonic() + validator.checkpoint_interval
+
+        check = validator.check_rows if validator.batch_size is None else validator.check_batches
+        yield from check(read_rows(), callback=checkpoint, row_number=row_number)
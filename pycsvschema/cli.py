@@ -0,0 +1,356 @@
+#!/usr/bin/python
+# -*-coding: utf-8 -*-
+
+import argparse
+import concurrent.futures
+import contextlib
+import csv
+import glob
+import itertools
+import json
+import os
+import sys
+import time
+
+import jsonschema
+from pycsvschema import collectors, readers
+from pycsvschema.checker import Validator
+
+# Command line validator
+#
+#   pycsvschema schema.json data.csv
+#   pycsvschema schema.json 'feeds/**/*.csv.gz' --jobs 4 --max-errors 100 --format jsonl
+#   gunzip -c data.csv.gz | pycsvschema schema.json -
+#
+# Exit status is 0 if all files are valid, 1 if any error is found, and 2 if the command can not run.
+
+STDIN = "-"
+EXIT_VALID = 0
+EXIT_INVALID = 1
+EXIT_FAILURE = 2
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="pycsvschema", description="Validate CSV files against a CSV Schema")
+    parser.add_argument("schema", help="Path to CSV Schema in JSON")
+    parser.add_argument(
+        "files",
+        nargs="*",
+        default=[STDIN],
+        help="CSV files or glob patterns, '-' reads stdin. Files and stdin compressed with gzip, bz2, xz or zstd are "
+        "decompressed on the fly. Default: stdin.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Validate files in N processes, or split a single uncompressed file into chunks checked in N processes",
+    )
+    parser.add_argument("--max-errors", type=int, default=None, help="Stop after N errors")
+    parser.add_argument(
+        "--format",
+        choices=["text", "jsonl", "json"],
+        default="text",
+        help="Output errors as text lines, JSON lines, or one JSON document with a summary. Default: text.",
+    )
+    parser.add_argument("-o", "--output", default=None, help="Write errors into this file. Default: stdout.")
+    parser.add_argument("--encoding", default="utf-8", help="Encoding of CSV files. Default: utf-8.")
+    parser.add_argument("--batch-size", type=int, default=None, help="Check N rows at a time column by column")
+    parser.add_argument("--cache-size", type=int, default=None, help="Cache check results of N values per column")
+    parser.add_argument(
+        "--memory-map",
+        action="store_true",
+        help="Map uncompressed files into memory and only decode columns with validators",
+    )
+    parser.add_argument(
+        "--key-memory",
+        type=int,
+        default=None,
+        help="Memory limit in MiB for unique and primaryKey checks, keys are spilled to disk beyond it. Default: 256.",
+    )
+    parser.add_argument(
+        "--key-bloom-filter", action="store_true", help="Prefilter keys spilled to disk with Bloom filters"
+    )
+    parser.add_argument("--no-strict", action="store_true", help="Do not follow RFC 4180 strictly when parsing")
+    parser.add_argument("--progress", action="store_true", help="Show progress and throughput on stderr")
+    return parser.parse_args(argv)
+
+
+def expand_files(patterns):
+    """
+    Expand glob patterns, patterns without magic characters and stdin are kept as they are
+    """
+    files = []
+    for pattern in patterns:
+        if pattern == STDIN or not glob.has_magic(pattern):
+            files.append(pattern)
+            continue
+        matched = sorted(glob.glob(pattern, recursive=True))
+        if not matched:
+            raise FileNotFoundError("No file matches {0}".format(pattern))
+        files.extend(matched)
+    return files
+
+
+class Progress(object):
+    def __init__(self, stream=None, interval=0.5):
+        """
+        Show bytes read, percentage and throughput of the current file on one line
+
+        :param stream: Text stream to write progress into. Default: None, do not show progress.
+        :param interval: Minimum seconds between two updates
+        """
+        self.stream = stream
+        self.interval = interval
+        self.name = None
+        self.total = None
+        self.bytes = 0
+        self.errors = 0
+        self.started = time.monotonic()
+        self.shown = 0.0
+
+    def start_file(self, name, total=None):
+        self.name = name
+        self.total = total
+        self.bytes = 0
+        self.started = time.monotonic()
+        self.show(force=True)
+
+    def advance(self, size):
+        self.bytes += size
+        self.show()
+
+    def show(self, force=False, end=""):
+        if self.stream is None:
+            return
+        now = time.monotonic()
+        if not force and now - self.shown < self.interval:
+            return
+        self.shown = now
+
+        elapsed = max(now - self.started, 1e-9)
+        line = "{0}: {1:,.1f} MB".format(self.name, self.bytes / 1e6)
+        if self.total:
+            line += " ({0:.0%})".format(self.bytes / self.total)
+        line += ", {0:,.1f} MB/s, {1} errors".format(self.bytes / 1e6 / elapsed, self.errors)
+        self.stream.write("\r\033[K" + line + end)
+        self.stream.flush()
+
+    def finish_file(self):
+        self.show(force=True, end="\n")
+
+
+class ProgressReader(object):
+    """
+    Binary file object reporting bytes read from the wrapped buffered file, compressed file is decompressed after
+    this, so its progress is measured on compressed bytes
+    """
+
+    def __init__(self, raw, progress):
+        self.raw = raw
+        self.progress = progress
+
+    def peek(self, size=0):
+        return self.raw.peek(size)
+
+    def read(self, size=-1):
+        data = self.raw.read(size)
+        self.progress.advance(len(data))
+        return data
+
+    def readable(self):
+        return True
+
+
+@contextlib.contextmanager
+def open_input(path, progress):
+    """
+    Open a CSV file or stdin in binary and yield it as csvfile of Validator, bytes read from it are reported to
+    progress. Compressed data is detected and decompressed by Validator.
+    """
+    if path == STDIN:
+        yield ProgressReader(sys.stdin.buffer, progress)
+        return
+
+    with open(path, "rb") as raw:
+        yield ProgressReader(raw, progress)
+
+
+def error_dict(path, error):
+    return {
+        "file": path,
+        "row_number": error.row_number,
+        "column": error.column,
+        "rule": error.rule,
+        "message": error.message,
+    }
+
+
+class ErrorWriter(object):
+    def __init__(self, output, output_format):
+        self.output = output
+        self.format = output_format
+        self.errors = []
+
+    def write(self, path, error):
+        if self.format == "text":
+            self.output.write("{0}: {1}\n".format(path, error))
+        elif self.format == "jsonl":
+            self.output.write(json.dumps(error_dict(path, error)) + "\n")
+        else:
+            self.errors.append(error_dict(path, error))
+
+    def close(self, collector):
+        if self.format == "json":
+            json.dump({"errors": self.errors, "summary": collector.summary()}, self.output, indent=2)
+            self.output.write("\n")
+
+
+@contextlib.contextmanager
+def file_errors(path):
+    """
+    Prefix errors of a CSV file which can not be checked, e.g. without header or malformed, with its path
+    """
+    try:
+        yield
+    except (ValueError, csv.Error) as e:
+        raise ValueError("{0}: {1}".format(path, e)) from e
+
+
+_validator = None
+_max_errors = None
+
+
+def _init_worker(options, max_errors=None):
+    global _validator, _max_errors
+
+    _validator = Validator(csvfile=None, errors="coerce", **options)
+    _max_errors = max_errors
+
+
+def _validate_file(path):
+    """
+    Return errors of a file, at most _max_errors of them, since no more of them are written
+    """
+    _validator.csvfile = path
+    errors = _validator.iter_errors()
+    try:
+        return list(itertools.islice(errors, _max_errors))
+    finally:
+        errors.close()
+
+
+def validate_files(files, options, jobs, collector, writer, progress):
+    """
+    Validate files one by one in current process, a single uncompressed file is split into chunks if jobs is given
+    """
+    validator = Validator(csvfile=None, errors="coerce", **options)
+    for path in files:
+        with contextlib.ExitStack() as stack:
+            chunked = (
+                jobs is not None and len(files) == 1 and path != STDIN and readers.detect_compression(path) is None
+            )
+            mapped = (
+                validator.memory_map
+                and path != STDIN
+                and readers.can_map(path, validator.csv_dialect, validator.encoding)
+            )
+            if chunked:
+                validator.jobs = jobs
+            # Chunked and memory-mapped files are read from the path
+            if chunked or mapped:
+                validator.csvfile = path
+            else:
+                validator.csvfile = stack.enter_context(open_input(path, progress))
+            progress.start_file(path, None if path == STDIN else os.path.getsize(path))
+
+            with file_errors(path):
+                for error in collector.collect(validator.iter_errors()):
+                    progress.errors += 1
+                    writer.write(path, error)
+            # Chunks are read by worker processes and mapped files are not read through open_input, so progress is
+            # only updated when the file is done
+            if chunked or mapped:
+                progress.advance(os.path.getsize(path))
+
+        progress.finish_file()
+        if collector.stopped:
+            return
+
+
+def validate_files_parallel(files, options, jobs, collector, writer, progress):
+    """
+    Validate files in jobs processes, errors are written in the order of files
+
+    Each worker stops after collector.max_errors errors of a file, files not started yet are cancelled once collector
+    stops.
+    """
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(options, collector.max_errors)
+    ) as executor:
+        futures = [executor.submit(_validate_file, path) for path in files]
+        # Files are read by worker processes, so progress is updated when each file is done
+        sizes = [os.path.getsize(path) for path in files]
+        progress.start_file("{0} files".format(len(files)), sum(sizes))
+        try:
+            for path, size, future in zip(files, sizes, futures):
+                with file_errors(path):
+                    errors = future.result()
+                for error in collector.collect(errors):
+                    progress.errors += 1
+                    writer.write(path, error)
+                progress.advance(size)
+                if collector.stopped:
+                    return
+        finally:
+            progress.finish_file()
+            for future in futures:
+                future.cancel()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    try:
+        with open(args.schema, "r") as f:
+            schema = json.load(f)
+        files = expand_files(args.files)
+        options = {
+            "schema": schema,
+            "strict": not args.no_strict,
+            "batch_size": args.batch_size,
+            "encoding": args.encoding,
+            "cache_size": args.cache_size,
+            "memory_map": args.memory_map,
+            "key_memory": None if args.key_memory is None else args.key_memory << 20,
+            "key_bloom_filter": args.key_bloom_filter,
+        }
+        # Check the schema once before any file is opened
+        Validator(csvfile=None, **options)
+        if args.jobs is not None and args.jobs < 1:
+            raise ValueError("jobs must be a positive integer")
+    except (OSError, ValueError, jsonschema.exceptions.ValidationError) as e:
+        sys.stderr.write("pycsvschema: error: {0}\n".format(e))
+        return EXIT_FAILURE
+
+    collector = collectors.ErrorCollector(max_errors=args.max_errors, keep_errors=False)
+    progress = Progress(sys.stderr if args.progress else None)
+    output = sys.stdout if args.output is None else open(args.output, "w")
+    writer = ErrorWriter(output, args.format)
+    try:
+        if args.jobs is not None and len(files) > 1 and STDIN not in files:
+            validate_files_parallel(files, options, args.jobs, collector, writer, progress)
+        else:
+            validate_files(files, options, args.jobs, collector, writer, progress)
+        writer.close(collector)
+    # A reference file is only read when the first file is checked, so a missing reference field is found here, as
+    # are files without header and malformed CSV, see file_errors
+    except (OSError, ValueError) as e:
+        sys.stderr.write("pycsvschema: error: {0}\n".format(e))
+        return EXIT_FAILURE
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    return EXIT_INVALID if collector.total else EXIT_VALID
@@ -0,0 +1,128 @@
+#!/usr/bin/python
+# -*-coding: utf-8 -*-
+
+import collections
+import random
+from typing import Callable, Iterable, Iterator, Optional
+
+from pycsvschema import exceptions
+
+
+class ErrorCollector(object):
+    def __init__(
+        self,
+        max_errors: Optional[int] = None,
+        max_errors_per_column: Optional[int] = None,
+        max_errors_per_rule: Optional[int] = None,
+        samples: int = 0,
+        callback: Optional[Callable[[exceptions.ValidationError], None]] = None,
+        keep_errors: bool = True,
+        seed=None,
+    ):
+        """
+        Collect errors of a validation with caps, instead of raising or writing every error
+
+        Every error is counted by column and by rule. Errors within the caps are kept in self.errors and passed to
+        callback. Error messages are never formatted here, so they are only built when someone renders them.
+
+        :param max_errors: Stop the validation once max_errors errors are found. Default: None, no limit.
+        :param max_errors_per_column: Keep at most max_errors_per_column errors of each column, header and row errors
+        without column count as column None. Other errors are only counted. Default: None, no limit.
+        :param max_errors_per_rule: Keep at most max_errors_per_rule errors of each rule. Default: None, no limit.
+        :param samples: Number of example errors sampled for each (column, rule) with reservoir sampling, so examples
+        are picked from the whole file instead of its beginning. Default: 0.
+        :param callback: Function called with every kept error. Default: None.
+        :param keep_errors: Whether to keep errors in self.errors, turn it off if callback handles them. Default: True.
+        :param seed: Seed of the random generator for sampling. Default: None.
+        """
+        self.max_errors = max_errors
+        self.max_errors_per_column = max_errors_per_column
+        self.max_errors_per_rule = max_errors_per_rule
+        self.samples = samples
+        self.callback = callback
+        self.keep_errors = keep_errors
+        self.random = random.Random(seed)
+
+        self.total = 0
+        self.stopped = False
+        self.errors = []
+        self.column_counts = collections.Counter()
+        self.rule_counts = collections.Counter()
+        self.counts = collections.Counter()
+        self.examples = collections.defaultdict(list)
+
+    def add(self, error: exceptions.ValidationError) -> bool:
+        """
+        Add an error
+
+        :return: False if the validation should stop, otherwise True
+        """
+        return self._add(error)[1]
+
+    def _add(self, error):
+        if self.stopped:
+            return False, False
+
+        self.total += 1
+        key = (error.column, error.rule)
+        self.column_counts[error.column] += 1
+        self.rule_counts[error.rule] += 1
+        self.counts[key] += 1
+
+        if self.samples:
+            examples = self.examples[key]
+            if len(examples) < self.samples:
+                examples.append(error)
+            else:
+                index = self.random.randrange(self.counts[key])
+                if index < self.samples:
+                    examples[index] = error
+
+        kept = (
+            self.max_errors_per_column is None or self.column_counts[error.column] <= self.max_errors_per_column
+        ) and (self.max_errors_per_rule is None or self.rule_counts[error.rule] <= self.max_errors_per_rule)
+        if kept:
+            if self.keep_errors:
+                self.errors.append(error)
+            if self.callback is not None:
+                self.callback(error)
+
+        if self.max_errors is not None and self.total >= self.max_errors:
+            self.stopped = True
+        return kept, not self.stopped
+
+    def collect(self, errors: Iterable[exceptions.ValidationError]) -> Iterator[exceptions.ValidationError]:
+        """
+        Add errors one by one and yield the kept ones, stop consuming errors once max_errors is reached
+        """
+        for error in errors:
+            kept, running = self._add(error)
+            if kept:
+                yield error
+            if not running:
+                return
+
+    def summary(self) -> dict:
+        """
+        Aggregated counts and sampled examples, which can be dumped into JSON
+        """
+        return {
+            "total": self.total,
+            "stopped": self.stopped,
+            "columns": [{"column": column, "count": count} for column, count in self.column_counts.items()],
+            "rules": [{"rule": rule, "count": count} for rule, count in self.rule_counts.items()],
+            "errors": [
+                {
+                    "column": column,
+                    "rule": rule,
+                    "count": count,
+                    "examples": [
+                        {"row_number": error.row_number, "message": error.message}
+                        for error in sorted(
+                            self.examples.get((column, rule), []), key=lambda error: error.row_number or 0
+                        )
+                    ],
+                }
+                for (column, rule), count in self.counts.items()
+            ],
+        }
@@ -13,6 +13,7 @@ EXACTFIELDS = False
 # MINFIELDS = 0
 MISSINGVALUES = [""]
 PATTERNFIELDS = {}
+PRIMARYKEY = []
 
 # field
 FIELDS_ENUM = []
@@ -30,3 +31,4 @@ FIELDS_FALSEVALUES = {"FALSE", "False", "false", "0"}
 FIELDS_FORMAT_DATETIME_PATTERN = "%Y-%m-%dT%H:%M:%S.%f%z"
 FIELDS_TYPE_STRING_PATTERN = ""
 FIELDS_REQUIRED = False
+FIELDS_UNIQUE = False
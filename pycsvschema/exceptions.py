@@ -3,10 +3,12 @@
 
 
 class ValidationError(Exception):
-    def __init__(self, message, column=None, row_number=None, *args):
+    def __init__(self, message, column=None, row_number=None, *args, rule=None):
         self.message = message
         self.column = column
         self.row_number = row_number
+        # Schema option that the value fails, e.g. "maximum"
+        self.rule = rule
 
         super(ValidationError, self).__init__(message, column, row_number, *args)
 
@@ -17,3 +19,70 @@ class ValidationError(Exception):
             self.column,
             self.row_number,
         )
+
+    def to_exception(self):
+        return self
+
+
+def escape(value):
+    """
+    Escape value to be put into a message template of ErrorRecord
+    """
+    return str(value).replace("{", "{{").replace("}", "}}")
+
+
+class ErrorRecord(object):
+    """
+    Lightweight record of an error found in a cell or a row
+
+    Message is only built from template and value when it is read, and the record is only converted into
+    ValidationError when it is raised. It has the same attributes and string form as ValidationError.
+    """
+
+    __slots__ = ("rule", "template", "value", "column", "column_index", "row_number")
+
+    def __init__(self, rule, template, value, column=None, column_index=None, row_number=None):
+        """
+        :param rule: Schema option that the value fails, e.g. "maximum"
+        :param template: Message template, "{0}" is replaced by value and other braces are escaped
+        :param value: Value in the cell
+        :param column: Column name
+        :param column_index: Column index in header
+        :param row_number: Row number
+        """
+        self.rule = rule
+        self.template = template
+        self.value = value
+        self.column = column
+        self.column_index = column_index
+        self.row_number = row_number
+
+    @property
+    def message(self):
+        return self.template.format(self.value)
+
+    def at_row(self, row_number):
+        """
+        Copy of this record found in another row, used for check results cached by value
+        """
+        return ErrorRecord(self.rule, self.template, self.value, self.column, self.column_index, row_number)
+
+    def to_exception(self):
+        return ValidationError(self.message, column=self.column, row_number=self.row_number, rule=self.rule)
+
+    def __str__(self):
+        return "<%s: %r; column name: %s; row number: %s>" % (
+            ValidationError.__name__,
+            self.message,
+            self.column,
+            self.row_number,
+        )
+
+    def __repr__(self):
+        return "%s(rule=%r, value=%r, column=%r, row_number=%r)" % (
+            self.__class__.__name__,
+            self.rule,
+            self.value,
+            self.column,
+            self.row_number,
+        )
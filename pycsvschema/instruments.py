@@ -0,0 +1,144 @@
+#!/usr/bin/python
+# -*-coding: utf-8 -*-
+
+import json
+import time
+from typing import Callable, Optional
+
+# Instruments time the hot path of a validation: every compiled check of every column, CSV parsing and row checking.
+# Checks are wrapped only when instruments are given to Validator, so validations without them pay nothing.
+
+
+class CheckStats(object):
+    __slots__ = ("calls", "failures", "seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.seconds = 0.0
+
+    def merge(self, other: "CheckStats"):
+        self.calls += other.calls
+        self.failures += other.failures
+        self.seconds += other.seconds
+
+
+class Instruments(object):
+    def __init__(self, callback: Optional[Callable[[dict], None]] = None):
+        """
+        Record call counts, failure counts and cumulative time of each validator of each column, and time spent in
+        parsing CSV and checking rows, pass it to Validator(instruments=...)
+
+        Calls of a batch check are counted by the values in the batch, so they are comparable with checking rows one
+        by one. Time of a check includes building its errors.
+
+        :param callback: Function called with report() when a validation finishes, e.g. to export the numbers into a
+        metrics system. Default: None.
+        """
+        self.callback = callback
+        self.rows = 0
+        self.parse_seconds = 0.0
+        self.check_seconds = 0.0
+        # Sample self.checks {(0, '<COLUMN_NAME>', 'field_type'): CheckStats}
+        self.checks = {}
+
+    def stats(self, index, column_name, validator_name) -> CheckStats:
+        key = (index, column_name, validator_name)
+        if key not in self.checks:
+            self.checks[key] = CheckStats()
+        return self.checks[key]
+
+    def instrument(self, column_checks, batch=False):
+        """
+        Wrap compiled checks, see Validator.compile_column_validators
+
+        :return: List of (index, column_name, checks, validator names) like column_checks, with wrapped checks
+        """
+        wrap = wrap_batch_check if batch else wrap_check
+        return [
+            (
+                index,
+                column_name,
+                [wrap(check, self.stats(index, column_name, name)) for check, name in zip(checks, names)],
+                names,
+            )
+            for index, column_name, checks, names in column_checks
+        ]
+
+    def time_rows(self, rows):
+        """
+        Yield rows from an iterator of rows, adding the time of reading and parsing them to self.parse_seconds
+        """
+        rows = iter(rows)
+        perf_counter = time.perf_counter
+        while True:
+            start = perf_counter()
+            try:
+                row = next(rows)
+            except StopIteration:
+                self.parse_seconds += perf_counter() - start
+                return
+            self.parse_seconds += perf_counter() - start
+            yield row
+
+    def merge(self, other: "Instruments"):
+        self.rows += other.rows
+        self.parse_seconds += other.parse_seconds
+        self.check_seconds += other.check_seconds
+        for key, stats in other.checks.items():
+            self.stats(*key).merge(stats)
+
+    def finish(self):
+        if self.callback is not None:
+            self.callback(self.report())
+
+    def report(self) -> dict:
+        columns = {}
+        for (index, column_name, validator_name), stats in sorted(self.checks.items(), key=lambda item: item[0][0]):
+            column = columns.setdefault(index, {"index": index, "column": column_name, "validators": []})
+            column["validators"].append(
+                {
+                    "validator": validator_name,
+                    "calls": stats.calls,
+                    "failures": stats.failures,
+                    "seconds": stats.seconds,
+                }
+            )
+        return {
+            "rows": self.rows,
+            "parse_seconds": self.parse_seconds,
+            "check_seconds": self.check_seconds,
+            "columns": list(columns.values()),
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.report(), **kwargs)
+
+
+def wrap_check(check, stats):
+    perf_counter = time.perf_counter
+
+    def instrumented(cell):
+        start = perf_counter()
+        error = check(cell)
+        stats.seconds += perf_counter() - start
+        stats.calls += 1
+        if error is not None:
+            stats.failures += 1
+        return error
+
+    return instrumented
+
+
+def wrap_batch_check(check, stats):
+    perf_counter = time.perf_counter
+
+    def instrumented(batch):
+        start = perf_counter()
+        errors = check(batch)
+        stats.seconds += perf_counter() - start
+        stats.calls += len(batch.values)
+        stats.failures += len(errors)
+        return errors
+
+    return instrumented
@@ -0,0 +1,546 @@
+#!/usr/bin/python
+# -*-coding: utf-8 -*-
+
+import array
+import hashlib
+import os
+import shutil
+import tempfile
+
+from pycsvschema import defaults, exceptions
+from pycsvschema.validators import types
+
+# Keys are checked across rows, for `unique` of fields and `primaryKey` of the schema
+#
+# Values of a key are converted like the type validation of their fields does, so 1 and 01 of an integer field are the
+# same key, and encoded into bytes. Every key is reduced to a 64-bit fingerprint, with hash() in one process, or with
+# blake2b if keys are fingerprinted in worker processes, since hashes are salted per process. Fingerprints are kept in
+# an open addressing table backed by arrays, 16 bytes per slot, and the keys with the row numbers of their first
+# occurrence in KeyRecords. Once they outgrow their memory limit, they are written into partitions on disk, and all
+# following keys are appended to them. Duplicates in the partitions are found when all rows are checked, one partition
+# at a time.
+#
+# Keys sharing a fingerprint are compared before one is reported as a duplicate of the other, so a collision of two
+# different keys only costs a comparison.
+
+# Memory limit of all keys of a validator in bytes
+KEY_MEMORY_LIMIT = 1 << 28
+KEY_TABLE_SIZE = 1 << 12
+# Keys are spilled into 2 ** KEY_PARTITION_BITS partitions by the highest bits of their fingerprints
+KEY_PARTITION_BITS = 8
+# Number of hash functions of Bloom filters
+BLOOM_HASHES = 3
+
+UINT64 = "Q"
+UINT64_MASK = (1 << 64) - 1
+SLOT_SIZE = 16
+# Bytes of a record besides its key, and of a spilled entry besides its key
+RECORD_SIZE = 16
+ENTRY_SIZE = 24
+# Tables grow by this factor until they reach the memory limit
+TABLE_GROWTH = 4
+
+
+def key_mappers(key):
+    """
+    Type validators converting values of the columns of a key, None for string fields and columns without field schema
+
+    :param key: Key found by header_validators.field_keys
+    :return: List of type validators, or None if no value of the key is converted
+    """
+    mappers = []
+    for field_schema in key["field_schemas"]:
+        type_name = defaults.FIELDS_TYPE if field_schema is None else field_schema.get("type", defaults.FIELDS_TYPE)
+        mappers.append(None if type_name == "string" else types.TYPE_MAPPER[type_name](field_schema=field_schema))
+    return mappers if any(mapper is not None for mapper in mappers) else None
+
+
+def key_bytes(values, mappers):
+    """
+    Encode a key into bytes, values are converted by mappers first, values failing the conversion are kept as they are
+
+    :param values: Raw values of key columns
+    :param mappers: Type validators of key columns, see key_mappers
+    """
+    if mappers is not None:
+        converted = []
+        for value, mapper in zip(values, mappers):
+            if mapper is not None:
+                passed, typed = mapper.validate(value)
+                if passed:
+                    # -0.0 + 0.0 is 0.0, so 0 and -0 of a number field are the same key
+                    value = typed + 0.0 if isinstance(typed, float) else typed
+            converted.append(value)
+        values = converted
+    # repr keeps types and lengths, so "1" and 1, and ("a,b", "c") and ("a", "b,c") are different keys
+    return repr(values[0] if len(values) == 1 else tuple(values)).encode("utf-8")
+
+
+def local_fingerprint(key):
+    """
+    Fingerprint of a key, only comparable with fingerprints from the same process
+
+    :param key: Key in bytes, see key_bytes
+    """
+    return hash(key) & UINT64_MASK
+
+
+def fingerprint(key):
+    """
+    Fingerprint of a key, the same in all processes, so keys from chunks checked in worker processes can be merged
+
+    :param key: Key in bytes, see key_bytes
+    """
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big")
+
+
+def uint64_array(size):
+    return array.array(UINT64, bytes(8 * size))
+
+
+class KeyRecords(object):
+    """
+    Keys and the row numbers of their first occurrence, in the order they are added
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+        # End of every key in self.data
+        self.ends = array.array(UINT64)
+        self.rows = array.array(UINT64)
+
+    def key(self, position):
+        start = self.ends[position - 1] if position else 0
+        return bytes(self.data[start : self.ends[position]])
+
+
+class FingerprintTable(object):
+    """
+    Open addressing table of fingerprints and the positions of their keys in KeyRecords, at most half full
+    """
+
+    def __init__(self, size=KEY_TABLE_SIZE, records=None):
+        """
+        :param size: Number of slots, a power of 2
+        :param records: KeyRecords of keys in the table. Default: None, no key.
+        """
+        self.mask = size - 1
+        self.fingerprints = uint64_array(size)
+        # Positions of records plus 1, 0 marks an empty slot
+        self.positions = uint64_array(size)
+        self.records = KeyRecords() if records is None else records
+        self.count = len(self.records.rows)
+        # Number of keys the table holds before it has to grow
+        self.capacity = size // 2
+
+    def insert(self, fingerprint, key, row_number):
+        """
+        :return: Row number of the first occurrence if key is in the table, otherwise 0
+        """
+        fingerprints = self.fingerprints
+        positions = self.positions
+        records = self.records
+        mask = self.mask
+        slot = fingerprint & mask
+        while True:
+            position = positions[slot]
+            if not position:
+                records.data += key
+                records.ends.append(len(records.data))
+                records.rows.append(row_number)
+                fingerprints[slot] = fingerprint
+                positions[slot] = len(records.rows)
+                self.count += 1
+                return 0
+            # Different keys sharing a fingerprint are kept in different slots
+            if fingerprints[slot] == fingerprint and records.key(position - 1) == key:
+                return records.rows[position - 1]
+            slot = (slot + 1) & mask
+
+    def items(self):
+        """
+        Yield (fingerprint, key, row number of the first occurrence) of every key in the table
+        """
+        records = self.records
+        for fingerprint, position in zip(self.fingerprints, self.positions):
+            if position:
+                yield fingerprint, records.key(position - 1), records.rows[position - 1]
+
+    def resized(self, size):
+        table = FingerprintTable(size, self.records)
+        # Keys in this table are unique, so they are put in the first empty slot without comparing
+        fingerprints = table.fingerprints
+        positions = table.positions
+        mask = table.mask
+        for fingerprint, position in zip(self.fingerprints, self.positions):
+            if not position:
+                continue
+            slot = fingerprint & mask
+            while positions[slot]:
+                slot = (slot + 1) & mask
+            fingerprints[slot] = fingerprint
+            positions[slot] = position
+        return table
+
+
+class BloomFilter(object):
+    def __init__(self, size):
+        """
+        :param size: Size of the bit array in bytes
+        """
+        self.bits = bytearray(size)
+        self.length = size * 8
+
+    def add(self, fingerprint):
+        """
+        Add a fingerprint
+
+        :return: Whether the fingerprint might have been added before
+        """
+        # Positions are derived from the two halves of the fingerprint, which is already a hash
+        step = (fingerprint >> 32) | 1
+        position = fingerprint & 0xFFFFFFFF
+        length = self.length
+        bits = self.bits
+        seen = True
+        for _ in range(BLOOM_HASHES):
+            position %= length
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                seen = False
+            position += step
+        return seen
+
+
+class KeyIndex(object):
+    def __init__(self, memory_limit, directory=None, bloom_filter=False):
+        """
+        Find duplicate keys of one key within memory_limit, see the comment of this module
+
+        :param memory_limit: Memory limit in bytes
+        :param directory: Directory to create the spill directory in. Default: None, the system temporary directory.
+        :param bloom_filter: Whether to test fingerprints against a Bloom filter after spilling. Only fingerprints
+        the filter might have seen are then looked up in partitions, which is faster and needs less memory if
+        duplicates are rare. Default: False.
+        """
+        self.memory_limit = memory_limit
+        self.directory = directory
+        self.bloom_filter = bloom_filter
+        self.table = FingerprintTable(KEY_TABLE_SIZE)
+        self.data_limit = self.key_data_limit(KEY_TABLE_SIZE)
+        self.spill_directory = None
+        # Interleaved fingerprints, row numbers and ends of keys of every partition, and their keys, waiting to be
+        # written
+        self.buffers = None
+        self.key_buffers = None
+        # Bytes of keys of every partition, written or buffered
+        self.key_sizes = None
+        self.buffered = 0
+        self.bloom = None
+        self.candidates = set()
+        # Sizes of partition files at the last checkpoint
+        self.partition_sizes = None
+
+    def add(self, fingerprint, key, row_number):
+        """
+        Add a key, row numbers must be added in ascending order
+
+        :param fingerprint: Fingerprint of key
+        :param key: Key in bytes, see key_bytes
+        :return: Row number of the first occurrence if the key is a duplicate found in memory, otherwise 0. After
+        spilling, duplicates are returned by finish.
+        """
+        if self.table is None:
+            self.spill(fingerprint, key, row_number)
+            return 0
+
+        table = self.table
+        first = table.insert(fingerprint, key, row_number)
+        if first:
+            return first
+        if table.count > table.capacity:
+            size = TABLE_GROWTH * (table.mask + 1)
+            if len(table.records.data) <= self.key_data_limit(size):
+                self.table = table.resized(size)
+                self.data_limit = self.key_data_limit(size)
+            else:
+                self.start_spilling()
+        elif len(table.records.data) > self.data_limit:
+            self.start_spilling()
+        return 0
+
+    def key_data_limit(self, size):
+        """
+        :return: Bytes left for keys within the memory limit, by a table of size slots and its records when it is full
+        """
+        return self.memory_limit - SLOT_SIZE * size - RECORD_SIZE * (size // 2)
+
+    def start_spilling(self):
+        self.spill_directory = tempfile.mkdtemp(prefix="pycsvschema-keys-", dir=self.directory)
+        partitions = 1 << KEY_PARTITION_BITS
+        self.buffers = [array.array(UINT64) for _ in range(partitions)]
+        self.key_buffers = [bytearray() for _ in range(partitions)]
+        self.key_sizes = uint64_array(partitions)
+        if self.bloom_filter:
+            self.bloom = BloomFilter(max(self.memory_limit // 2, 1))
+
+        table, self.table = self.table, None
+        for fingerprint, key, row_number in table.items():
+            self.spill(fingerprint, key, row_number)
+
+    def spill(self, fingerprint, key, row_number):
+        if self.bloom is not None and self.bloom.add(fingerprint):
+            self.candidates.add(fingerprint)
+
+        partition = fingerprint >> (64 - KEY_PARTITION_BITS)
+        self.key_sizes[partition] += len(key)
+        self.buffers[partition].extend((fingerprint, row_number, self.key_sizes[partition]))
+        self.key_buffers[partition] += key
+        self.buffered += ENTRY_SIZE + len(key)
+        if self.buffered >= self.memory_limit // 2:
+            self.flush()
+
+    def flush(self):
+        for partition, buffer in enumerate(self.buffers):
+            if buffer:
+                with open(self.partition_path(partition), "ab") as f:
+                    buffer.tofile(f)
+                with open(self.key_path(partition), "ab") as f:
+                    f.write(self.key_buffers[partition])
+                del buffer[:]
+                del self.key_buffers[partition][:]
+        self.buffered = 0
+
+    def checkpoint(self):
+        """
+        Write buffered keys into partitions and keep their sizes, so a copy of this index pickled now can be restored
+        after more keys are spilled
+        """
+        if self.table is not None:
+            return
+        self.flush()
+        self.partition_sizes = [
+            os.path.getsize(path) if os.path.exists(path) else 0
+            for path in map(self.partition_path, range(len(self.buffers)))
+        ]
+
+    def restore(self):
+        """
+        Cut partitions back to their sizes at the checkpoint
+        """
+        if self.table is not None:
+            return
+        if not os.path.isdir(self.spill_directory):
+            raise ValueError("Spilled keys of the checkpoint are missing in {0}".format(self.spill_directory))
+        for partition, size in enumerate(self.partition_sizes):
+            path = self.partition_path(partition)
+            if os.path.exists(path):
+                os.truncate(path, size)
+                os.truncate(self.key_path(partition), self.key_sizes[partition])
+
+    def partition_path(self, partition):
+        return os.path.join(self.spill_directory, "{0:03d}".format(partition))
+
+    def key_path(self, partition):
+        return self.partition_path(partition) + ".keys"
+
+    def finish(self):
+        """
+        Find duplicates in spilled partitions
+
+        :return: List of (row number of the first occurrence, row number of the duplicate), sorted by the latter
+        """
+        if self.table is not None:
+            return []
+        self.flush()
+
+        duplicates = []
+        for partition in range(len(self.buffers)):
+            path = self.partition_path(partition)
+            if not os.path.exists(path):
+                continue
+            entries = array.array(UINT64)
+            with open(path, "rb") as f:
+                entries.frombytes(f.read())
+            fingerprints = entries[0::3]
+
+            if self.bloom is not None:
+                duplicated = self.candidates.intersection(fingerprints)
+            else:
+                ordered = sorted(fingerprints)
+                duplicated = {a for a, b in zip(ordered, ordered[1:]) if a == b}
+            if not duplicated:
+                continue
+
+            # Keys are only read for fingerprints found more than once, and compared to rule out collisions. Entries
+            # of a partition are in the order they are added, so the first one of a key is the first occurrence.
+            with open(self.key_path(partition), "rb") as f:
+                data = f.read()
+            firsts = {}
+            start = 0
+            for fingerprint, row_number, end in zip(fingerprints, entries[1::3], entries[2::3]):
+                if fingerprint in duplicated:
+                    first = firsts.setdefault(data[start:end], row_number)
+                    if first != row_number:
+                        duplicates.append((first, row_number))
+                start = end
+
+        duplicates.sort(key=lambda duplicate: duplicate[1])
+        return duplicates
+
+    def close(self):
+        if self.spill_directory is not None:
+            shutil.rmtree(self.spill_directory, ignore_errors=True)
+            self.spill_directory = None
+
+
+KEY_TEMPLATES = {
+    "unique": "Value is duplicate of row {0}",
+    "primaryKey": "Primary key is duplicate of row {0}",
+}
+
+
+def duplicate_error(key, first, row_number):
+    return exceptions.ErrorRecord(
+        rule=key["rule"], template=KEY_TEMPLATES[key["rule"]], value=first, column=key["column"], row_number=row_number
+    )
+
+
+def missing_key_error(key, values, row_number):
+    return exceptions.ErrorRecord(
+        rule=key["rule"],
+        template="Primary key ({0}) has missing value",
+        value=", ".join(values),
+        column=key["column"],
+        row_number=row_number,
+    )
+
+
+class KeyChecker(object):
+    def __init__(
+        self, keys, missing_values, memory_limit=None, directory=None, bloom_filter=False, stable_fingerprints=False
+    ):
+        """
+        Check keys of rows of one CSV file
+
+        :param keys: Keys found by header_validators.field_keys, see Validator.column_validators["keys"]
+        :param missing_values: Values which are missing, keys with a missing value are not checked
+        :param memory_limit: Memory limit of all keys in bytes. Default: None, KEY_MEMORY_LIMIT.
+        :param directory: Directory to spill keys into, see KeyIndex. Default: None.
+        :param bloom_filter: Whether to use Bloom filters after spilling, see KeyIndex. Default: False.
+        :param stable_fingerprints: Whether fingerprints must be the same in all processes, e.g. to resume from a
+        checkpoint in another process. Default: False.
+        """
+        self.keys = keys
+        self.missing_values = missing_values
+        self.mappers = [key_mappers(key) for key in keys]
+        if stable_fingerprints:
+            self.fingerprint = fingerprint
+        memory_limit = (KEY_MEMORY_LIMIT if memory_limit is None else memory_limit) // max(len(keys), 1)
+        self.indexes = [KeyIndex(memory_limit, directory=directory, bloom_filter=bloom_filter) for _ in keys]
+
+    fingerprint = staticmethod(local_fingerprint)
+
+    def fingerprints(self, row, row_number, errors):
+        """
+        Yield (key position, fingerprint, key in bytes) of keys of a row, keys with a missing value are left out, and
+        errors of primary keys with a missing value are appended to errors
+        """
+        missing_values = self.missing_values
+        for position, key in enumerate(self.keys):
+            values = [row[index] for index in key["indexes"]]
+            if any(value in missing_values for value in values):
+                if key["rule"] == "primaryKey":
+                    errors.append(missing_key_error(key, values, row_number))
+                continue
+            key_value = key_bytes(values, self.mappers[position])
+            yield position, self.fingerprint(key_value), key_value
+
+    def check(self, row, row_number):
+        """
+        :return: List of errors of primary keys with a missing value and duplicates found in memory
+        """
+        errors = []
+        for position, key_fingerprint, key_value in self.fingerprints(row, row_number, errors):
+            first = self.indexes[position].add(key_fingerprint, key_value, row_number)
+            if first:
+                errors.append(duplicate_error(self.keys[position], first, row_number))
+        return errors
+
+    def merge(self, collector, row_offset):
+        """
+        Check keys collected by a KeyCollector from rows after row_offset
+
+        :return: List of errors of duplicates found in memory
+        """
+        errors = []
+        for position, row_number, key_fingerprint, key_value in collector.entries():
+            row_number += row_offset
+            first = self.indexes[position].add(key_fingerprint, key_value, row_number)
+            if first:
+                errors.append(duplicate_error(self.keys[position], first, row_number))
+        return errors
+
+    def finish(self):
+        """
+        :return: List of errors of duplicates found in spilled keys, sorted by row number
+        """
+        errors = []
+        for key, index in zip(self.keys, self.indexes):
+            errors.extend(duplicate_error(key, first, row_number) for first, row_number in index.finish())
+        errors.sort(key=lambda error: error.row_number)
+        return errors
+
+    def checkpoint(self):
+        for index in self.indexes:
+            index.checkpoint()
+
+    def restore(self):
+        for index in self.indexes:
+            index.restore()
+
+    def close(self):
+        for index in self.indexes:
+            index.close()
+
+
+class KeyCollector(KeyChecker):
+    """
+    Collect keys and their fingerprints in a worker process, instead of checking them, see KeyChecker.merge
+    """
+
+    fingerprint = staticmethod(fingerprint)
+
+    def __init__(self, keys, missing_values):
+        self.keys = keys
+        self.missing_values = missing_values
+        self.mappers = [key_mappers(key) for key in keys]
+        # Interleaved key positions, row numbers, fingerprints and ends of keys in self.data
+        self.collected = array.array(UINT64)
+        self.data = bytearray()
+
+    def check(self, row, row_number):
+        errors = []
+        for position, key_fingerprint, key_value in self.fingerprints(row, row_number, errors):
+            self.data += key_value
+            self.collected.extend((position, row_number, key_fingerprint, len(self.data)))
+        return errors
+
+    def entries(self):
+        """
+        Yield (key position, row number, fingerprint, key in bytes) of collected keys
+        """
+        collected = self.collected
+        start = 0
+        for position, row_number, key_fingerprint, end in zip(
+            collected[0::4], collected[1::4], collected[2::4], collected[3::4]
+        ):
+            yield position, row_number, key_fingerprint, bytes(self.data[start:end])
+            start = end
+
+    def finish(self):
+        return []
+
+    def close(self):
+        pass
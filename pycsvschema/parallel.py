@@ -0,0 +1,312 @@
+#!/usr/bin/python
+# -*-coding: utf-8 -*-
+
+import concurrent.futures
+import contextlib
+import csv
+import heapq
+import io
+import itertools
+import locale
+import os
+import pickle
+import shutil
+import tempfile
+from operator import attrgetter
+
+from pycsvschema import instruments, keys, profiles, readers, references, validators
+
+# Check rows of one large CSV file in multiple processes
+#
+# The file is split into byte ranges on record boundaries. Each worker process rebuilds the validator from the schema,
+# the header and the column validators prepared by check_header in the main process, so header is checked only once.
+# Keys of `unique` and `primaryKey` span chunks, so workers only fingerprint them and the main process checks them.
+# Indexes of `reference` files are loaded by the main process and passed to workers, so every file is read once.
+#
+# Workers read their byte ranges as streams, and pickle errors in batches into a spool directory, which the main process
+# reads back batch by batch, so neither holds all records or all errors of a chunk.
+
+BLOCK_SIZE = 1 << 20
+MIN_CHUNK_SIZE = 1 << 20
+CHUNKS_PER_JOB = 4
+ERROR_BATCH_SIZE = 1 << 12
+
+_validator = None
+
+
+def can_split(dialect):
+    """
+    Whether record boundaries of CSV files in dialect can be found by counting quote chars, see find_record_boundaries
+
+    An escape char can escape a quote char or a line break, a quote char in a quoted field ends the quotes if
+    doublequote is off, and quote chars are plain characters with QUOTE_NONE.
+    """
+    return (
+        bool(dialect.quotechar)
+        and dialect.escapechar is None
+        and dialect.doublequote
+        and dialect.quoting != csv.QUOTE_NONE
+    )
+
+
+def find_header_end(csvfile, dialect, encoding):
+    """
+    Offset right after the first record of csvfile, found by parsing it with dialect, so it is exact in any dialect
+
+    :param encoding: ASCII compatible codec, see readers.mapped_encoding
+    :return: Offset, or None if the file has no record
+    """
+    with open(csvfile, "rb") as f:
+        consumed = [0]
+        if next(csv.reader(readers.read_lines(f, encoding, consumed), dialect), None) is None:
+            return None
+        return consumed[0]
+
+
+def find_record_boundaries(csvfile, quotechar, start, targets, block_size=BLOCK_SIZE):
+    """
+    Find the first record boundary after each target offset, scanning csvfile from start
+
+    A record boundary is the offset right after a line break which is not quoted. Quote chars are counted from start,
+    escaped quote chars in a quoted field always come in pairs, so they do not change whether a line break is quoted.
+    This only holds for dialects where can_split is True.
+
+    :param csvfile: Path to CSV file
+    :param quotechar: Quote char in bytes
+    :param start: Offset of the beginning of a record
+    :param targets: Sorted offsets to split the file
+    :return: Sorted list of unique record boundaries
+    """
+    boundaries = []
+    targets = iter(targets)
+    target = next(targets, None)
+    quoted = False
+    offset = start
+
+    with open(csvfile, "rb") as f:
+        f.seek(start)
+        while target is not None:
+            block = f.read(block_size)
+            if not block:
+                break
+            block_end = offset + len(block)
+
+            if target >= block_end:
+                quoted ^= block.count(quotechar) % 2 == 1
+                offset = block_end
+                continue
+
+            # Jump to the target, then look for the next line break out of quotes
+            position = max(target - offset, 0)
+            quoted ^= block.count(quotechar, 0, position) % 2 == 1
+            while target is not None:
+                newline = block.find(b"\n", position)
+                if newline == -1:
+                    quoted ^= block.count(quotechar, position) % 2 == 1
+                    break
+                quoted ^= block.count(quotechar, position, newline) % 2 == 1
+                position = newline + 1
+                if quoted or offset + position <= target:
+                    continue
+
+                boundaries.append(offset + position)
+                while target is not None and target < offset + position:
+                    target = next(targets, None)
+                if target is not None and target - offset > position:
+                    quoted ^= block.count(quotechar, position, target - offset) % 2 == 1
+                    position = target - offset
+            offset = block_end
+
+    return boundaries
+
+
+def split_records(csvfile, quotechar, chunks):
+    """
+    Split CSV file into byte ranges of records, excluding header
+
+    :return: Tuple of (header end offset, list of (start, end) byte ranges)
+    """
+    size = os.path.getsize(csvfile)
+
+    header_end = find_record_boundaries(csvfile=csvfile, quotechar=quotechar, start=0, targets=[0])
+    if not header_end:
+        return size, []
+    header_end = header_end[0]
+
+    chunks = max(min(chunks, (size - header_end) // MIN_CHUNK_SIZE), 1)
+    targets = [header_end + (size - header_end) * i // chunks for i in range(1, chunks)]
+    boundaries = find_record_boundaries(csvfile=csvfile, quotechar=quotechar, start=header_end, targets=targets)
+
+    starts = [header_end] + boundaries
+    ends = boundaries + [size]
+    return header_end, [(start, end) for start, end in zip(starts, ends) if start < end]
+
+
+def init_worker(validator_class, options, header, column_validators, reference_indexes):
+    global _validator
+
+    references.install_indexes(reference_indexes)
+    _validator = validator_class(**options)
+    _validator.header = header
+    _validator.header_length = len(header)
+    _validator.column_validators = column_validators
+
+
+class ByteRange(io.RawIOBase):
+    """
+    Raw binary file of byte range [start, end) of an open file
+    """
+
+    def __init__(self, f, start, end):
+        self.f = f
+        self.f.seek(start)
+        self.remaining = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self.remaining)
+        if size <= 0:
+            return 0
+        read = self.f.readinto(memoryview(buffer)[:size])
+        self.remaining -= read
+        return read
+
+
+@contextlib.contextmanager
+def open_chunk(start, end):
+    """
+    Yield rows of records in byte range [start, end) of the CSV file
+    """
+    if _validator.memory_map and readers.can_map(_validator.csvfile, _validator.csv_dialect, _validator.encoding):
+        with readers.open_mapped_rows(
+            _validator.csvfile,
+            dialect=_validator.csv_dialect,
+            encoding=_validator.encoding,
+            start=start,
+            end=end,
+            columns=_validator.read_columns(),
+            header_length=_validator.header_length,
+        ) as csv_reader:
+            yield csv_reader
+        return
+
+    # Decode the same way as open(csvfile, "r") does, while the range is read
+    with open(_validator.csvfile, "rb") as f, io.TextIOWrapper(
+        io.BufferedReader(ByteRange(f, start, end), readers.READ_SIZE),
+        encoding=_validator.encoding or locale.getpreferredencoding(False),
+    ) as text:
+        yield csv.reader(text, dialect=_validator.csv_dialect)
+
+
+def spool_path(spool, start):
+    return os.path.join(spool, "{0:020d}".format(start))
+
+
+def read_errors(path, row_offset):
+    """
+    Yield errors pickled by check_chunk, adding row_offset to their row numbers
+    """
+    with open(path, "rb") as f:
+        while True:
+            try:
+                errors = pickle.load(f)
+            except EOFError:
+                break
+            for error in errors:
+                if error.row_number is not None:
+                    error.row_number += row_offset
+                yield error
+    os.remove(path)
+
+
+def check_chunk(start, end, spool):
+    """
+    Check records in byte range [start, end) of the CSV file
+
+    Errors are pickled in lists of at most ERROR_BATCH_SIZE into a file in spool directory, see spool_path and
+    read_errors.
+
+    :return: Tuple of (number of rows, profiler, instruments, key collector), row numbers of errors and keys start from
+    1 in the chunk
+    """
+    rows = [0]
+
+    def count_rows(row_index, row):
+        rows[0] = row_index + 1
+
+    if _validator.profiler is not None:
+        _validator.profiler = profiles.Profiler(precision=_validator.profiler.precision)
+    if _validator.instruments is not None:
+        _validator.instruments = instruments.Instruments()
+    if _validator.column_validators["keys"]:
+        _validator.key_checker = keys.KeyCollector(
+            _validator.column_validators["keys"],
+            missing_values=validators.data_validators.find_missing_values(_validator.schema),
+        )
+
+    check_rows = _validator.check_rows if _validator.batch_size is None else _validator.check_batches
+    with open_chunk(start, end) as csv_reader, open(spool_path(spool, start), "wb") as f:
+        errors = check_rows(csv_reader, callback=count_rows)
+        for batch in iter(lambda: list(itertools.islice(errors, ERROR_BATCH_SIZE)), []):
+            pickle.dump(batch, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return rows[0], _validator.profiler, _validator.instruments, _validator.key_checker
+
+
+def check_rows(validator, jobs):
+    """
+    Check rows of validator.csvfile in jobs processes, errors are yielded in the order of row number
+
+    validator.check_header must have run, since workers reuse validator.column_validators. The dialect of validator
+    must be splittable, see can_split.
+    """
+    quotechar = validator.csv_dialect.quotechar.encode(validator.encoding or locale.getpreferredencoding(False))
+    _, chunks = split_records(csvfile=validator.csvfile, quotechar=quotechar, chunks=jobs * CHUNKS_PER_JOB)
+
+    options = {
+        "csvfile": validator.csvfile,
+        "schema": validator.schema,
+        "strict": validator.strict,
+        "batch_size": validator.batch_size,
+        "encoding": validator.encoding,
+        "profiler": validator.profiler,
+        "cache_size": validator.cache_size,
+        "memory_map": validator.memory_map,
+        # Callback of instruments is only called in the main process, and it might not be picklable
+        "instruments": None if validator.instruments is None else instruments.Instruments(),
+    }
+    spool = tempfile.mkdtemp(prefix="pycsvschema-errors-")
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=init_worker,
+            initargs=(
+                type(validator),
+                options,
+                validator.header,
+                validator.column_validators,
+                references.export_indexes(references.find_references(validator.column_validators)),
+            ),
+        ) as executor:
+            futures = [executor.submit(check_chunk, start, end, spool) for start, end in chunks]
+            try:
+                row_offset = 0
+                for (start, _), future in zip(chunks, futures):
+                    rows, profiler, chunk_instruments, key_collector = future.result()
+                    if profiler is not None:
+                        validator.profiler.merge(profiler)
+                    if chunk_instruments is not None:
+                        validator.instruments.merge(chunk_instruments)
+                    errors = read_errors(spool_path(spool, start), row_offset)
+                    if key_collector is not None:
+                        key_errors = validator.key_checker.merge(key_collector, row_offset)
+                        errors = heapq.merge(errors, key_errors, key=attrgetter("row_number"))
+                    yield from errors
+                    row_offset += rows
+            finally:
+                for future in futures:
+                    future.cancel()
+    finally:
+        # Errors of chunks which are not read, once the caller stops early
+        shutil.rmtree(spool, ignore_errors=True)
@@ -0,0 +1,585 @@
+#!/usr/bin/python
+# -*-coding: utf-8 -*-
+
+import bz2
+import codecs
+import collections
+import contextlib
+import csv
+import functools
+import gzip
+import io
+import itertools
+import locale
+import lzma
+import mmap
+import os
+import queue
+import re
+import threading
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# Readers turn the csvfile of Validator into an iterator of rows
+#
+# Supported csvfile:
+#   path to CSV file, str or os.PathLike
+#   bytes, bytearray or memoryview
+#   text file-like object
+#   binary file-like object
+#   iterable of str lines, bytes chunks, or pre-split rows (list or tuple of str)
+#
+# Uncompressed paths can also be memory-mapped, see MappedReader.
+#
+# Paths, bytes and buffered binary file-like objects compressed with gzip, bz2, xz or zstd (zstandard package required)
+# are detected by magic number, or by extension for empty paths, and decompressed while they are read.
+
+# Encoding of binary input if encoding is not given, path is opened with the locale encoding like open() does
+DEFAULT_BINARY_ENCODING = "utf-8"
+READ_SIZE = 1 << 16
+
+# Compressed data is read in larger chunks, and decompressed ahead in a background thread
+COMPRESSED_READ_SIZE = 1 << 20
+COMPRESSED_QUEUE_SIZE = 4
+
+MAGIC_NUMBERS = [(b"\x1f\x8b", "gzip"), (b"BZh", "bz2"), (b"\xfd7zXZ\x00", "xz"), (b"\x28\xb5\x2f\xfd", "zstd")]
+MAGIC_SIZE = 6
+EXTENSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz", ".zst": "zstd"}
+
+
+def open_zstd(fileobj):
+    if zstandard is None:
+        raise ValueError("zstandard package is required to read zstd compressed data")
+    return zstandard.ZstdDecompressor().stream_reader(fileobj)
+
+
+# Openers of compressed data, each one accepts a binary file object and returns a decompressed one
+COMPRESSIONS = {
+    "gzip": functools.partial(gzip.open, mode="rb"),
+    "bz2": functools.partial(bz2.open, mode="rb"),
+    "xz": functools.partial(lzma.open, mode="rb"),
+    "zstd": open_zstd,
+}
+
+
+def is_path(csvfile):
+    return isinstance(csvfile, (str, os.PathLike))
+
+
+def detect_magic(head):
+    """
+    :param head: First bytes of data, at least MAGIC_SIZE bytes unless data is shorter
+    :return: Compression name, or None if data is not compressed
+    """
+    for magic, compression in MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def detect_compression(path):
+    """
+    Detect compression of a file by its magic number, or by its extension if the file is empty
+
+    All supported compressions have magic numbers, so a plain CSV file named *.gz is not compressed.
+
+    :return: Compression name, or None if the file is not compressed
+    """
+    with open(path, "rb") as f:
+        head = f.read(MAGIC_SIZE)
+    if head:
+        return detect_magic(head)
+    return EXTENSIONS.get(os.path.splitext(os.fspath(path))[1].lower())
+
+
+def iter_threaded(f, size=COMPRESSED_READ_SIZE, depth=COMPRESSED_QUEUE_SIZE):
+    """
+    Read chunks of a binary file object in a background thread, so decompression overlaps checking rows
+
+    Decompressors release the GIL, so up to depth chunks are decompressed while rows of earlier chunks are checked.
+    """
+    chunks = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def put(item):
+        while not stopped.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def produce():
+        try:
+            while not stopped.is_set():
+                chunk = f.read(size)
+                put(chunk)
+                if not chunk:
+                    return
+        except BaseException as e:
+            put(e)
+
+    thread = threading.Thread(target=produce, name="pycsvschema-decompress", daemon=True)
+    thread.start()
+    try:
+        while True:
+            chunk = chunks.get()
+            if isinstance(chunk, BaseException):
+                raise chunk
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        stopped.set()
+        thread.join()
+
+
+@contextlib.contextmanager
+def open_decompressed(fileobj, compression, encoding):
+    """
+    Decompress a binary file object and yield an iterator of lines, decompressed in a background thread
+    """
+    with COMPRESSIONS[compression](fileobj) as f:
+        chunks = iter_threaded(f)
+        try:
+            yield decode_chunks(chunks, encoding)
+        finally:
+            # Stop the background thread if rows are not read to the end
+            chunks.close()
+
+
+def decode_chunks(chunks, encoding):
+    """
+    Decode bytes chunks incrementally into lines
+
+    Line breaks are translated into "\\n" like open(csvfile, "r") does. A character or a line split across chunks is
+    joined before it is yielded.
+    """
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder(encoding)(), translate=True)
+    pending = ""
+    for chunk in chunks:
+        lines = (pending + decoder.decode(chunk)).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def split_bytes(data, size=READ_SIZE):
+    data = memoryview(data)
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def split_chunk(chunk, size=READ_SIZE):
+    """
+    Split a str or bytes chunk into pieces of at most size
+    """
+    if len(chunk) <= size:
+        return [chunk]
+    return [chunk[start : start + size] for start in range(0, len(chunk), size)]
+
+
+async def iter_async_chunks(stream, size=READ_SIZE):
+    """
+    Async generator of chunks from an object with coroutine read(size), or an async iterable of chunks
+    """
+    if hasattr(stream, "read"):
+        while True:
+            chunk = await stream.read(size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        async for chunk in stream:
+            yield chunk
+
+
+def iter_lines(csvfile, encoding=None):
+    """
+    Turn a csvfile which is not a path into an iterator of lines or rows
+
+    :return: Tuple of (iterator, whether items are pre-split rows)
+    """
+    encoding = encoding or DEFAULT_BINARY_ENCODING
+
+    if isinstance(csvfile, (bytes, bytearray, memoryview)):
+        return decode_chunks(split_bytes(csvfile), encoding), False
+
+    if hasattr(csvfile, "read"):
+        if isinstance(csvfile, io.TextIOBase) or isinstance(csvfile.read(0), str):
+            return iter(csvfile), False
+        return decode_chunks(iter(functools.partial(csvfile.read, READ_SIZE), b""), encoding), False
+
+    items = iter(csvfile)
+    first = next(items, None)
+    if first is None:
+        return iter(()), False
+    items = itertools.chain((first,), items)
+
+    if isinstance(first, (bytes, bytearray, memoryview)):
+        return decode_chunks(items, encoding), False
+    if isinstance(first, str):
+        return items, False
+    return items, True
+
+
+@contextlib.contextmanager
+def open_rows(csvfile, dialect, encoding=None, memory_map=False):
+    """
+    Open csvfile and yield an iterator of rows parsed with dialect
+
+    Paths are opened and closed here, file-like objects are left open for the caller.
+
+    :param memory_map: Whether to read a path with MappedReader if it can be mapped, see can_map
+    """
+    if memory_map and can_map(csvfile, dialect, encoding):
+        with open_mapped_rows(csvfile, dialect, encoding) as rows:
+            yield rows
+        return
+
+    if is_path(csvfile):
+        compression = detect_compression(csvfile)
+        if compression is None:
+            with open(csvfile, "r", encoding=encoding) as f:
+                yield csv.reader(f, dialect=dialect)
+            return
+        # Decode the same way as open(csvfile, "r") does
+        with open(csvfile, "rb") as f, open_decompressed(
+            f, compression, encoding or locale.getpreferredencoding(False)
+        ) as lines:
+            yield csv.reader(lines, dialect=dialect)
+        return
+
+    compression = None
+    if isinstance(csvfile, (bytes, bytearray, memoryview)):
+        compression = detect_magic(bytes(csvfile[:MAGIC_SIZE]))
+        if compression is not None:
+            csvfile = io.BytesIO(csvfile)
+    elif hasattr(csvfile, "peek") and not isinstance(csvfile, io.TextIOBase):
+        # Buffered binary file-like objects can be checked without consuming data
+        compression = detect_magic(csvfile.peek(MAGIC_SIZE)[:MAGIC_SIZE])
+
+    if compression is not None:
+        with open_decompressed(csvfile, compression, encoding or DEFAULT_BINARY_ENCODING) as lines:
+            yield csv.reader(lines, dialect=dialect)
+        return
+
+    items, is_rows = iter_lines(csvfile, encoding=encoding)
+    yield items if is_rows else csv.reader(items, dialect=dialect)
+
+
+class LineQueue(object):
+    """
+    Iterator of lines which can be refilled after it is drained, used as the input of a long-living csv.reader
+    """
+
+    def __init__(self):
+        self.lines = collections.deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+class PushReader(object):
+    def __init__(self, dialect, encoding=None):
+        """
+        Parse rows from str or bytes chunks pushed one by one
+
+        A record is only parsed when it is complete, that is, its last line break is not quoted. So records and
+        characters split across chunks are handled.
+
+        :param dialect: CSV dialect
+        :param encoding: Encoding of bytes chunks. Default: None, utf-8.
+        """
+        self.encoding = encoding or DEFAULT_BINARY_ENCODING
+        self.quotechar = dialect.quotechar
+        self.decoder = None
+        self.is_binary = None
+        self.pending = ""
+        # Lines of the incomplete record, and whether its end is inside quotes
+        self.record = []
+        self.quoted = False
+        self.lines = LineQueue()
+        self.reader = csv.reader(self.lines, dialect=dialect)
+
+    def push(self, chunk):
+        """
+        :param chunk: str or bytes chunk, all chunks must be the same type
+        :return: List of rows completed by this chunk
+        """
+        is_binary = not isinstance(chunk, str)
+        if self.decoder is None:
+            self.is_binary = is_binary
+            decoder = codecs.getincrementaldecoder(self.encoding)() if is_binary else None
+            self.decoder = io.IncrementalNewlineDecoder(decoder, translate=True)
+        elif is_binary is not self.is_binary:
+            raise TypeError("Chunks must be all str or all bytes")
+
+        lines = (self.pending + self.decoder.decode(chunk)).split("\n")
+        self.pending = lines.pop()
+        return self.parse_lines(line + "\n" for line in lines)
+
+    def close(self):
+        """
+        :return: List of rows left in the buffer, including the last record without line break
+        """
+        if self.decoder is not None:
+            self.pending += self.decoder.decode(b"" if self.is_binary else "", final=True)
+        lines = [self.pending] if self.pending else []
+        self.pending = ""
+        rows = self.parse_lines(lines)
+
+        # Incomplete record at the end of data is left for csv.reader to handle
+        self.lines.lines.extend(self.record)
+        self.record = []
+        rows.extend(self.reader)
+        return rows
+
+    def parse_lines(self, lines):
+        rows = []
+        for line in lines:
+            self.record.append(line)
+            self.quoted ^= line.count(self.quotechar) % 2 == 1
+            if self.quoted:
+                continue
+
+            self.lines.lines.extend(self.record)
+            self.record = []
+            rows.append(next(self.reader))
+        return rows
+
+
+# Memory-mapped files are sliced into blocks of whole lines, and lines are split into fields as bytes
+MAPPED_BLOCK_SIZE = 1 << 22
+# Decode whole records if at least this share of columns has validators
+MAPPED_DECODE_ALL_RATIO = 0.25
+UTF8_BOM = codecs.BOM_UTF8
+
+
+def mapped_encoding(dialect, encoding):
+    """
+    Find the codec to decode fields of a memory-mapped file with
+
+    Fields are split on delimiter, quote char and line break bytes before they are decoded, so this only works if these
+    characters are ASCII and encoding never uses ASCII bytes in other characters, e.g. utf-8, latin-1 or cp1252.
+
+    :return: Tuple of (codec name, whether to skip utf-8 BOM), or None if the file can not be mapped
+    """
+    try:
+        name = codecs.lookup(encoding).name
+    except LookupError:
+        return None
+    if name == "utf-8-sig":
+        return "utf-8", True
+
+    special = "".join(filter(None, (dialect.delimiter, dialect.quotechar, dialect.escapechar)))
+    sample = bytes(range(128)).decode("ascii")
+    try:
+        special.encode("ascii")
+        if sample.encode(name) != sample.encode("ascii"):
+            return None
+    except UnicodeEncodeError:
+        return None
+    return name, False
+
+
+def read_lines(f, encoding, consumed):
+    """
+    Yield decoded lines of a binary file in an ASCII compatible encoding, adding bytes of every line to consumed[0]
+
+    csv.reader pulls lines one at a time, so after it yields a record, consumed[0] is the offset right after it.
+    """
+    for line in iter(f.readline, b""):
+        consumed[0] += len(line)
+        yield line.decode(encoding)
+
+
+def can_map(path, dialect, encoding=None):
+    """
+    Whether a CSV file can be read with MappedReader, that is, it is an uncompressed and non-empty local file with an
+    ASCII compatible encoding, see mapped_encoding
+    """
+    if not is_path(path) or detect_compression(path) is not None or os.path.getsize(path) == 0:
+        return False
+    return mapped_encoding(dialect, encoding or locale.getpreferredencoding(False)) is not None
+
+
+@contextlib.contextmanager
+def open_mapped_rows(path, dialect, encoding=None, start=0, end=None, columns=None, header_length=None):
+    """
+    Map a CSV file into memory and yield a MappedReader of records in byte range [start, end)
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        yield MappedReader(
+            data,
+            dialect=dialect,
+            encoding=encoding or locale.getpreferredencoding(False),
+            start=start,
+            end=end,
+            columns=columns,
+            header_length=header_length,
+        )
+
+
+class MappedReader(object):
+    def __init__(self, data, dialect, encoding, start=0, end=None, columns=None, header_length=None):
+        """
+        Iterator of rows parsed from a memory-mapped CSV file, used instead of csv.reader(open(path))
+
+        Lines without quote char, carriage return or other characters needing csv.reader are split on delimiter in
+        bytes. Once select is called, only fields of the selected columns are decoded, fields of other columns are
+        None, and rows with a wrong number of fields are lists of None. Other lines are decoded and parsed by
+        csv.reader, which reads following lines until its record ends, so records are split exactly like
+        csv.reader(open(path)) does.
+
+        :param data: mmap or bytes of the CSV file
+        :param dialect: CSV dialect
+        :param encoding: Encoding of the file, see mapped_encoding
+        :param start: Offset of the first record
+        :param end: Offset after the last record. Default: None, end of data.
+        :param columns: Indexes of the columns to decode, see select. Default: None, decode all columns.
+        :param header_length: Number of fields of the header, required if columns is given
+        """
+        self.data = data
+        self.encoding, skip_bom = mapped_encoding(dialect, encoding)
+        self.start = len(UTF8_BOM) if skip_bom and start == 0 and data[: len(UTF8_BOM)] == UTF8_BOM else start
+        self.end = len(data) if end is None else end
+        self.delimiter = dialect.delimiter.encode(self.encoding)
+
+        # Lines with any of these are parsed by csv.reader, NUL is refused by csv.reader before Python 3.11
+        special = [b"\r", b"\x00"]
+        if dialect.quotechar:
+            special.append(dialect.quotechar.encode(self.encoding))
+        if dialect.escapechar:
+            special.append(dialect.escapechar.encode(self.encoding))
+        if dialect.skipinitialspace:
+            special.append(self.delimiter + b" ")
+        self.special_characters = special
+        self.special = re.compile(b"|".join(re.escape(character) for character in special))
+
+        # Whether the block of the line just read from self.lines has none of special, and whether the line is the
+        # last one and has no line break
+        self.plain = False
+        self.last_line = False
+        self.lines = self.iter_lines()
+        # Decoded lines waiting for csv.reader
+        self.text = collections.deque()
+        self.reader = csv.reader(self.iter_text(), dialect=dialect)
+
+        self.columns = None
+        self.header_length = None
+        if columns is not None:
+            self.select(columns, header_length)
+        self.rows = self.iter_rows()
+
+    def select(self, columns, header_length):
+        """
+        Only decode fields of columns from now on
+
+        :param columns: Indexes of columns, e.g. keys of column_validators["columns"]
+        :param header_length: Number of fields of the header
+        """
+        columns = sorted(columns)
+        if len(columns) >= header_length * MAPPED_DECODE_ALL_RATIO:
+            return
+        self.columns = columns
+        self.header_length = header_length
+
+    def __iter__(self):
+        # Iterate the generator directly, so rows are not passed through __next__
+        return self.rows
+
+    def __next__(self):
+        return next(self.rows)
+
+    def iter_lines(self):
+        """
+        Yield lines without line break, a block of lines is copied from data and split at a time
+        """
+        data = self.data
+        position = self.start
+        end = self.end
+        while position < end:
+            block_end = min(position + MAPPED_BLOCK_SIZE, end)
+            if block_end < end:
+                newline = data.rfind(b"\n", position, block_end)
+                if newline == -1:
+                    # Line longer than a block
+                    newline = data.find(b"\n", block_end, end)
+                    block_end = end if newline == -1 else newline + 1
+                else:
+                    block_end = newline + 1
+
+            block = data[position:block_end]
+            if b"\r" in block:
+                block = block.replace(b"\r\n", b"\n")
+            # Searching each character is much faster than the regular expression on large blocks
+            self.plain = not any(character in block for character in self.special_characters)
+            lines = block.split(b"\n")
+            last = lines.pop()
+            yield from lines
+            if last:
+                self.last_line = True
+                yield last
+            position = block_end
+
+    def iter_text(self):
+        """
+        Yield lines for csv.reader, line breaks are translated into "\\n" like open(path, "r") does
+        """
+        while True:
+            while self.text:
+                yield self.text.popleft()
+
+            line = next(self.lines, None)
+            if line is None:
+                return
+            self.push_text(line)
+
+    def push_text(self, line):
+        lines = line.decode(self.encoding).replace("\r", "\n").split("\n")
+        last = lines.pop()
+        self.text.extend(text + "\n" for text in lines)
+        if not self.last_line:
+            self.text.append(last + "\n")
+        elif last:
+            self.text.append(last)
+
+    def iter_rows(self):
+        encoding = self.encoding
+        delimiter = self.delimiter
+        text_delimiter = delimiter.decode(encoding)
+        special = self.special.search
+
+        for line in self.lines:
+            if not self.plain and special(line) is not None:
+                # csv.reader reads this line, and following lines if its record goes on
+                self.push_text(line)
+                while self.text:
+                    yield next(self.reader)
+                continue
+
+            columns = self.columns
+            if columns is None:
+                yield line.decode(encoding).split(text_delimiter) if line else []
+                continue
+
+            length = line.count(delimiter) + 1 if line else 0
+            row = [None] * length
+            if length == self.header_length and columns:
+                fields = line.split(delimiter, columns[-1] + 1)
+                for index in columns:
+                    row[index] = fields[index].decode(encoding)
+            yield row
@@ -0,0 +1,155 @@
+#!/usr/bin/python
+# -*-coding: utf-8 -*-
+
+import csv
+import hashlib
+import io
+import json
+import os
+import threading
+
+from pycsvschema import defaults
+from pycsvschema.validators import types
+
+# Indexes of `reference` of fields, the values of a field in another CSV file, e.g. a dimension table
+#
+# A reference file is read once into a frozenset of its values, and the index is kept in a module level cache shared
+# by all validators of the process. On every lookup, the cache is invalidated if the mtime or the size of the file
+# changes and its content hash differs too, so touching a file does not reload it. Worker processes receive the indexes
+# loaded by the main process, see export_indexes and install_indexes.
+
+REFERENCE_ENCODING = "utf-8"
+REFERENCE_DELIMITER = ","
+
+_lock = threading.Lock()
+# Sample _indexes {('/data/countries.csv', 'code', 'utf-8', ','): ReferenceIndex}
+_indexes = {}
+
+
+class ReferenceIndex(object):
+    __slots__ = ("values", "stat", "digest", "converted")
+
+    def __init__(self, values, stat, digest):
+        """
+        :param values: frozenset of raw values of the reference field
+        :param stat: Tuple of (st_mtime_ns, st_size) of the file when it was read
+        :param digest: blake2b digest of the file content
+        """
+        self.values = values
+        self.stat = stat
+        self.digest = digest
+        # Values converted into the type of referencing fields, sample {'{"type": "integer", ...}': frozenset({1, 2})}
+        self.converted = {}
+
+
+def reference_key(reference):
+    return (
+        os.path.abspath(reference["file"]),
+        reference["field"],
+        reference.get("encoding", REFERENCE_ENCODING),
+        reference.get("delimiter", REFERENCE_DELIMITER),
+    )
+
+
+def file_stat(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_index(key, data):
+    """
+    Read values of the reference field from the content of the reference file
+
+    :param key: Reference key, see reference_key
+    :param data: File content in bytes
+    """
+    path, field, encoding, delimiter = key
+    # utf-8-sig also reads utf-8 files saved with a BOM
+    if encoding.replace("_", "-").lower() in ("utf-8", "utf8"):
+        encoding = "utf-8-sig"
+    reader = csv.reader(io.StringIO(data.decode(encoding), newline=""), delimiter=delimiter)
+    header = next(reader, [])
+    if field not in header:
+        raise ValueError("{0} is not in header of reference file {1}".format(field, path))
+    index = header.index(field)
+    return frozenset(row[index] for row in reader if len(row) > index)
+
+
+def load_index(reference):
+    """
+    Find the index of a reference in the cache, (re)load it if the file is new or its content is changed
+
+    :param reference: `reference` option of a field
+    :return: ReferenceIndex
+    """
+    key = reference_key(reference)
+    stat = file_stat(key[0])
+    with _lock:
+        cached = _indexes.get(key)
+        if cached is not None and cached.stat == stat:
+            return cached
+
+        with open(key[0], "rb") as f:
+            data = f.read()
+        digest = hashlib.blake2b(data).digest()
+        if cached is not None and cached.digest == digest:
+            cached.stat = stat
+            return cached
+
+        _indexes[key] = ReferenceIndex(read_index(key, data), stat, digest)
+        return _indexes[key]
+
+
+def reference_values(field_schema):
+    """
+    Values of the reference of a field in a frozenset, values of number, integer and boolean fields are converted like
+    the values of the field, values failing the conversion are left out
+    """
+    index = load_index(field_schema["reference"])
+    type_name = field_schema.get("type", defaults.FIELDS_TYPE)
+    if type_name == "string":
+        return index.values
+
+    options = {name: field_schema[name] for name in ("groupChar", "trueValues", "falseValues") if name in field_schema}
+    options["type"] = type_name
+    conversion = json.dumps(options, sort_keys=True)
+    with _lock:
+        if conversion not in index.converted:
+            mapper = types.TYPE_MAPPER[type_name](field_schema=field_schema)
+            results = (mapper.validate(value) for value in index.values)
+            index.converted[conversion] = frozenset(value for passed, value in results if passed and value is not None)
+        return index.converted[conversion]
+
+
+def find_references(column_validators):
+    """
+    `reference` options of all columns, see Validator.column_validators
+    """
+    references = {}
+    for column_info in column_validators["columns"].values():
+        reference = column_info["field_schema"].get("reference")
+        if reference is not None:
+            references[reference_key(reference)] = reference
+    return list(references.values())
+
+
+def export_indexes(references):
+    """
+    Load indexes of references in the main process, to be passed to worker processes
+
+    :return: Dict of {reference key: ReferenceIndex}
+    """
+    return {reference_key(reference): load_index(reference) for reference in references}
+
+
+def install_indexes(indexes):
+    """
+    Put indexes from export_indexes into the cache of a worker process, they are still invalidated if the files change
+    """
+    with _lock:
+        _indexes.update(indexes)
+
+
+def clear_cache():
+    with _lock:
+        _indexes.clear()
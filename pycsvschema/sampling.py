@@ -0,0 +1,347 @@
+#!/usr/bin/python
+# -*-coding: utf-8 -*-
+
+import collections
+import csv
+import io
+import itertools
+import json
+import locale
+import math
+import os
+import random
+
+from pycsvschema import parallel, readers
+
+# Check the header and a sample of records instead of every record, and estimate error rates of the whole file
+#
+# The first `head` rows are checked in full. The rest of the file is split into strata of equal bytes, and a block of
+# block_size bytes at a random offset of each stratum is checked, so a 1% sample of a large file reads 1% of its bytes.
+# A random offset usually falls in the middle of a record, reading resyncs to the first line break after it where the
+# following records parse into the number of fields of the header. This can be fooled by quoted fields which contain
+# whole lines of valid records, blocks without such a line break are skipped.
+#
+# Input which can not be read at random offsets, e.g. compressed files and streams, is read in full, and every record
+# after the head is checked with probability `fraction`.
+#
+# Error rates are estimated per row, with Wilson score intervals. Rows of a block are not independent, e.g. a batch of
+# bad rows appended together, so the number of rows is first reduced by the design effect measured between blocks.
+
+SAMPLE_FRACTION = 0.01
+SAMPLE_BLOCK_SIZE = 1 << 14
+# Records after a line break which must parse into the number of fields of the header to resync there
+RESYNC_RECORDS = 4
+# Line breaks tried in a block before it is skipped
+RESYNC_ATTEMPTS = 64
+
+
+def z_score(confidence):
+    """
+    Two-sided z score of a confidence level of the normal distribution, e.g. 1.96 for 0.95
+    """
+    low, high = 0.0, 10.0
+    for _ in range(64):
+        middle = (low + high) / 2
+        if math.erf(middle / math.sqrt(2)) < confidence:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
+
+
+def wilson_interval(failures, total, z):
+    """
+    Wilson score interval of the proportion failures / total
+    """
+    if not total:
+        return 0.0, 1.0
+    rate = failures / total
+    denominator = 1 + z * z / total
+    center = (rate + z * z / (2 * total)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / total + z * z / (4 * total * total)) / denominator
+    return max(center - margin, 0.0), min(center + margin, 1.0)
+
+
+class Sampler(object):
+    def __init__(
+        self, fraction=SAMPLE_FRACTION, head=0, method="stratified", seed=None, confidence=0.95, fail_fast=True
+    ):
+        """
+        Check a sample of records and estimate error rates, pass it to Validator(sampler=...)
+
+        Rows of a sampled block have no known row number, their errors have row_number None, and `unique` and
+        `primaryKey` are not checked in them.
+
+        :param fraction: Fraction of bytes, or of records if input can not be read at random offsets, to check after
+        the head. The whole file is checked if the sample would cover it. Default: 0.01.
+        :param head: Number of first rows to check in full before sampling. Default: 0.
+        :param method: {'stratified', 'random'} Take one block from each stratum of equal bytes, or blocks at uniformly
+        random offsets. Default: 'stratified'.
+        :param seed: Seed of random offsets. Default: None.
+        :param confidence: Confidence level of intervals of estimated error rates. Default: 0.95.
+        :param fail_fast: Whether to stop without sampling if any error is found in the head. Default: True.
+        """
+        if not 0 < fraction <= 1:
+            raise ValueError("fraction must be in (0, 1]")
+        if head < 0:
+            raise ValueError("head must not be negative")
+        if method not in ("stratified", "random"):
+            raise ValueError("Unknown value for parameter method")
+        if not 0 < confidence < 1:
+            raise ValueError("confidence must be in (0, 1)")
+        self.fraction = fraction
+        self.head = head
+        self.method = method
+        self.seed = seed
+        self.confidence = confidence
+        self.fail_fast = fail_fast
+        self.block_size = SAMPLE_BLOCK_SIZE
+
+        self.head_rows = 0
+        self.head_errors = 0
+        # Whether every record was checked
+        self.complete = False
+        # Whether sampling was skipped because the head has errors
+        self.stopped = False
+        self.blocks = 0
+        self.skipped_blocks = 0
+        # Rows the estimates are based on, and the number of them failing each rule of each column
+        # Sample self.failures {('<COLUMN_NAME>', 'maximum'): 3}
+        self.rows = 0
+        self.failures = collections.Counter()
+        # Rows and failures of each sampled block, for the design effect, see effective_rows
+        self.block_rows = []
+        self.block_failures = []
+        # Head is not a random sample, its rows are only counted in the estimates if the file is checked in full
+        self.head_failures = collections.Counter()
+
+    def add(self, errors):
+        """
+        Count a checked row with its errors into the estimates
+        """
+        self.rows += 1
+        keys = set((error.column, error.rule) for error in errors)
+        self.failures.update(keys)
+        if self.block_rows:
+            self.block_rows[-1] += 1
+            self.block_failures[-1].update(keys)
+
+    def start_block(self):
+        self.blocks += 1
+        self.block_rows.append(0)
+        self.block_failures.append(collections.Counter())
+
+    def effective_rows(self, key, rate):
+        """
+        Number of rows divided by the design effect of blocks for a rule of a column, the design effect is the variance
+        of the rate between blocks over the variance of a simple random sample of the same rows, at least 1
+        """
+        blocks = len(self.block_rows)
+        if blocks < 2 or rate in (0, 1):
+            return self.rows
+        deviations = sum(
+            (failures[key] - rate * rows) ** 2 for rows, failures in zip(self.block_rows, self.block_failures)
+        )
+        cluster_variance = blocks / (blocks - 1) * deviations / self.rows**2
+        random_variance = rate * (1 - rate) / self.rows
+        return self.rows / max(cluster_variance / random_variance, 1.0)
+
+    def add_head(self, errors):
+        self.head_rows += 1
+        self.head_errors += len(errors)
+        self.head_failures.update(set((error.column, error.rule) for error in errors))
+
+    def check_all(self):
+        """
+        Mark the file as checked in full, the head is counted in the estimates
+        """
+        self.complete = True
+        self.rows += self.head_rows
+        self.failures.update(self.head_failures)
+
+    def estimates(self):
+        """
+        :return: List of estimated error rates of rules of columns, sorted by rate, rates are exact if the file is
+        checked in full
+        """
+        z = z_score(self.confidence)
+        estimates = []
+        for (column, rule), failures in self.failures.items():
+            rate = failures / self.rows
+            if self.complete:
+                low, high = rate, rate
+            else:
+                rows = self.effective_rows((column, rule), rate)
+                low, high = wilson_interval(rate * rows, rows, z)
+            estimates.append({"column": column, "rule": rule, "rows": failures, "rate": rate, "low": low, "high": high})
+        return sorted(estimates, key=lambda estimate: (-estimate["rate"], str(estimate["column"]), estimate["rule"]))
+
+    def report(self) -> dict:
+        return {
+            "head_rows": self.head_rows,
+            "head_errors": self.head_errors,
+            "complete": self.complete,
+            "stopped": self.stopped,
+            "blocks": self.blocks,
+            "skipped_blocks": self.skipped_blocks,
+            "rows": self.rows,
+            "confidence": self.confidence,
+            "estimates": self.estimates(),
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.report(), **kwargs)
+
+
+def block_offsets(sampler, start, end, rng):
+    """
+    Random offsets of sampled blocks in byte range [start, end), at least one block is sampled
+
+    :return: Sorted list of offsets, or None if the sample would cover the whole range
+    """
+    size = end - start
+    blocks = max(math.ceil(size * sampler.fraction / sampler.block_size), 1)
+    if sampler.fraction >= 1 or blocks * sampler.block_size >= size:
+        return None
+
+    if sampler.method == "random":
+        return sorted(rng.randrange(start, end - sampler.block_size + 1) for _ in range(blocks))
+    strata = [start + size * i // blocks for i in range(blocks + 1)]
+    return [rng.randrange(low, high - sampler.block_size + 1) for low, high in zip(strata, strata[1:])]
+
+
+def parse_records(data, at_eof, dialect, encoding, header_length):
+    """
+    Whether data starts with RESYNC_RECORDS records of header_length fields, or only such records until the end of
+    file. Records must end within data, so a quote opened by a wrong line break is never followed to the end of file.
+    """
+    consumed = [0]
+    reader = csv.reader(readers.read_lines(io.BytesIO(data), encoding, consumed), dialect)
+    try:
+        records = list(itertools.islice(reader, RESYNC_RECORDS))
+    except (csv.Error, UnicodeDecodeError):
+        return False
+    if any(len(record) != header_length for record in records):
+        return False
+    return at_eof or (len(records) == RESYNC_RECORDS and consumed[0] < len(data))
+
+
+def resync(f, offset, block_size, dialect, encoding, header_length):
+    """
+    Find the first line break at or after offset, where the following records parse into header_length fields
+
+    :return: Offset of the record after the line break, or None if it is not found within RESYNC_ATTEMPTS line breaks
+    """
+    # A line break right before offset makes offset itself a candidate
+    f.seek(max(offset - 1, 0))
+    if offset > 0:
+        f.readline()
+    for _ in range(RESYNC_ATTEMPTS):
+        candidate = f.tell()
+        data = f.read(block_size)
+        if parse_records(data, len(data) < block_size, dialect, encoding, header_length):
+            return candidate
+        f.seek(candidate)
+        if not f.readline():
+            return None
+    return None
+
+
+def check_rows(validator, sampler, csv_reader):
+    """
+    Check the head and a sample of rows of validator.csvfile, the header is already read from csv_reader
+
+    validator.check_header must have run, see compile_row_checker.
+    """
+    rng = random.Random(sampler.seed)
+    check_row = validator.compile_row_checker()
+    encoding = validator.encoding or locale.getpreferredencoding(False)
+    seekable = readers.can_map(validator.csvfile, validator.csv_dialect, encoding)
+    if not seekable:
+        yield from check_stream(validator, sampler, csv_reader, check_row, rng)
+        return
+
+    codec, _ = readers.mapped_encoding(validator.csv_dialect, encoding)
+    header_end = parallel.find_header_end(validator.csvfile, validator.csv_dialect, codec)
+    if header_end is None:
+        sampler.check_all()
+        return
+    size = os.path.getsize(validator.csvfile)
+
+    with open(validator.csvfile, "rb") as f:
+        f.seek(header_end)
+        consumed = [header_end]
+        rows = enumerate(csv.reader(readers.read_lines(f, codec, consumed), validator.csv_dialect), start=1)
+        yield from check_head(sampler, rows, check_row)
+        if sampler.stopped:
+            return
+
+        offsets = block_offsets(sampler, consumed[0], size, rng)
+        if offsets is None:
+            sampler.check_all()
+            for row_number, row in rows:
+                errors = check_row(row, row_number)
+                sampler.add(errors)
+                yield from errors
+            return
+
+        # Rows of blocks have no row number, and their keys are not checked
+        key_checker, validator.key_checker = validator.key_checker, None
+        try:
+            check_block_row = validator.compile_row_checker()
+        finally:
+            validator.key_checker = key_checker
+
+        block_end = consumed[0]
+        for offset in offsets:
+            start = resync(
+                f, max(offset, block_end), sampler.block_size, validator.csv_dialect, codec, validator.header_length
+            )
+            if start is None:
+                sampler.skipped_blocks += 1
+                continue
+            sampler.start_block()
+            f.seek(start)
+            consumed = [start]
+            record_start = start
+            for row in csv.reader(readers.read_lines(f, codec, consumed), validator.csv_dialect):
+                errors = check_block_row(row, None)
+                sampler.add(errors)
+                yield from errors
+                record_start = consumed[0]
+                if record_start >= offset + sampler.block_size:
+                    break
+            block_end = record_start
+
+
+def check_head(sampler, rows, check_row):
+    """
+    Check the first sampler.head rows of an iterator of (row number, row)
+    """
+    for row_number, row in itertools.islice(rows, sampler.head):
+        errors = check_row(row, row_number)
+        sampler.add_head(errors)
+        yield from errors
+    if sampler.head_errors and sampler.fail_fast:
+        sampler.stopped = True
+
+
+def check_stream(validator, sampler, csv_reader, check_row, rng):
+    """
+    Check the head, then every later row with probability sampler.fraction, for input which can not be read at random
+    offsets. Row numbers are known, since every row is read.
+    """
+    rows = enumerate(csv_reader, start=1)
+    yield from check_head(sampler, rows, check_row)
+    if sampler.stopped:
+        return
+
+    if sampler.fraction >= 1:
+        sampler.check_all()
+    fraction = sampler.fraction
+    for row_number, row in rows:
+        if fraction < 1 and rng.random() >= fraction:
+            continue
+        errors = check_row(row, row_number)
+        sampler.add(errors)
+        yield from errors
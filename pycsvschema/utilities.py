@@ -2,6 +2,9 @@
 # -*-coding: utf-8 -*-
 
 import contextlib
+import functools
+import os
+import re
 import sys
 from itertools import islice
 
@@ -9,11 +12,32 @@ from pycsvschema.validators import data_validators
 
 
 @contextlib.contextmanager
-def file_writer(file_name=None):
-    writer = open(file_name, "w") if file_name is not None else sys.stdout
-    yield writer
-    if file_name is not None:
-        writer.close()
+def file_writer(file_name=None, position=None):
+    """
+    :param position: If position is given, cut the file back to position bytes and append to it, e.g. to resume a
+    validation from a checkpoint
+    """
+    if file_name is None:
+        writer = sys.stdout
+    elif position is None:
+        writer = open(file_name, "w")
+    else:
+        os.truncate(file_name, position)
+        writer = open(file_name, "a")
+    try:
+        yield writer
+    finally:
+        if file_name is not None:
+            writer.close()
+
+
+@functools.lru_cache(maxsize=None)
+def compile_regex(pattern):
+    """
+    Compile the regex pattern once per process, it is shared by `pattern` of fields, `patternFields` and
+    `additionalFields`
+    """
+    return re.compile(pattern)
 
 
 def find_data_validators(column_info, field_schema):
@@ -1,6 +1,7 @@
 #!/usr/bin/python
 # -*-coding: utf-8 -*-
 
+from pycsvschema.validators.batch_validators import BATCH_VALIDATORS
 from pycsvschema.validators.data_validators import DATA_VALIDATORS
 from pycsvschema.validators.header_validators import HEADER_VALIDATORS
 from pycsvschema.validators.rfc4180_validators import RFC4180_VALIDATIONS
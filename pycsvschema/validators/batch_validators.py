@@ -0,0 +1,288 @@
+#!/usr/bin/python
+# -*-coding: utf-8 -*-
+
+from pycsvschema import defaults, references
+from pycsvschema.validators import data_validators, types
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+# Batch validators for options under `fields`
+# Each batch validator is compiled once per column, accepting three parameters:
+# :param schema: full csv schema
+# :param field_schema: related option object under `fields`
+# :param column_name: column name
+# and returns a check function, which accepts one parameter:
+# :param batch: ColumnBatch with values of one column in a batch of rows
+# The check function returns a list of (position in batch, ErrorRecord)
+#
+# Batch validators only select the failed cells in bulk. Error of each failed cell is still built by the related
+# validator in data_validators, so errors are the same as checking rows one by one.
+
+
+class ColumnBatch(object):
+    def __init__(self, values, row_numbers, column_name, column_index=None):
+        """
+        :param values: List of cell values of one column, updated in place by missingvalues and type validators
+        :param row_numbers: List of row numbers of the values
+        :param column_name: Column name
+        :param column_index: Column index in header
+        """
+        self.values = values
+        self.row_numbers = row_numbers
+        self.column_name = column_name
+        self.column_index = column_index
+        # Positions of not null values and their converted numpy array, only set by numeric type validators
+        self.positions = None
+        self.array = None
+
+    def cell(self, position):
+        return data_validators.Cell(
+            value=self.values[position],
+            row_number=self.row_numbers[position],
+            column_name=self.column_name,
+            column_index=self.column_index,
+        )
+
+
+def report(batch, cell_check, positions):
+    """
+    Build errors of the failed positions with the cell validator
+    """
+    errors = []
+    for position in positions:
+        error = cell_check(batch.cell(position))
+        if error is not None:
+            errors.append((position, error))
+    return errors
+
+
+def per_cell(cell_check, column_name):
+    """
+    Fallback for validators without a bulk implementation, run the cell validator on every value
+    """
+
+    def check(batch):
+        errors = []
+        values = batch.values
+        row_numbers = batch.row_numbers
+        cell = data_validators.Cell(column_name=column_name, column_index=batch.column_index)
+        for position, value in enumerate(values):
+            cell.value = value
+            cell.row_number = row_numbers[position]
+            error = cell_check(cell)
+            if error is not None:
+                errors.append((position, error))
+            values[position] = cell.value
+        return errors
+
+    return check
+
+
+def field_type(schema, field_schema, column_name):
+    cell_check = data_validators.field_type(schema=schema, field_schema=field_schema)
+    type_name = field_schema.get("type", defaults.FIELDS_TYPE)
+
+    if type_name not in ("number", "integer"):
+        return per_cell(cell_check, column_name)
+
+    mapper = types.TYPE_MAPPER[type_name](field_schema=field_schema)
+    to_type = mapper.to_type
+    groupchar = mapper.groupchar
+    dtype = None
+    if numpy is not None:
+        dtype = numpy.float64 if type_name == "number" else numpy.int64
+
+    def check(batch):
+        values = batch.values
+        positions = [position for position, value in enumerate(values) if value is not None]
+        errors = []
+        try:
+            # Fast path, every value in the batch can be converted
+            if groupchar:
+                converted = [to_type(values[position].replace(groupchar, "")) for position in positions]
+            else:
+                converted = [to_type(values[position]) for position in positions]
+        except Exception:
+            errors = report(batch, cell_check, positions)
+            failed = set(position for position, _ in errors)
+            for position in failed:
+                values[position] = None
+            positions = [position for position in positions if position not in failed]
+            converted = [mapper.validate(values[position])[1] for position in positions]
+
+        for position, value in zip(positions, converted):
+            values[position] = value
+
+        batch.positions = positions
+        batch.array = None
+        if dtype is not None:
+            try:
+                batch.array = numpy.array(converted, dtype=dtype)
+            except (OverflowError, ValueError):
+                pass
+        return errors
+
+    return check
+
+
+def field_enum(schema, field_schema, column_name):
+    cell_check = data_validators.field_enum(schema=schema, field_schema=field_schema)
+    enum_set = data_validators.enum_values(field_schema)
+    enum_array = None
+    if numpy is not None and all(isinstance(item, (int, float)) and not isinstance(item, bool) for item in enum_set):
+        enum_array = numpy.array(sorted(enum_set))
+
+    def check(batch):
+        if batch.array is not None and enum_array is not None:
+            failed = set(batch.positions[i] for i in numpy.flatnonzero(~numpy.isin(batch.array, enum_array)))
+            failed.update(position for position, value in enumerate(batch.values) if value is None)
+            return report(batch, cell_check, sorted(failed))
+
+        positions = [position for position, value in enumerate(batch.values) if value not in enum_set]
+        return report(batch, cell_check, positions)
+
+    return check
+
+
+def numeric(cell_check, vector_check):
+    """
+    Check not null values with vector_check if the batch has a numpy array, otherwise with cell validator
+    """
+
+    def check(batch):
+        if batch.array is None:
+            positions = [position for position, value in enumerate(batch.values) if value is not None]
+            return report(batch, cell_check, positions)
+
+        positions = batch.positions
+        # NaN and infinity values are compared like python float does, without warnings
+        with numpy.errstate(all="ignore"):
+            failed = numpy.flatnonzero(vector_check(batch.array))
+        return report(batch, cell_check, [positions[i] for i in failed])
+
+    return check
+
+
+def field_maximum(schema, field_schema, column_name):
+    cell_check = data_validators.field_maximum(schema=schema, field_schema=field_schema)
+    maximum = field_schema["maximum"]
+
+    if field_schema.get("exclusiveMaximum", defaults.FIELDS_EXCLUSIVEMAXIMUM):
+        return numeric(cell_check, lambda array: array >= maximum)
+    return numeric(cell_check, lambda array: array > maximum)
+
+
+def field_minimum(schema, field_schema, column_name):
+    cell_check = data_validators.field_minimum(schema=schema, field_schema=field_schema)
+    minimum = field_schema["minimum"]
+
+    if field_schema.get("exclusiveMinimum", defaults.FIELDS_EXCLUSIVEMININUM):
+        return numeric(cell_check, lambda array: array <= minimum)
+    return numeric(cell_check, lambda array: array < minimum)
+
+
+def field_multipleof(schema, field_schema, column_name):
+    cell_check = data_validators.field_multipleof(schema=schema, field_schema=field_schema)
+    multipleof = field_schema["multipleOf"]
+
+    return numeric(cell_check, lambda array: array % multipleof != 0)
+
+
+def field_maxlength(schema, field_schema, column_name):
+    cell_check = data_validators.field_maxlength(schema=schema, field_schema=field_schema)
+    maxlength = field_schema["maxLength"]
+
+    def check(batch):
+        return report(
+            batch,
+            cell_check,
+            [position for position, value in enumerate(batch.values) if value is not None and len(value) > maxlength],
+        )
+
+    return check
+
+
+def field_minlength(schema, field_schema, column_name):
+    cell_check = data_validators.field_minlength(schema=schema, field_schema=field_schema)
+    minlength = field_schema["minLength"]
+
+    def check(batch):
+        return report(
+            batch,
+            cell_check,
+            [position for position, value in enumerate(batch.values) if value is not None and len(value) < minlength],
+        )
+
+    return check
+
+
+def field_nullable(schema, field_schema, column_name):
+    cell_check = data_validators.field_nullable(schema=schema, field_schema=field_schema)
+    if cell_check is None:
+        return None
+
+    def check(batch):
+        return report(batch, cell_check, [position for position, value in enumerate(batch.values) if value is None])
+
+    return check
+
+
+def field_reference(schema, field_schema, column_name):
+    cell_check = data_validators.field_reference(schema=schema, field_schema=field_schema)
+    reference_set = references.reference_values(field_schema)
+
+    def check(batch):
+        # Look up distinct values of the batch once, most batches of a foreign key have all of them in the reference
+        missing = set(batch.values).difference(reference_set)
+        missing.discard(None)
+        if not missing:
+            return []
+        return report(batch, cell_check, [position for position, value in enumerate(batch.values) if value in missing])
+
+    return check
+
+
+BATCH_VALIDATORS = {
+    data_validators.field_type: field_type,
+    data_validators.field_enum: field_enum,
+    data_validators.field_maximum: field_maximum,
+    data_validators.field_minimum: field_minimum,
+    data_validators.field_maxlength: field_maxlength,
+    data_validators.field_minlength: field_minlength,
+    data_validators.field_multipleof: field_multipleof,
+    data_validators.field_nullable: field_nullable,
+    data_validators.field_reference: field_reference,
+}
+
+
+def find_batch_validator(validator):
+    """
+    Find the batch validator of a data validator, fall back to running the data validator on every cell
+    """
+    batch_validator = BATCH_VALIDATORS.get(validator)
+    if batch_validator is not None:
+        return batch_validator
+
+    def compile_per_cell(schema, field_schema, column_name):
+        cell_check = validator(schema=schema, field_schema=field_schema)
+        return None if cell_check is None else per_cell(cell_check, column_name)
+
+    return compile_per_cell
+
+
+def missingvalues(schema, column_validators):
+    """
+    missingvalues is not a validator, but only update values into None if they are in missing value list
+    """
+    missing_values = data_validators.find_missing_values(schema)
+
+    def check(batch):
+        # Most batches have no missing value in a column, keep their values list as it is
+        if missing_values.isdisjoint(batch.values):
+            return
+        batch.values = [None if value in missing_values else value for value in batch.values]
+
+    return check
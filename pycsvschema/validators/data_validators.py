@@ -1,155 +1,281 @@
 #!/usr/bin/python
 # -*-coding: utf-8 -*-
 
-from pycsvschema import defaults, exceptions
+from pycsvschema import defaults, exceptions, references
 from pycsvschema.validators import types
 
 # Validators for options under `fields`
-# Each validator should be a generator, accepting three parameters:
-# :param cell: Dict with {"value": "<cell value>", "row_number": "<row number>", "column_name": "<column name>"}
+# Each validator is compiled once per column, accepting two parameters:
 # :param schema: full csv schema
 # :param field_schema: related option object under `fields`
+# and returns a check function, which accepts one parameter:
+# :param cell: Cell with value, row_number, column_name and column_index
+# The check function returns an ErrorRecord if the cell fails, otherwise None
+# A validator may return None instead of a check function, if there is nothing to check for the column
 
 
-def field_type(cell, schema, field_schema):
+class Cell(object):
+    __slots__ = ("value", "row_number", "column_name", "column_index")
+
+    def __init__(self, value=None, row_number=None, column_name=None, column_index=None):
+        self.value = value
+        self.row_number = row_number
+        self.column_name = column_name
+        self.column_index = column_index
+
+
+def field_type(schema, field_schema):
     # type is default validator and fields.type could be empty, so it has default value
     # type validator must run before other field validators (excluding $ref), since it transforms the value type in cell
     type_name = field_schema.get("type", defaults.FIELDS_TYPE)
-
+    # Type validator holds no per-value state, so one instance is shared by all cells of the column
     mapper = types.TYPE_MAPPER[type_name](field_schema=field_schema)
-    if mapper.validate(value=cell["value"]) is False:
-        yield exceptions.ValidationError(
-            message="Value {0} does not satisfy the type or format".format(cell["value"]),
-            column=field_schema.get("name"),
-            row_number=cell["row_number"],
-        )
-    cell["value"] = mapper.value
-    # TODO: do we need type?
-    # cell['dtype'] = mapper.to_type
-
-
-def field_enum(cell, schema, field_schema):
+    column = field_schema.get("name")
+
+    def check(cell):
+        passed, value = mapper.validate(value=cell.value)
+        error = None
+        if not passed:
+            error = exceptions.ErrorRecord(
+                rule="type",
+                template="Value {0} does not satisfy the type or format",
+                value=cell.value,
+                column=column,
+                column_index=cell.column_index,
+                row_number=cell.row_number,
+            )
+        cell.value = value
+        # TODO: do we need type?
+        # cell['dtype'] = mapper.to_type
+        return error
+
+    return check
+
+
+def enum_values(field_schema):
+    """
+    Enum items in a frozenset, items of numeric fields are converted into the type of converted cell values, e.g. enum
+    [1, 2] of number field into {1.0, 2.0}
+    """
+    type_name = field_schema.get("type", defaults.FIELDS_TYPE)
+    if type_name in ("number", "integer"):
+        to_type = types.TYPE_MAPPER[type_name](field_schema=field_schema).to_type
+        return frozenset(to_type(item) for item in field_schema["enum"])
+    return frozenset(field_schema["enum"])
+
+
+def field_enum(schema, field_schema):
     enum = field_schema["enum"]
+    enum_set = enum_values(field_schema)
+    column = field_schema.get("name")
+    template = "Value {0} is not in enum of " + exceptions.escape(enum)
 
-    failed = cell["value"] not in set(enum)
+    def check(cell):
+        failed = cell.value not in enum_set
 
-    if failed:
-        yield exceptions.ValidationError(
-            message="Value {0} is not in enum of {1}".format(cell["value"], enum),
-            column=field_schema.get("name"),
-            row_number=cell["row_number"],
-        )
+        if failed:
+            return exceptions.ErrorRecord(
+                rule="enum",
+                template=template,
+                value=cell.value,
+                column=column,
+                column_index=cell.column_index,
+                row_number=cell.row_number,
+            )
 
+    return check
 
-def field_maximum(cell, schema, field_schema):
-    if cell["value"] is None:
-        return
 
+def field_maximum(schema, field_schema):
     maximum = field_schema["maximum"]
     exclusivemaximum = field_schema.get("exclusiveMaximum", defaults.FIELDS_EXCLUSIVEMAXIMUM)
+    column = field_schema.get("name")
 
     if exclusivemaximum:
-        failed = maximum <= cell["value"]
         comapre = "greater than or equal to"
     else:
-        failed = maximum < cell["value"]
         comapre = "greater than"
+    template = "Value {0} is " + comapre + " maximum of " + exceptions.escape(maximum)
+
+    def check(cell):
+        if cell.value is None:
+            return
+
+        if exclusivemaximum:
+            failed = maximum <= cell.value
+        else:
+            failed = maximum < cell.value
 
-    if failed:
-        yield exceptions.ValidationError(
-            message="Value {0} is {1} maximum of {2}".format(cell["value"], comapre, maximum),
-            column=field_schema.get("name"),
-            row_number=cell["row_number"],
-        )
+        if failed:
+            return exceptions.ErrorRecord(
+                rule="maximum",
+                template=template,
+                value=cell.value,
+                column=column,
+                column_index=cell.column_index,
+                row_number=cell.row_number,
+            )
 
+    return check
 
-def field_minimum(cell, schema, field_schema):
-    if cell["value"] is None:
-        return
 
+def field_minimum(schema, field_schema):
     minimum = field_schema["minimum"]
     exclusiveminimum = field_schema.get("exclusiveMinimum", defaults.FIELDS_EXCLUSIVEMININUM)
+    column = field_schema.get("name")
 
     if exclusiveminimum:
-        failed = minimum >= cell["value"]
         comapre = "less than or equal to"
     else:
-        failed = minimum > cell["value"]
         comapre = "less than"
+    template = "Value {0} is " + comapre + " minimum of " + exceptions.escape(minimum)
 
-    if failed:
-        yield exceptions.ValidationError(
-            message="Value {0} is {1} minimum of {2}".format(cell["value"], comapre, minimum),
-            column=field_schema.get("name"),
-            row_number=cell["row_number"],
-        )
+    def check(cell):
+        if cell.value is None:
+            return
 
+        if exclusiveminimum:
+            failed = minimum >= cell.value
+        else:
+            failed = minimum > cell.value
 
-def field_maxlength(cell, schema, field_schema):
-    if cell["value"] is None:
-        return
+        if failed:
+            return exceptions.ErrorRecord(
+                rule="minimum",
+                template=template,
+                value=cell.value,
+                column=column,
+                column_index=cell.column_index,
+                row_number=cell.row_number,
+            )
 
+    return check
+
+
+def field_maxlength(schema, field_schema):
     maxlength = field_schema["maxLength"]
+    column = field_schema.get("name")
+    template = "Value {0} is longer than minLength of " + exceptions.escape(maxlength)
+
+    def check(cell):
+        if cell.value is None:
+            return
 
-    failed = maxlength < len(cell["value"])
+        failed = maxlength < len(cell.value)
 
-    if failed:
-        yield exceptions.ValidationError(
-            message="Value {0} is longer than minLength of {1}".format(cell["value"], maxlength),
-            column=field_schema.get("name"),
-            row_number=cell["row_number"],
-        )
+        if failed:
+            return exceptions.ErrorRecord(
+                rule="maxLength",
+                template=template,
+                value=cell.value,
+                column=column,
+                column_index=cell.column_index,
+                row_number=cell.row_number,
+            )
 
+    return check
 
-def field_minlength(cell, schema, field_schema):
-    if cell["value"] is None:
-        return
 
+def field_minlength(schema, field_schema):
     minlength = field_schema["minLength"]
+    column = field_schema.get("name")
+    template = "Value {0} is shorter than minLength of " + exceptions.escape(minlength)
 
-    failed = minlength > len(cell["value"])
+    def check(cell):
+        if cell.value is None:
+            return
 
-    if failed:
-        yield exceptions.ValidationError(
-            message="Value {0} is shorter than minLength of {1}".format(cell["value"], minlength),
-            column=field_schema.get("name"),
-            row_number=cell["row_number"],
-        )
+        failed = minlength > len(cell.value)
 
+        if failed:
+            return exceptions.ErrorRecord(
+                rule="minLength",
+                template=template,
+                value=cell.value,
+                column=column,
+                column_index=cell.column_index,
+                row_number=cell.row_number,
+            )
 
-def field_multipleof(cell, schema, field_schema):
-    if cell["value"] is None:
-        return
+    return check
 
+
+def field_multipleof(schema, field_schema):
     multipleof = field_schema["multipleOf"]
+    column = field_schema.get("name")
+    template = "Value {0} is not multiple of " + exceptions.escape(multipleof)
+
+    def check(cell):
+        if cell.value is None:
+            return
 
-    failed = cell["value"] % multipleof != 0
+        failed = cell.value % multipleof != 0
 
-    if failed:
-        yield exceptions.ValidationError(
-            message="Value {0} is not multiple of {1}".format(cell["value"], multipleof),
-            column=field_schema.get("name"),
-            row_number=cell["row_number"],
-        )
+        if failed:
+            return exceptions.ErrorRecord(
+                rule="multipleOf",
+                template=template,
+                value=cell.value,
+                column=column,
+                column_index=cell.column_index,
+                row_number=cell.row_number,
+            )
 
+    return check
 
-def field_nullable(cell, schema, field_schema):
+
+def field_nullable(schema, field_schema):
     if field_schema["nullable"] is True:
-        return
+        return None
+
+    column = field_schema.get("name")
+
+    def check(cell):
+        failed = cell.value is None
+
+        if failed:
+            return exceptions.ErrorRecord(
+                rule="nullable",
+                template="Illegal null value",
+                value=cell.value,
+                column=column,
+                column_index=cell.column_index,
+                row_number=cell.row_number,
+            )
+
+    return check
 
-    failed = cell["value"] is None
 
-    if failed:
-        yield exceptions.ValidationError(
-            message="Illegal null value", column=field_schema.get("name"), row_number=cell["row_number"]
-        )
+def field_reference(schema, field_schema):
+    reference = field_schema["reference"]
+    reference_set = references.reference_values(field_schema)
+    column = field_schema.get("name")
+    template = (
+        "Value {0} is not in " + exceptions.escape(reference["field"]) + " of " + exceptions.escape(reference["file"])
+    )
 
+    def check(cell):
+        if cell.value is None:
+            return
 
-def field_ref(cell, schema, field_schema):
+        if cell.value not in reference_set:
+            return exceptions.ErrorRecord(
+                rule="reference",
+                template=template,
+                value=cell.value,
+                column=column,
+                column_index=cell.column_index,
+                row_number=cell.row_number,
+            )
+
+    return check
+
+
+def field_ref(schema, field_schema):
     """
     $ref keyword is handled by definitions
     """
-    pass
+    return None
 
 
 DATA_VALIDATORS = {
@@ -161,6 +287,7 @@ DATA_VALIDATORS = {
     "minLength": field_minlength,
     "multipleOf": field_multipleof,
     "nullable": field_nullable,
+    "reference": field_reference,
     "$ref": field_ref,
 }
 
@@ -174,11 +301,19 @@ DATA_VALIDATORS = {
 #     exclusiveMaximum
 
 
+def find_missing_values(schema):
+    return frozenset(schema.get("missingValues", defaults.MISSINGVALUES))
+
+
 # missingvalues is defined under root of schema but processes data when checking rows
-def missingvalues(cell, schema, column_validators):
+def missingvalues(schema, column_validators):
     """
     missingvalues is not a validator, but only update cell value into None if it's in missing value list
     """
-    if cell["value"] in set(schema.get("missingValues", defaults.MISSINGVALUES)):
-        cell["value"] = None
-    yield from ()
+    missing_values = find_missing_values(schema)
+
+    def check(cell):
+        if cell.value in missing_values:
+            cell.value = None
+
+    return check
@@ -1,7 +1,6 @@
 #!/usr/bin/python
 # -*-coding: utf-8 -*-
 
-import re
 from itertools import chain
 
 from pycsvschema import defaults, exceptions, utilities
@@ -21,10 +20,12 @@ def additionalfields(header, schema, column_validators):
     for extra_field in extra_fields:
         matched = False
         for regex in schema.get("patternFields", defaults.PATTERNFIELDS).keys():
-            if re.match(regex, extra_field):
+            if utilities.compile_regex(regex).match(extra_field):
                 matched = True
         if matched is False:
-            yield exceptions.ValidationError(message="Field {0} is not defined".format(extra_field))
+            yield exceptions.ValidationError(
+                message="Field {0} is not defined".format(extra_field), rule="additionalFields"
+            )
 
 
 def definitions(header, schema, column_validators):
@@ -61,7 +62,7 @@ def dependencies(header, schema, column_validators):
         for dependent in dependents:
             if dependent not in header:
                 yield exceptions.ValidationError(
-                    message=f"Field {column} is provided while {dependent} is not in header"
+                    message=f"Field {column} is provided while {dependent} is not in header", rule="dependencies"
                 )
 
 
@@ -76,7 +77,9 @@ def exactfields(header, schema, column_validators):
     failed = [field.get("name") for field in schema.get("fields", defaults.FIELDS)] != header
 
     if failed:
-        yield exceptions.ValidationError(message="Column name is different to fields.name in schema")
+        yield exceptions.ValidationError(
+            message="Column name is different to fields.name in schema", rule="exactFields"
+        )
 
     column_validators["columns"].clear()
     for column_index, column in enumerate(header):
@@ -94,7 +97,7 @@ def maxfields(header, schema, column_validators):
 
     if failed:
         yield exceptions.ValidationError(
-            message="Number of column(s) is greater than maxFields of {0}".format(schema["maxFields"])
+            message="Number of column(s) is greater than maxFields of {0}".format(schema["maxFields"]), rule="maxFields"
         )
 
 
@@ -103,7 +106,7 @@ def minfields(header, schema, column_validators):
 
     if failed:
         yield exceptions.ValidationError(
-            message="Number of column(s) is less than minFields of {0}".format(schema["minFields"])
+            message="Number of column(s) is less than minFields of {0}".format(schema["minFields"]), rule="minFields"
         )
 
 
@@ -128,7 +131,7 @@ def patternfields(header, schema, column_validators):
             continue
 
         for regex, column_info in column_validators["patternfields"].items():
-            if not re.match(regex, column):
+            if not utilities.compile_regex(regex).match(column):
                 continue
 
             new_column_info = {"column_name": column, "pattern": regex}
@@ -168,8 +171,58 @@ def field_required(header, schema, column_validators):
             and column_info["column_name"] not in header
         )
         if failed:
-            yield exceptions.ValidationError(message="{0} is a required field".format(column_info["column_name"]))
+            yield exceptions.ValidationError(
+                message="{0} is a required field".format(column_info["column_name"]), rule="required"
+            )
 
     for column_name, column_info in column_validators["unfoundfields"].items():
         if column_info["field_schema"].get("required", defaults.FIELDS_REQUIRED):
-            yield exceptions.ValidationError(message="{0} is a required field".format(column_info["column_name"]))
+            yield exceptions.ValidationError(
+                message="{0} is a required field".format(column_info["column_name"]), rule="required"
+            )
+
+
+def field_keys(header, schema, column_validators):
+    """
+    unique is defined under field or definitions, and primaryKey under the schema, both are checked across rows
+
+    Store columns of every key in column_validators['keys'], with the field schemas their values are converted by, or
+    None for columns without field schema, e.g.
+    [
+        {'rule': 'unique', 'column': 'id', 'indexes': [0], 'field_schemas': [{'name': 'id', 'unique': True}]},
+        {'rule': 'primaryKey', 'column': 'id, date', 'indexes': [0, 2], 'field_schemas': [{...}, None]}
+    ]
+    """
+    column_validators["keys"] = []
+
+    for column_index, column_info in sorted(column_validators["columns"].items()):
+        if column_info["field_schema"].get("unique", defaults.FIELDS_UNIQUE):
+            column_validators["keys"].append(
+                {
+                    "rule": "unique",
+                    "column": header[column_index],
+                    "indexes": [column_index],
+                    "field_schemas": [column_info["field_schema"]],
+                }
+            )
+
+    primary_key = schema.get("primaryKey", defaults.PRIMARYKEY)
+    if isinstance(primary_key, str):
+        primary_key = [primary_key]
+    if not primary_key:
+        return
+
+    missing_fields = [name for name in primary_key if name not in header]
+    for name in missing_fields:
+        yield exceptions.ValidationError(message="{0} of primaryKey is not in header".format(name), rule="primaryKey")
+    if not missing_fields:
+        indexes = [header.index(name) for name in primary_key]
+        columns = column_validators["columns"]
+        column_validators["keys"].append(
+            {
+                "rule": "primaryKey",
+                "column": ", ".join(primary_key),
+                "indexes": indexes,
+                "field_schemas": [columns[index]["field_schema"] if index in columns else None for index in indexes],
+            }
+        )
@@ -20,7 +20,12 @@ def number_of_fields(row, row_number, header_length):
     Make sure each line contains the same number of fields
     """
     if len(row) != header_length:
-        yield exceptions.ValidationError(message="Illegal null value", row_number=row_number)
+        yield exceptions.ErrorRecord(
+            rule="number_of_fields",
+            template="Number of fields {0} is different to number of header fields " + exceptions.escape(header_length),
+            value=len(row),
+            row_number=row_number,
+        )
 
 
 RFC4180_VALIDATIONS = {"number_of_fields": number_of_fields}
@@ -19,38 +19,44 @@
 #
 
 import datetime
+import functools
 import ipaddress
 import re
 import uuid
 
 import rfc3986
-from pycsvschema import defaults
+from pycsvschema import defaults, utilities
 
 
 class TypeValidator(object):
+    """
+    Type validator is created once per column and does not keep the state of any value, so one instance can be shared
+    by all cells of the column, also across threads.
+
+    validate returns a tuple of (passed, value), where value is the value converted into target type.
+    """
+
     def __init__(self, field_schema):
         self.field_schema = field_schema
         self.format = self.field_schema.get("format", defaults.FIELDS_FORMAT)
-        self.value = None
         self.to_type = None
 
-    def try_convert_value(self, value, to_type, convertor_config=None, update=False):
+    @staticmethod
+    def try_convert_value(value, to_type, convertor_config=None, update=False):
         if not convertor_config:
             convertor_config = {}
 
         try:
             v = to_type(value, **convertor_config)
         except Exception:
-            return False
+            return False, None
 
         if update:
-            self.value = v
-        else:
-            self.value = value
-        return True
+            return True, v
+        return True, value
 
     def validate(self, value):
-        pass
+        return True, value
 
 
 class StringValidator(TypeValidator):
@@ -64,40 +70,197 @@ class StringValidator(TypeValidator):
         super().__init__(field_schema=field_schema)
         self.to_type = str
         self.pattern = ""
+        self.regex = None
+        # Resolve format and pattern into one checker function, instead of walking through formats for every value
+        self.checker = self.find_checker()
 
-    def validate(self, value):
-        if value is None:
-            return
-
-        self.value = value
-
+    def find_checker(self):
+        format_checkers = {
+            "email": self.check_email,
+            "uri": self.check_uri,
+            "uuid": self.check_uuid,
+            "ipv4": self.check_ipv4,
+            "ipv6": self.check_ipv6,
+            "hostname": self.check_hostname,
+        }
         if self.format == "email":
-            if not re.match(self.EMAIL_PATTERN, value):
-                return False
-        elif self.format == "uri":
-            if not rfc3986.is_valid_uri(value, require_scheme=True):
-                return False
-        elif self.format == "uuid":
-            return self.try_convert_value(value=value, to_type=uuid.UUID, convertor_config={"version": 4})
-        elif self.format == "ipv4":
-            return self.try_convert_value(value=value, to_type=ipaddress.IPv4Address)
-        elif self.format == "ipv6":
-            return self.try_convert_value(value=value, to_type=ipaddress.IPv6Address)
+            self.regex = utilities.compile_regex(self.EMAIL_PATTERN)
         elif self.format == "hostname":
-            if not re.match(self.HOSTNAME_PATTERN, value):
-                return False
+            self.regex = utilities.compile_regex(self.HOSTNAME_PATTERN)
         elif self.format == "datetime":
             self.pattern = self.field_schema.get("datetimePattern", defaults.FIELDS_FORMAT_DATETIME_PATTERN)
-            try:
-                datetime.datetime.strptime(value, self.pattern)
-            except Exception:
-                return False
-        elif self.field_schema.get("pattern", defaults.FIELDS_TYPE_STRING_PATTERN):
-            self.pattern = self.field_schema.get("pattern", defaults.FIELDS_TYPE_STRING_PATTERN)
-            if not re.match(self.pattern, value):
-                return False
+            return compile_datetime_checker(self.pattern)
+
+        if self.format in format_checkers:
+            return format_checkers[self.format]
+
+        self.pattern = self.field_schema.get("pattern", defaults.FIELDS_TYPE_STRING_PATTERN)
+        if self.pattern:
+            self.regex = utilities.compile_regex(self.pattern)
+            return self.check_pattern
+        return None
+
+    def validate(self, value):
+        if value is None or self.checker is None:
+            return True, value
+
+        return self.checker(value), value
+
+    def check_email(self, value):
+        return self.regex.match(value) is not None
+
+    @staticmethod
+    def check_uri(value):
+        return rfc3986.is_valid_uri(value, require_scheme=True)
+
+    def check_uuid(self, value):
+        return self.try_convert_value(value=value, to_type=uuid.UUID, convertor_config={"version": 4})[0]
+
+    def check_ipv4(self, value):
+        return self.try_convert_value(value=value, to_type=ipaddress.IPv4Address)[0]
+
+    def check_ipv6(self, value):
+        return self.try_convert_value(value=value, to_type=ipaddress.IPv6Address)[0]
+
+    def check_hostname(self, value):
+        return self.regex.match(value) is not None
+
+    def check_pattern(self, value):
+        return self.regex.match(value) is not None
+
+
+# Regex of directives of datetimePattern parsed by the compiled datetime checker, the same as the regex strptime builds
+# for them in Lib/_strptime.py. Patterns with other directives, e.g. locale dependent names, are checked by strptime.
+DATETIME_DIRECTIVES = {
+    "Y": r"(?P<Y>\d\d\d\d)",
+    "y": r"(?P<y>\d\d)",
+    "m": r"(?P<m>1[0-2]|0[1-9]|[1-9])",
+    "d": r"(?P<d>3[0-1]|[1-2]\d|0[1-9]|[1-9]| [1-9])",
+    "H": r"(?P<H>2[0-3]|[0-1]\d|\d)",
+    "M": r"(?P<M>[0-5]\d|\d)",
+    "S": r"(?P<S>6[0-1]|[0-5]\d|\d)",
+    "f": r"(?P<f>[0-9]{1,6})",
+    "z": r"(?P<z>[+-]\d\d:?[0-5]\d(:?[0-5]\d(\.\d{1,6})?)?|(?-i:Z))",
+    "%": "%",
+}
+
+
+def check_strptime(value, pattern):
+    try:
+        datetime.datetime.strptime(value, pattern)
+    except Exception:
+        return False
+    return True
+
+
+def datetime_regex(pattern):
+    """
+    Build the regex strptime matches values of pattern with, the same way as _strptime.TimeRE.pattern
+
+    :return: Compiled regex, or None if pattern has a directive out of DATETIME_DIRECTIVES or is invalid
+    """
+    # Escape regex syntax except directives, and let whitespace match any whitespace
+    pattern = re.sub(r"([\\.^$*+?\(\){}\[\]|])", r"\\\1", pattern)
+    pattern = re.sub(r"\s+", r"\\s+", pattern)
+    parts = []
+    while "%" in pattern:
+        index = pattern.index("%")
+        directive = pattern[index + 1 : index + 2]
+        if directive not in DATETIME_DIRECTIVES:
+            return None
+        parts.append(pattern[:index])
+        parts.append(DATETIME_DIRECTIVES[directive])
+        pattern = pattern[index + 2 :]
+    parts.append(pattern)
+    try:
+        return re.compile("".join(parts), re.IGNORECASE)
+    except re.error:
+        # e.g. a directive used twice
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def compile_datetime_checker(pattern):
+    """
+    Compile datetimePattern into a function checking whether a value can be parsed by datetime.strptime
+
+    strptime takes a lock, looks up its regex cache and builds a time tuple for every value. The compiled checker
+    matches the same regex as strptime, built once by datetime_regex, then converts the matched fields the way strptime
+    does and lets datetime check their ranges, so results are the same as strptime.
+    """
+    regex = datetime_regex(pattern)
+    if regex is None:
+        return functools.partial(check_strptime, pattern=pattern)
+
+    # Sample plan [(0, 1, int), (1, 2, int), (2, 3, int), (None, 8, check_timezone)]
+    # Each item converts one group into an argument of datetime, groups are converted in the order of the pattern, so
+    # a later year field overrides an earlier one like strptime does
+    plan = sorted(
+        (index, DATETIME_ARGUMENTS[name]) for name, index in regex.groupindex.items() if name in DATETIME_ARGUMENTS
+    )
+    plan = [(position, index, convert) for index, (position, convert) in plan]
+    match = regex.match
+
+    def check(value):
+        found = match(value)
+        if found is None or found.end() != len(value):
+            return False
+        # year, month, day, hour, minute, second
+        args = [1900, 1, 1, 0, 0, 0]
+        group = found.group
+        try:
+            for position, index, convert in plan:
+                if position is None:
+                    convert(group(index))
+                else:
+                    args[position] = convert(group(index))
+            datetime.datetime(*args)
+        except ValueError:
+            return False
         return True
 
+    return check
+
+
+def parse_year(value):
+    year = int(value)
+    return year + 2000 if year <= 68 else year + 1900
+
+
+def parse_fraction(value):
+    return int(value + "0" * (6 - len(value)))
+
+
+def check_timezone(z):
+    """
+    Check %z field the way strptime does, raise ValueError if it is invalid
+    """
+    if z == "Z":
+        return
+
+    if z[3] == ":":
+        z = z[:3] + z[4:]
+        if len(z) > 5:
+            if z[5] != ":":
+                raise ValueError("Inconsistent use of : in {0}".format(z))
+            z = z[:5] + z[6:]
+    offset = (int(z[1:3]) * 3600 + int(z[3:5]) * 60 + int(z[5:7] or 0)) * 1000000 + parse_fraction(z[8:])
+    # timezone only accepts offsets strictly between -24 and 24 hours
+    if offset >= 86400 * 1000000:
+        raise ValueError("Offset {0} is out of range".format(z))
+
+
+# Fields of strptime regex, and their position in arguments of datetime and converter. Timezone is only checked.
+# Regex of hour, minute and fraction only match values in range, so they are not converted.
+DATETIME_ARGUMENTS = {
+    "Y": (0, int),
+    "y": (0, parse_year),
+    "m": (1, int),
+    "d": (2, int),
+    "S": (5, int),
+    "z": (None, check_timezone),
+}
+
 
 class NumberValidator(TypeValidator):
     def __init__(self, field_schema):
@@ -107,7 +270,7 @@ class NumberValidator(TypeValidator):
 
     def validate(self, value):
         if value is None:
-            return
+            return True, None
 
         value = value.replace(self.groupchar, "")
         return self.try_convert_value(value=value, to_type=self.to_type, update=True)
@@ -121,7 +284,7 @@ class IntegerValidator(TypeValidator):
 
     def validate(self, value):
         if value is None:
-            return
+            return True, None
 
         value = value.replace(self.groupchar, "")
         return self.try_convert_value(value=value, to_type=self.to_type, update=True)
@@ -131,17 +294,15 @@ class BooleanValidator(TypeValidator):
     def __init__(self, field_schema):
         super().__init__(field_schema=field_schema)
         self.to_type = bool
-        self.truevalues = set(self.field_schema.get("trueValues", defaults.FIELDS_TRUEVALUES))
-        self.falsevalues = set(self.field_schema.get("falseValues", defaults.FIELDS_FALSEVALUES))
+        self.truevalues = frozenset(self.field_schema.get("trueValues", defaults.FIELDS_TRUEVALUES))
+        self.falsevalues = frozenset(self.field_schema.get("falseValues", defaults.FIELDS_FALSEVALUES))
 
     def validate(self, value):
         if value in self.truevalues:
-            self.value = True
+            return True, True
         elif value in self.falsevalues:
-            self.value = False
-        else:
-            return False
-        return True
+            return True, False
+        return False, None
 
 
 TYPE_MAPPER = {
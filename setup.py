@@ -34,6 +34,8 @@ setup(
     keywords="csv schema json jsonschema validation validator",
     url="https://github.com/csv-schema/PyCSVSchema",
     install_requires=["jsonschema", "rfc3986"],
+    extras_require={"numpy": ["numpy"], "zstd": ["zstandard"]},
+    entry_points={"console_scripts": ["pycsvschema=pycsvschema.cli:main"]},
     package_data={"pycsvschema": ["schema.json"]},
     include_package_data=True
 )
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*-coding: utf-8 -*-
+
+import tempfile
+import unittest
+
+from benchmarks import suite
+
+
+class TestGenerators(unittest.TestCase):
+    """Test that synthetic CSV files of every benchmark feature follow their schemas."""
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_valid(self):
+        for feature in suite.FEATURES:
+            with self.subTest(feature=feature):
+                schema, csvfile = suite.prepare(feature, self._tmp_dir.name, rows=50, width=3)
+                self.assertEqual(suite.validate(csvfile, schema), 0)
+
+    def test_invalid(self):
+        """Test that every cell is invalid with error rate 1, except plain strings which can not be invalid."""
+        # Invalid cells of a column share one value, so unique also finds 49 duplicates in each column
+        expected = {"string": 0, "unique": 150 + 3 * 49}
+        for feature in suite.FEATURES:
+            with self.subTest(feature=feature):
+                schema, csvfile = suite.prepare(feature, self._tmp_dir.name, rows=50, width=3, error_rate=1.0)
+                self.assertEqual(suite.validate(csvfile, schema), expected.get(feature, 150))
+
+    def test_measure(self):
+        schema, csvfile = suite.prepare("minmax", self._tmp_dir.name, rows=50, width=3, error_rate=0.5)
+        result = suite.measure(csvfile, schema, rows=50, repeat=1)
+        self.assertEqual(result["rows"], 50)
+        self.assertGreater(result["rows_per_sec"], 0)
+        self.assertGreater(result["peak_memory"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*-coding: utf-8 -*-
+
+import json
+import os
+import unittest
+
+from pycsvschema.caches import ValueCache
+from pycsvschema.checker import Validator
+from tests import TEST_DIR
+
+
+class TestValueCache(unittest.TestCase):
+    """Test that check results are cached by value and the cache turns itself off for distinct values."""
+
+    def setUp(self):
+        self._this_dir = os.path.join(TEST_DIR, "checker")
+        with open(os.path.join(self._this_dir, "schema.json"), "r") as schema_stream:
+            self._schema = json.load(schema_stream)
+
+    def test_lru(self):
+        cache = ValueCache(size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+
+    def test_disable(self):
+        cache = ValueCache(size=100, warmup=10, min_hit_rate=0.5)
+        for i in range(10):
+            cache.get(str(i))
+            cache.put(str(i), i)
+        self.assertFalse(cache.enabled)
+        self.assertEqual(len(cache.entries), 0)
+
+    def test_disable_on_hit(self):
+        """Test that the hit rate is judged when lookup number warmup is a hit."""
+        cache = ValueCache(size=100, warmup=10, min_hit_rate=0.5)
+        for i in range(9):
+            cache.get(str(i))
+            cache.put(str(i), i)
+        self.assertEqual(cache.get("0"), 0)
+        self.assertFalse(cache.enabled)
+        self.assertEqual(len(cache.entries), 0)
+
+    def test_validator(self):
+        """Test that cached values report the same errors with their own row numbers."""
+        rows = ["Ann,ann@mail.com,06001,1000", "Ben,ben-at-home,8500,50", "Tom,tom@mail.com,85001"]
+        data = "name,e-mail,zipcode,donation\n" + "\n".join(rows * 3) + "\n"
+
+        def errors(**kwargs):
+            v = Validator(csvfile=data.encode(), schema=self._schema, errors="coerce", **kwargs)
+            return [(error.column, error.rule, error.row_number, error.message) for error in v.iter_errors()]
+
+        expected = errors()
+        self.assertEqual(len(expected), 12)
+        self.assertEqual(errors(cache_size=2), expected)
+        self.assertEqual(errors(cache_size=100), expected)
+
+        with self.assertRaises(ValueError):
+            Validator(csvfile=data, schema=self._schema, cache_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,20 @@
 #!/usr/bin/env python3
 # -*-coding: utf-8 -*-
 
+import asyncio
+import concurrent.futures
+import csv
+import io
 import json
 import os
+import tempfile
 import unittest
 
-from pycsvschema.checker import Validator
+from pycsvschema.checker import FeedValidator, FilesValidator, Validator
+from pycsvschema.exceptions import ValidationError
 from tests import TEST_DIR
 
+
 def validate(csv_file, schema_file):
     """Validate a CSV file against a given schema file."""
     with open(schema_file, "r") as schema_stream:
@@ -15,6 +22,7 @@ def validate(csv_file, schema_file):
     v = Validator(csvfile=csv_file, schema=schema)
     v.validate()
 
+
 class TestChecker(unittest.TestCase):
     """Test that a given csv and schema pair rent the expected result."""
 
@@ -27,6 +35,161 @@ class TestChecker(unittest.TestCase):
         csv_file = os.path.join(self._this_dir, "example.csv")
         validate(csv_file, schema_file)
 
+    def test_invalid_raise(self):
+        """Test that the first error is raised with its column name and row number."""
+        schema_file = os.path.join(self._this_dir, "schema.json")
+        csv_file = os.path.join(self._this_dir, "invalid.csv")
+        with self.assertRaises(ValidationError) as context:
+            validate(csv_file, schema_file)
+        self.assertEqual(context.exception.column, "e-mail")
+        self.assertEqual(context.exception.row_number, 2)
+
+    def test_invalid_coerce(self):
+        """Test that all errors are written to output in row order."""
+        with open(os.path.join(self._this_dir, "schema.json"), "r") as schema_stream:
+            schema = json.load(schema_stream)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output = os.path.join(tmp_dir, "errors.txt")
+            v = Validator(
+                csvfile=os.path.join(self._this_dir, "invalid.csv"), schema=schema, output=output, errors="coerce"
+            )
+            v.validate()
+            with open(output, "r") as output_stream:
+                errors = output_stream.read().splitlines()
+
+        self.assertEqual(len(errors), 4)
+        self.assertIn("column name: e-mail; row number: 2", errors[0])
+        self.assertIn("column name: zipcode; row number: 2", errors[1])
+        self.assertIn("minimum of 100'; column name: donation; row number: 2", errors[2])
+        self.assertIn("Number of fields 3", errors[3])
+
+    def test_invalid_batch(self):
+        """Test that checking rows in batches reports the same errors in the same order."""
+        with open(os.path.join(self._this_dir, "schema.json"), "r") as schema_stream:
+            schema = json.load(schema_stream)
+        outputs = []
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for batch_size in (None, 1, 2, 100):
+                output = os.path.join(tmp_dir, "errors.txt")
+                v = Validator(
+                    csvfile=os.path.join(self._this_dir, "invalid.csv"),
+                    schema=schema,
+                    output=output,
+                    errors="coerce",
+                    batch_size=batch_size,
+                )
+                v.validate()
+                with open(output, "r") as output_stream:
+                    outputs.append(output_stream.read())
+
+        self.assertEqual(len(outputs[0].splitlines()), 4)
+        for output in outputs[1:]:
+            self.assertEqual(output, outputs[0])
+
+    def test_invalid_batch_records(self):
+        """Test that checking rows in batches builds the same error records as checking rows one by one."""
+        with open(os.path.join(self._this_dir, "schema.json"), "r") as schema_stream:
+            schema = json.load(schema_stream)
+        records = []
+        for batch_size in (None, 1, 8):
+            v = Validator(
+                csvfile=os.path.join(self._this_dir, "invalid.csv"),
+                schema=schema,
+                errors="coerce",
+                batch_size=batch_size,
+            )
+            records.append(
+                [(e.rule, e.column, e.column_index, e.row_number, e.value, e.message) for e in v.iter_errors()]
+            )
+
+        self.assertTrue(any(record[2] is not None for record in records[0]))
+        for batch_records in records[1:]:
+            self.assertEqual(batch_records, records[0])
+
+    def test_inputs(self):
+        """Test that streams, bytes and iterables are validated like the file."""
+        with open(os.path.join(self._this_dir, "schema.json"), "r") as schema_stream:
+            schema = json.load(schema_stream)
+        csv_file = os.path.join(self._this_dir, "invalid.csv")
+        with open(csv_file, "rb") as csv_stream:
+            data = csv_stream.read().replace(b"Ben", "Bén".encode("utf-8")).replace(b"\n", b"\r\n")
+        text = data.decode("utf-8")
+
+        inputs = [
+            data,
+            io.BytesIO(data),
+            io.StringIO(text, newline=""),
+            text.splitlines(keepends=True),
+            [data[i : i + 3] for i in range(0, len(data), 3)],
+            list(csv.reader(io.StringIO(text, newline=""))),
+        ]
+        expected = [str(error) for error in Validator(csvfile=csv_file, schema=schema).iter_errors()]
+        self.assertEqual(len(expected), 4)
+        for csvfile in inputs:
+            errors = [str(error) for error in Validator(csvfile=csvfile, schema=schema).iter_errors()]
+            self.assertEqual(errors, expected)
+
+    def test_feed(self):
+        """Test that data pushed in chunks of any size is validated like the file."""
+        with open(os.path.join(self._this_dir, "schema.json"), "r") as schema_stream:
+            schema = json.load(schema_stream)
+        csv_file = os.path.join(self._this_dir, "invalid.csv")
+        with open(csv_file, "rb") as csv_stream:
+            data = csv_stream.read().replace(b"Ann,", '"A\r\nn""é",'.encode("utf-8"))
+
+        expected = [str(error) for error in Validator(csvfile=data, schema=schema).iter_errors()]
+        self.assertEqual(len(expected), 4)
+        for size in (1, 2, 5, len(data)):
+            feed = FeedValidator(schema=schema)
+            errors = []
+            for start in range(0, len(data), size):
+                errors.extend(feed.push(data[start : start + size]))
+            errors.extend(feed.close())
+            self.assertEqual([str(error) for error in errors], expected)
+
+    def test_async(self):
+        """Test that async streams are validated like the file."""
+        with open(os.path.join(self._this_dir, "schema.json"), "r") as schema_stream:
+            schema = json.load(schema_stream)
+        csv_file = os.path.join(self._this_dir, "invalid.csv")
+        with open(csv_file, "rb") as csv_stream:
+            data = csv_stream.read()
+        expected = [str(error) for error in Validator(csvfile=csv_file, schema=schema).iter_errors()]
+
+        async def chunks():
+            for start in range(0, len(data), 7):
+                yield data[start : start + 7]
+
+        async def collect(stream, executor=None):
+            v = Validator(csvfile=None, schema=schema)
+            return [str(error) async for error in v.iter_errors_async(stream, executor=executor)]
+
+        async def stream_reader():
+            stream = asyncio.StreamReader()
+            stream.feed_data(data)
+            stream.feed_eof()
+            return await collect(stream)
+
+        self.assertEqual(asyncio.run(collect(chunks())), expected)
+        self.assertEqual(asyncio.run(stream_reader()), expected)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            self.assertEqual(asyncio.run(collect(chunks(), executor=executor)), expected)
+
+        with self.assertRaises(ValidationError):
+            asyncio.run(Validator(csvfile=None, schema=schema).validate_async(chunks()))
+
+    def test_files(self):
+        """Test that many files are validated against one schema with per-file results."""
+        with open(os.path.join(self._this_dir, "schema.json"), "r") as schema_stream:
+            schema = json.load(schema_stream)
+        csv_files = [os.path.join(self._this_dir, name) for name in ("example.csv", "invalid.csv", "example.csv")]
+
+        for jobs in (None, 2):
+            results = list(FilesValidator(schema=schema, jobs=jobs).validate(csv_files))
+            self.assertEqual([csv_file for csv_file, _ in results], csv_files)
+            self.assertEqual([len(errors) for _, errors in results], [0, 4, 0])
+            self.assertEqual(results[1][1][0].row_number, 2)
+
 
 if __name__ == "__main__":
     unittest.main()
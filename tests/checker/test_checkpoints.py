@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*-coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from pycsvschema import collectors, keys, profiles
+from pycsvschema.checker import Validator
+
+
+class Interrupted(Exception):
+    pass
+
+
+class InterruptedValidator(Validator):
+    """Validator interrupted after a number of errors, like a killed process."""
+
+    def __init__(self, *args, limit, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.limit = limit
+
+    def iter_errors(self):
+        for position, error in enumerate(super().iter_errors()):
+            if position == self.limit:
+                raise Interrupted
+            yield error
+
+
+class TestCheckpoints(unittest.TestCase):
+    """Test checkpoints and resuming from them."""
+
+    def setUp(self):
+        self._schema = {
+            "fields": [
+                {"name": "id", "type": "integer", "unique": True},
+                {"name": "value", "type": "integer", "maximum": 89},
+                {"name": "text", "enum": ["x", "a\nb,c"]},
+            ]
+        }
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._tmp_dir.name, "data.csv")
+        with open(self._path, "w") as f:
+            f.write("id,value,text\n")
+            for row_number in range(1, 1001):
+                text = '"a\nb,c"' if row_number % 7 == 0 else "xy"[row_number % 5 == 0]
+                f.write("{0},{1},{2}\n".format(row_number % 950, row_number % 100, text))
+        self._checkpoint = os.path.join(self._tmp_dir.name, "checkpoint")
+        self._output = os.path.join(self._tmp_dir.name, "errors.txt")
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def validate(self, validator_class=Validator, **kwargs):
+        validator_class(
+            csvfile=self._path, schema=self._schema, errors="coerce", output=self._output, **kwargs
+        ).validate()
+        with open(self._output) as f:
+            return f.read()
+
+    def test_resume(self):
+        for options in ({}, {"batch_size": 16}):
+            with self.subTest(**options):
+                expected = self.validate(**options)
+                with self.assertRaises(Interrupted):
+                    self.validate(
+                        InterruptedValidator, limit=150, checkpoint=self._checkpoint, checkpoint_interval=0, **options
+                    )
+                self.assertTrue(os.path.exists(self._checkpoint))
+
+                output = self.validate(checkpoint=self._checkpoint, resume=True, **options)
+                self.assertEqual(output, expected)
+                self.assertFalse(os.path.exists(self._checkpoint))
+
+    def test_resume_state(self):
+        def run(validator_class=Validator, **kwargs):
+            collector = collectors.ErrorCollector(samples=2, seed=1)
+            profiler = profiles.Profiler()
+            validator_class(
+                csvfile=self._path, schema=self._schema, collector=collector, profiler=profiler, **kwargs
+            ).validate()
+            return collector, profiler
+
+        collector, profiler = run()
+        with self.assertRaises(Interrupted):
+            run(InterruptedValidator, limit=100, checkpoint=self._checkpoint, checkpoint_interval=0)
+        resumed_collector, resumed_profiler = run(checkpoint=self._checkpoint, resume=True)
+
+        self.assertEqual(resumed_collector.total, collector.total)
+        self.assertEqual(resumed_collector.counts, collector.counts)
+        self.assertEqual(resumed_profiler.report(), profiler.report())
+        self.assertEqual(
+            [str(error) for error in resumed_collector.errors[100:]], [str(error) for error in collector.errors[100:]]
+        )
+
+    def test_resume_spilled_keys(self):
+        with mock.patch.object(keys, "KEY_TABLE_SIZE", 16):
+            expected = self.validate(key_memory=1024)
+            with self.assertRaises(Interrupted):
+                self.validate(
+                    InterruptedValidator, limit=150, checkpoint=self._checkpoint, checkpoint_interval=0, key_memory=1024
+                )
+            output = self.validate(checkpoint=self._checkpoint, resume=True, key_memory=1024)
+        self.assertEqual(output, expected)
+        self.assertIn("Value is duplicate of row", output)
+
+    def test_changed_file(self):
+        with self.assertRaises(Interrupted):
+            self.validate(InterruptedValidator, limit=10, checkpoint=self._checkpoint, checkpoint_interval=0)
+        with open(self._path, "a") as f:
+            f.write("1001,1,x\n")
+        with self.assertRaises(ValueError):
+            self.validate(checkpoint=self._checkpoint, resume=True)
+
+    @unittest.skipUnless(hasattr(os, "getuid"), "POSIX only")
+    def test_untrusted_checkpoint(self):
+        with self.assertRaises(Interrupted):
+            self.validate(InterruptedValidator, limit=10, checkpoint=self._checkpoint, checkpoint_interval=0)
+        self.assertEqual(os.stat(self._checkpoint).st_mode & 0o777, 0o600)
+        os.chmod(self._checkpoint, 0o666)
+        with self.assertRaises(ValueError):
+            self.validate(checkpoint=self._checkpoint, resume=True)
+
+    def test_without_checkpoint(self):
+        # Resuming without a checkpoint checks the whole file
+        expected = self.validate()
+        self.assertEqual(self.validate(checkpoint=self._checkpoint, resume=True), expected)
+
+        with self.assertRaises(ValueError):
+            Validator(csvfile=self._path, schema=self._schema, checkpoint=self._checkpoint, jobs=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
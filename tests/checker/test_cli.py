@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*-coding: utf-8 -*-
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from pycsvschema import cli
+from tests import TEST_DIR
+
+
+class TestCommandLine(unittest.TestCase):
+    """Test that the command line validator validates files, globs and compressed files."""
+
+    def setUp(self):
+        self._this_dir = os.path.join(TEST_DIR, "checker")
+        self._schema = os.path.join(self._this_dir, "schema.json")
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._output = os.path.join(self._tmp_dir.name, "errors.txt")
+
+        self._invalid_gz = os.path.join(self._tmp_dir.name, "invalid.csv.gz")
+        with open(os.path.join(self._this_dir, "invalid.csv"), "rb") as f, gzip.open(self._invalid_gz, "wb") as gz:
+            shutil.copyfileobj(f, gz)
+        shutil.copy(os.path.join(self._this_dir, "example.csv"), self._tmp_dir.name)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def run_cli(self, *args):
+        status = cli.main([self._schema, *args, "--output", self._output])
+        with open(self._output) as f:
+            return status, f.read()
+
+    def test_valid(self):
+        status, output = self.run_cli(os.path.join(self._this_dir, "example.csv"))
+        self.assertEqual((status, output), (cli.EXIT_VALID, ""))
+
+    def test_compressed(self):
+        status, output = self.run_cli(self._invalid_gz)
+        self.assertEqual(status, cli.EXIT_INVALID)
+        lines = output.splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].startswith(self._invalid_gz + ": <ValidationError"))
+
+    def test_json(self):
+        pattern = os.path.join(self._tmp_dir.name, "*.csv*")
+        for jobs in ([], ["--jobs", "2"]):
+            status, output = self.run_cli(pattern, "--format", "jsonl", "--max-errors", "3", *jobs)
+            errors = [json.loads(line) for line in output.splitlines()]
+            self.assertEqual(status, cli.EXIT_INVALID)
+            self.assertEqual([error["rule"] for error in errors], ["type", "type", "minimum"])
+            self.assertEqual(errors[0]["file"], self._invalid_gz)
+
+        status, output = self.run_cli(pattern, "--format", "json")
+        report = json.loads(output)
+        self.assertEqual(len(report["errors"]), 4)
+        self.assertEqual(report["summary"]["total"], 4)
+
+    def test_failure(self):
+        self.assertEqual(cli.main([self._schema, os.path.join(self._tmp_dir.name, "missing.csv")]), cli.EXIT_FAILURE)
+        self.assertEqual(cli.main([self._schema, os.path.join(self._tmp_dir.name, "*.tsv")]), cli.EXIT_FAILURE)
+
+    def test_unreadable_file(self):
+        empty = os.path.join(self._tmp_dir.name, "empty.csv")
+        open(empty, "w").close()
+        malformed = os.path.join(self._tmp_dir.name, "malformed.csv")
+        with open(malformed, "w") as f:
+            f.write('id,name\n1,Ann,"a"b\n')
+
+        for path in (empty, malformed):
+            for options in ([], ["--memory-map"], ["--batch-size", "4"], ["--jobs", "2"]):
+                with self.subTest(path=path, options=options):
+                    self.assertEqual(cli.main([self._schema, path, *options]), cli.EXIT_FAILURE)
+        self.assertEqual(cli.main([self._schema, malformed, self._invalid_gz, "--jobs", "2"]), cli.EXIT_FAILURE)
+
+    def test_worker_max_errors(self):
+        with open(self._schema) as f:
+            options = {"schema": json.load(f)}
+        for max_errors, count in ((None, 4), (2, 2)):
+            cli._init_worker(options, max_errors)
+            self.assertEqual(len(cli._validate_file(self._invalid_gz)), count)
+
+
+if __name__ == "__main__":
+    unittest.main()
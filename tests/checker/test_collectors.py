@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*-coding: utf-8 -*-
+
+import json
+import os
+import unittest
+
+from pycsvschema.checker import Validator
+from pycsvschema.collectors import ErrorCollector
+from pycsvschema.exceptions import ValidationError
+from tests import TEST_DIR
+
+
+class TestErrorCollector(unittest.TestCase):
+    """Test that errors are collected with caps, early exit and sampling."""
+
+    def setUp(self):
+        self._this_dir = os.path.join(TEST_DIR, "checker")
+        with open(os.path.join(self._this_dir, "schema.json"), "r") as schema_stream:
+            self._schema = json.load(schema_stream)
+
+    def test_caps(self):
+        errors = (
+            ValidationError("Value is too large", column=str(i % 2), row_number=i, rule="maximum")
+            for i in range(1, 101)
+        )
+        collector = ErrorCollector(max_errors_per_column=10, max_errors_per_rule=15, samples=3, seed=0)
+        kept = list(collector.collect(errors))
+
+        self.assertEqual(collector.total, 100)
+        self.assertEqual(len(kept), 15)
+        self.assertEqual(kept, collector.errors)
+        summary = collector.summary()
+        self.assertEqual(summary["rules"], [{"rule": "maximum", "count": 100}])
+        self.assertEqual([item["count"] for item in summary["errors"]], [50, 50])
+        self.assertEqual([len(item["examples"]) for item in summary["errors"]], [3, 3])
+        json.dumps(summary)
+
+    def test_max_errors(self):
+        """Test that reading stops once max_errors is reached."""
+        consumed = []
+
+        def errors():
+            for i in range(1, 1000):
+                consumed.append(i)
+                yield ValidationError("Illegal null value", column="a", row_number=i, rule="nullable")
+
+        collector = ErrorCollector(max_errors=5)
+        self.assertEqual(len(list(collector.collect(errors()))), 5)
+        self.assertEqual(len(consumed), 5)
+        self.assertTrue(collector.stopped)
+
+    def test_validator(self):
+        collector = ErrorCollector(max_errors=2)
+        v = Validator(csvfile=os.path.join(self._this_dir, "invalid.csv"), schema=self._schema, collector=collector)
+        v.validate()
+        self.assertEqual([error.rule for error in collector.errors], ["type", "type"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*-coding: utf-8 -*-
+
+import bz2
+import gzip
+import io
+import json
+import lzma
+import os
+import tempfile
+import threading
+import unittest
+
+from pycsvschema import readers
+from pycsvschema.checker import Validator
+from pycsvschema.collectors import ErrorCollector
+from tests import TEST_DIR
+
+
+class TestCompression(unittest.TestCase):
+    """Test that compressed input is detected and decompressed while it is read."""
+
+    def setUp(self):
+        self._this_dir = os.path.join(TEST_DIR, "checker")
+        with open(os.path.join(self._this_dir, "schema.json"), "r") as schema_stream:
+            self._schema = json.load(schema_stream)
+        with open(os.path.join(self._this_dir, "invalid.csv"), "rb") as f:
+            self._data = f.read()
+        self._tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def errors(self, csvfile, **kwargs):
+        v = Validator(csvfile=csvfile, schema=self._schema, errors="coerce", **kwargs)
+        return [(error.rule, error.row_number) for error in v.iter_errors()]
+
+    def test_paths(self):
+        expected = self.errors(self._data)
+        self.assertEqual(len(expected), 4)
+        for name, compress in (("a.csv.gz", gzip.compress), ("a.csv.bz2", bz2.compress), ("a.xz", lzma.compress)):
+            # Magic number is detected without extension
+            for path in (os.path.join(self._tmp_dir.name, name), os.path.join(self._tmp_dir.name, "no-extension")):
+                with open(path, "wb") as f:
+                    f.write(compress(self._data))
+                self.assertEqual(self.errors(path), expected, path)
+                # Compressed file is checked in current process instead of being split
+                self.assertEqual(self.errors(path, jobs=2), expected, path)
+
+    def test_streams(self):
+        expected = self.errors(self._data)
+        compressed = gzip.compress(self._data)
+        self.assertEqual(self.errors(compressed), expected)
+        self.assertEqual(self.errors(io.BufferedReader(io.BytesIO(compressed))), expected)
+
+    def test_detect(self):
+        self.assertEqual(readers.detect_magic(gzip.compress(b"a")), "gzip")
+        self.assertEqual(readers.detect_magic(b"\x28\xb5\x2f\xfd\x00"), "zstd")
+        self.assertIsNone(readers.detect_magic(b"id,name\n"))
+        path = os.path.join(self._tmp_dir.name, "a.csv.zst")
+        with open(path, "wb") as f:
+            f.write(b"")
+        self.assertEqual(readers.detect_compression(path), "zstd")
+
+        # Plain CSV with the extension of a compression is read as it is
+        path = os.path.join(self._tmp_dir.name, "plain.csv.gz")
+        with open(path, "wb") as f:
+            f.write(self._data)
+        self.assertIsNone(readers.detect_compression(path))
+        self.assertEqual(self.errors(path), self.errors(self._data))
+
+    def test_stop_early(self):
+        """Test that the decompressing thread stops when reading stops before the end."""
+        path = os.path.join(self._tmp_dir.name, "large.csv.gz")
+        with gzip.open(path, "wb") as f:
+            f.write(b"name,e-mail,zipcode,donation\n" + b"Ben,ben-at-home,8500,50\n" * 200000)
+
+        threads = threading.active_count()
+        collector = ErrorCollector(max_errors=5)
+        Validator(csvfile=path, schema=self._schema, collector=collector).validate()
+        self.assertEqual(collector.total, 5)
+        self.assertEqual(threading.active_count(), threads)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*-coding: utf-8 -*-
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from pycsvschema import parallel
+from pycsvschema.checker import FeedValidator, Validator
+from pycsvschema.collectors import ErrorCollector
+from pycsvschema.instruments import Instruments
+from tests import TEST_DIR
+
+
+class TestInstruments(unittest.TestCase):
+    """Test that validators are counted and timed when instruments are given."""
+
+    def setUp(self):
+        self._this_dir = os.path.join(TEST_DIR, "checker")
+        with open(os.path.join(self._this_dir, "schema.json"), "r") as schema_stream:
+            self._schema = json.load(schema_stream)
+
+    def counts(self, report):
+        return {
+            (column["column"], validator["validator"]): (validator["calls"], validator["failures"])
+            for column in report["columns"]
+            for validator in column["validators"]
+        }
+
+    def run_instruments(self, csvfile, **kwargs):
+        reports = []
+        instruments = Instruments(callback=reports.append)
+        v = Validator(
+            csvfile=csvfile, schema=self._schema, collector=ErrorCollector(), instruments=instruments, **kwargs
+        )
+        v.validate()
+        self.assertEqual(reports, [instruments.report()])
+        return instruments.report()
+
+    def test_report(self):
+        report = self.run_instruments(os.path.join(self._this_dir, "invalid.csv"))
+        self.assertEqual(report["rows"], 3)
+        self.assertGreater(report["check_seconds"], 0)
+        self.assertGreater(report["parse_seconds"], 0)
+        self.assertEqual(
+            self.counts(report),
+            {
+                ("e-mail", "field_type"): (2, 1),
+                ("zipcode", "field_type"): (2, 1),
+                ("donation", "field_type"): (2, 0),
+                ("donation", "field_minimum"): (2, 1),
+            },
+        )
+        json.dumps(report)
+
+    def test_batch_and_jobs(self):
+        """Test that batch mode and multiple processes count the same calls and failures as checking rows."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_file = os.path.join(tmp_dir, "large.csv")
+            with open(csv_file, "w") as f:
+                f.write("name,e-mail,zipcode,donation\n")
+                for i in range(1, 2001):
+                    f.write("n{0},{0}@mail{1},{2:05d},{3}\n".format(i, "" if i % 5 else ".com", i % 300, i % 500))
+
+            expected = self.run_instruments(csv_file)
+            self.assertEqual(expected["rows"], 2000)
+            self.assertEqual(self.counts(self.run_instruments(csv_file, batch_size=128)), self.counts(expected))
+            with mock.patch.object(parallel, "MIN_CHUNK_SIZE", 1024):
+                report = self.run_instruments(csv_file, jobs=2)
+            self.assertEqual(self.counts(report), self.counts(expected))
+            self.assertEqual(report["rows"], 2000)
+
+    def test_feed(self):
+        instruments = Instruments()
+        feed = FeedValidator.from_validator(Validator(csvfile=None, schema=self._schema, instruments=instruments))
+        with open(os.path.join(self._this_dir, "invalid.csv"), "rb") as f:
+            feed.push(f.read())
+        feed.close()
+        self.assertEqual(self.counts(instruments.report())[("donation", "field_minimum")], (2, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*-coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from pycsvschema import keys
+from pycsvschema.checker import FeedValidator, Validator
+
+
+class TestKeys(unittest.TestCase):
+    """Test unique and primaryKey checked across rows."""
+
+    def setUp(self):
+        self._schema = {
+            "fields": [{"name": "id", "type": "integer", "unique": True}, {"name": "date"}, {"name": "name"}],
+            "primaryKey": ["name", "date"],
+        }
+        self._data = (
+            "id,date,name\n"
+            "1,2020-01-01,Ann\n"
+            "2,2020-01-01,Ben\n"
+            "1,2020-01-02,Ann\n"
+            ",2020-01-01,Ben\n"
+            ",2020-01-03,\n"
+            "3,2020-01-01,Ann\n"
+        )
+        self._expected = [
+            ("unique", 3, "id", 1),
+            ("primaryKey", 4, "name, date", 2),
+            ("primaryKey", 5, "name, date", ", 2020-01-03"),
+            ("primaryKey", 6, "name, date", 1),
+        ]
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._tmp_dir.name, "data.csv")
+        with open(self._path, "w") as f:
+            f.write(self._data)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def errors(self, csvfile, schema=None, **kwargs):
+        v = Validator(csvfile=csvfile, schema=schema or self._schema, errors="coerce", **kwargs)
+        return [(error.rule, error.row_number, error.column, error.value) for error in v.iter_errors()]
+
+    def test_keys(self):
+        self.assertEqual(self.errors(self._path), self._expected)
+        self.assertEqual(self.errors(self._path, batch_size=2), self._expected)
+        self.assertEqual(self.errors(self._path, memory_map=True), self._expected)
+        self.assertEqual(self.errors(self._path, jobs=2), self._expected)
+
+        v = Validator(csvfile=self._path, schema=self._schema, errors="coerce")
+        self.assertEqual(
+            [error.message for error in v.iter_errors()],
+            [
+                "Value is duplicate of row 1",
+                "Primary key is duplicate of row 2",
+                "Primary key (, 2020-01-03) has missing value",
+                "Primary key is duplicate of row 1",
+            ],
+        )
+
+    def test_feed(self):
+        feed = FeedValidator(self._schema)
+        errors = feed.push(self._data[:40]) + feed.push(self._data[40:]) + feed.close()
+        self.assertEqual(
+            [(error.rule, error.row_number, error.column, error.value) for error in errors], self._expected
+        )
+
+    def test_primary_key_not_in_header(self):
+        schema = {"fields": [{"name": "id"}], "primaryKey": "code"}
+        v = Validator(csvfile=self._path, schema=schema, errors="coerce")
+        self.assertEqual(
+            [(error.rule, error.row_number, error.message) for error in v.iter_errors()],
+            [("primaryKey", None, "code of primaryKey is not in header")],
+        )
+
+    def test_spill(self):
+        """Test that duplicates are found after keys are spilled to disk."""
+        lines = ["id,date,name"]
+        expected = []
+        for row_number in range(1, 20001):
+            lines.append("{0},{1},x".format(row_number % 15000, row_number))
+            if row_number > 15000:
+                expected.append(("unique", row_number, "id", row_number - 15000))
+        with open(self._path, "w") as f:
+            f.write("\n".join(lines))
+
+        for bloom_filter in (False, True):
+            with self.subTest(bloom_filter=bloom_filter):
+                errors = self.errors(
+                    self._path, key_memory=1 << 16, key_directory=self._tmp_dir.name, key_bloom_filter=bloom_filter
+                )
+                self.assertEqual(errors, expected)
+                # Spilled partitions are removed
+                self.assertEqual(os.listdir(self._tmp_dir.name), ["data.csv"])
+
+    def test_typed_keys(self):
+        """Test that keys are compared on values converted by the type of their fields."""
+        schema = {
+            "fields": [
+                {"name": "id", "type": "integer", "unique": True},
+                {"name": "amount", "type": "number", "unique": True},
+                {"name": "flag", "type": "boolean"},
+            ],
+            "primaryKey": ["id", "flag"],
+        }
+        with open(self._path, "w") as f:
+            f.write("id,amount,flag\n1,1.0,true\n01,1,false\n2,-0,True\nx,0,true\n2,2,TRUE\nx,3,1\n")
+        expected = [
+            ("unique", 2, "id", 1),
+            ("unique", 2, "amount", 1),
+            ("unique", 4, "amount", 3),
+            ("unique", 5, "id", 3),
+            ("primaryKey", 5, "id, flag", 3),
+            ("unique", 6, "id", 4),
+            ("primaryKey", 6, "id, flag", 4),
+        ]
+        for options in ({}, {"batch_size": 2}, {"jobs": 2}, {"key_memory": 1 << 10}):
+            with self.subTest(**options), mock.patch.object(keys, "KEY_TABLE_SIZE", 16):
+                errors = self.errors(self._path, schema=schema, key_directory=self._tmp_dir.name, **options)
+                # Duplicates of spilled keys come after all rows
+                errors = sorted((error for error in errors if error[0] != "type"), key=lambda error: error[1])
+                self.assertEqual(errors, expected)
+
+    def test_collision(self):
+        """Test that different keys sharing a fingerprint are not duplicates."""
+        collide = staticmethod(lambda key: 7)
+        with mock.patch.object(keys.KeyChecker, "fingerprint", collide), mock.patch.object(keys, "KEY_TABLE_SIZE", 16):
+            for options in (
+                {},
+                {"batch_size": 2},
+                {"key_memory": 1 << 10},
+                {"key_memory": 1 << 10, "key_bloom_filter": True},
+            ):
+                with self.subTest(**options):
+                    self.assertEqual(
+                        self.errors(self._path, key_directory=self._tmp_dir.name, **options), self._expected
+                    )
+
+    def test_fingerprint(self):
+        self.assertNotEqual(keys.key_bytes(["a,b", "c"], [None, None]), keys.key_bytes(["a", "b,c"], [None, None]))
+        self.assertEqual(keys.fingerprint(b"'a'"), keys.fingerprint(b"'a'"))
+
+        table = keys.FingerprintTable(8)
+        self.assertEqual(table.insert(3, b"a", 1), 0)
+        self.assertEqual(table.insert(11, b"b", 2), 0)
+        self.assertEqual(table.insert(3, b"a", 5), 1)
+        # A different key with the same fingerprint is not a duplicate
+        self.assertEqual(table.insert(3, b"c", 6), 0)
+        self.assertEqual(table.insert(3, b"c", 7), 6)
+        self.assertEqual(sorted(table.resized(32).items()), [(3, b"a", 1), (3, b"c", 6), (11, b"b", 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
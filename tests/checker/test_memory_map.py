@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*-coding: utf-8 -*-
+
+import json
+import os
+import tempfile
+import unittest
+
+from pycsvschema import readers
+from pycsvschema.checker import RFCDialect, Validator
+from tests import TEST_DIR
+
+
+class TestMemoryMap(unittest.TestCase):
+    """Test that memory-mapped files are parsed the same way as files read by csv.reader."""
+
+    def setUp(self):
+        self._this_dir = os.path.join(TEST_DIR, "checker")
+        with open(os.path.join(self._this_dir, "schema.json"), "r") as schema_stream:
+            self._schema = json.load(schema_stream)
+        self._tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def write(self, text, encoding="utf-8"):
+        path = os.path.join(self._tmp_dir.name, "data.csv")
+        with open(path, "w", encoding=encoding, newline="") as f:
+            f.write(text)
+        return path
+
+    def errors(self, csvfile, schema=None, **kwargs):
+        v = Validator(csvfile=csvfile, schema=schema or self._schema, errors="coerce", **kwargs)
+        return [(error.rule, error.row_number, error.column, error.message) for error in v.iter_errors()]
+
+    def test_errors(self):
+        path = os.path.join(self._this_dir, "invalid.csv")
+        expected = self.errors(path)
+        self.assertEqual(len(expected), 4)
+        self.assertEqual(self.errors(path, memory_map=True), expected)
+        self.assertEqual(self.errors(path, memory_map=True, batch_size=2), expected)
+        self.assertEqual(self.errors(path, memory_map=True, jobs=2), expected)
+
+    def test_records(self):
+        schema = {"fields": [{"name": "a", "type": "integer"}, {"name": "c", "maxLength": 3}]}
+        text = (
+            'a,b,c\r\n1,x,"multi\r\nline"\r\n2,"y, ""quoted""",abcd\r\n\r\nz,\r\n'
+            '3,lone\rcarriage,ok\n4,x,"unterminated'
+        )
+        for strict in (True, False):
+            with self.subTest(strict=strict):
+                path = self.write(text)
+                try:
+                    expected = self.errors(path, schema=schema, strict=strict)
+                except Exception as e:
+                    expected = repr(e)
+                try:
+                    actual = self.errors(path, schema=schema, strict=strict, memory_map=True)
+                except Exception as e:
+                    actual = repr(e)
+                self.assertEqual(actual, expected)
+
+    def test_select(self):
+        header = ["c{0}".format(i) for i in range(10)]
+        path = self.write(",".join(header) + "\n" + "\n".join(",".join(str(i) for i in range(10)) for _ in range(3)))
+        with readers.open_rows(path, dialect=RFCDialect, encoding="utf-8", memory_map=True) as rows:
+            self.assertIsInstance(rows, readers.MappedReader)
+            self.assertEqual(next(rows), header)
+            rows.select([7, 2], len(header))
+            row = next(rows)
+            self.assertEqual(len(row), 10)
+            self.assertEqual(row[2], "2")
+            self.assertEqual(row[7], "7")
+            self.assertEqual(row.count(None), 8)
+
+        schema = {"fields": [{"name": "c2", "type": "integer", "maximum": 1}]}
+        self.assertEqual(self.errors(path, schema=schema, memory_map=True), self.errors(path, schema=schema))
+
+    def test_encodings(self):
+        schema = {"fields": [{"name": "name", "maxLength": 3}]}
+        text = "name,id\nJosé,1\nAnn,2\n"
+        for encoding, mapped in (("utf-8", True), ("utf-8-sig", True), ("latin-1", True), ("utf-16", False)):
+            with self.subTest(encoding=encoding):
+                path = self.write(text, encoding=encoding)
+                self.assertEqual(readers.can_map(path, RFCDialect, encoding), mapped)
+                self.assertEqual(
+                    self.errors(path, schema=schema, encoding=encoding, memory_map=True),
+                    self.errors(path, schema=schema, encoding=encoding),
+                )
+
+        self.assertFalse(readers.can_map(self.write(""), RFCDialect, "utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
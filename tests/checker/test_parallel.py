@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*-coding: utf-8 -*-
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from pycsvschema import parallel
+from pycsvschema.checker import Validator
+from tests import TEST_DIR
+
+
+class TestParallel(unittest.TestCase):
+    """Test that a CSV file is split on record boundaries and checked in multiple processes."""
+
+    def setUp(self):
+        self._this_dir = os.path.join(TEST_DIR, "checker")
+        self._tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_record_boundaries(self):
+        """Test that quoted line breaks are not used as record boundaries."""
+        csv_file = os.path.join(self._tmp_dir.name, "quoted.csv")
+        with open(csv_file, "wb") as f:
+            f.write(b'id,text\n1,"a\nb"\n2,"c""\nd"\n3,e\n')
+
+        boundaries = parallel.find_record_boundaries(
+            csvfile=csv_file, quotechar=b'"', start=0, targets=list(range(0, 30)), block_size=4
+        )
+        self.assertEqual(boundaries, [8, 16, 26, 30])
+
+    def test_escaped_dialect(self):
+        """Test that files whose quote chars are escaped are not split by counting quote chars."""
+
+        class EscapedValidator(Validator):
+            def prepare_dialect(self):
+                return type("EscapedDialect", (super().prepare_dialect(),), {"escapechar": "\\", "doublequote": False})
+
+        csv_file = os.path.join(self._tmp_dir.name, "escaped.csv")
+        with open(csv_file, "w") as f:
+            f.write('id,"na\\"\nme"\n')
+            for i in range(5000):
+                f.write('{0},"a\\"\nb"\n'.format(i if i % 100 else "x"))
+        schema = {"fields": [{"name": "id", "type": "integer"}]}
+
+        def errors(**kwargs):
+            v = EscapedValidator(csvfile=csv_file, schema=schema, errors="coerce", **kwargs)
+            return [(error.rule, error.row_number) for error in v.iter_errors()]
+
+        dialect = EscapedValidator(csvfile=None, schema=schema).csv_dialect
+        self.assertFalse(parallel.can_split(dialect))
+        self.assertEqual(parallel.find_header_end(csv_file, dialect, "utf-8"), 13)
+        expected = errors()
+        self.assertEqual(len(expected), 50)
+        with mock.patch.object(parallel, "MIN_CHUNK_SIZE", 1024):
+            self.assertEqual(errors(jobs=2), expected)
+
+    def test_jobs(self):
+        """Test that errors from multiple processes are merged in the order of row number."""
+        with open(os.path.join(self._this_dir, "schema.json"), "r") as schema_stream:
+            schema = json.load(schema_stream)
+        csv_file = os.path.join(self._tmp_dir.name, "large.csv")
+        with open(os.path.join(self._this_dir, "invalid.csv"), "r") as invalid, open(csv_file, "w") as f:
+            header, *rows = invalid.readlines()
+            f.write(header)
+            for _ in range(20000):
+                f.writelines(rows)
+
+        outputs = []
+        spool_dir = os.path.join(self._tmp_dir.name, "spool")
+        os.mkdir(spool_dir)
+        for jobs in (None, 3):
+            output = os.path.join(self._tmp_dir.name, "errors.txt")
+            v = Validator(csvfile=csv_file, schema=schema, output=output, errors="coerce", jobs=jobs)
+            # Errors of a chunk are spooled in several batches
+            with mock.patch.object(parallel, "MIN_CHUNK_SIZE", 1024), mock.patch.object(
+                parallel, "ERROR_BATCH_SIZE", 100
+            ), mock.patch.object(tempfile, "tempdir", spool_dir):
+                v.validate()
+            with open(output, "r") as output_stream:
+                outputs.append(output_stream.read())
+
+        # Spooled errors are removed, also if errors are not read to the end
+        v = Validator(csvfile=csv_file, schema=schema, errors="coerce", jobs=3)
+        with mock.patch.object(parallel, "MIN_CHUNK_SIZE", 1024), mock.patch.object(tempfile, "tempdir", spool_dir):
+            errors = v.iter_errors()
+            next(errors)
+            errors.close()
+        self.assertEqual(os.listdir(spool_dir), [])
+
+        with mock.patch.object(parallel, "MIN_CHUNK_SIZE", 1024):
+            self.assertEqual(len(parallel.split_records(csv_file, b'"', 12)[1]), 12)
+        self.assertEqual(outputs[0], outputs[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
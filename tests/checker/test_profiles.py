@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*-coding: utf-8 -*-
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from pycsvschema import parallel, profiles
+from pycsvschema.checker import Validator
+from pycsvschema.collectors import ErrorCollector
+from pycsvschema.profiles import DistinctCounter, HyperLogLog, Profiler
+from tests import TEST_DIR
+
+
+class TestProfiler(unittest.TestCase):
+    """Test that columns are profiled while they are validated."""
+
+    def setUp(self):
+        self._this_dir = os.path.join(TEST_DIR, "checker")
+        with open(os.path.join(self._this_dir, "schema.json"), "r") as schema_stream:
+            self._schema = json.load(schema_stream)
+
+    def profile(self, csvfile, **kwargs):
+        profiler = Profiler()
+        v = Validator(csvfile=csvfile, schema=self._schema, collector=ErrorCollector(), profiler=profiler, **kwargs)
+        v.validate()
+        return profiler.report()
+
+    def test_report(self):
+        report = self.profile(os.path.join(self._this_dir, "invalid.csv"))
+        self.assertEqual(report["rows"], 3)
+        self.assertEqual(report["malformed_rows"], 1)
+
+        columns = {column["column"]: column for column in report["columns"]}
+        self.assertEqual(sorted(columns), ["donation", "e-mail", "zipcode"])
+        donation = columns["donation"]
+        self.assertEqual((donation["count"], donation["missing"]), (2, 0))
+        self.assertEqual((donation["minimum"], donation["maximum"]), (50, 1000))
+        self.assertEqual(donation["errors"], {"minimum": 1})
+        self.assertEqual(columns["zipcode"]["distinct"], 2)
+        self.assertEqual((columns["zipcode"]["min_length"], columns["zipcode"]["max_length"]), (4, 5))
+        json.loads(Profiler().to_json())
+
+    def test_missing(self):
+        report = self.profile(b"name,e-mail,zipcode,donation\nAnn,,,\nBen,,12345,\n")
+        columns = {column["column"]: column for column in report["columns"]}
+        self.assertEqual(columns["e-mail"]["missing"], 2)
+        self.assertEqual(columns["e-mail"]["missing_ratio"], 1.0)
+        self.assertIsNone(columns["donation"]["minimum"])
+
+    def test_batch_and_jobs(self):
+        """Test that batch mode and multiple processes report the same profile as checking rows one by one."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_file = os.path.join(tmp_dir, "large.csv")
+            with open(csv_file, "w") as f:
+                f.write("name,e-mail,zipcode,donation\n")
+                for i in range(1, 2001):
+                    f.write("n{0},{0}@mail.com,{1:05d},{2}\n".format(i, i % 300, "" if i % 7 == 0 else i * 3))
+
+            expected = self.profile(csv_file)
+            self.assertEqual(self.profile(csv_file, batch_size=128), expected)
+            with mock.patch.object(parallel, "MIN_CHUNK_SIZE", 1024):
+                self.assertEqual(self.profile(csv_file, jobs=2), expected)
+
+    def test_hyperloglog(self):
+        a, b = HyperLogLog(), HyperLogLog()
+        for i in range(20000):
+            (a if i % 2 else b).add(str(i))
+        a.merge(b)
+        self.assertAlmostEqual(a.count(), 20000, delta=20000 * 0.05)
+
+    def test_distinct_counter(self):
+        """Test that distinct values are counted exactly until they outgrow the set."""
+        with mock.patch.object(profiles, "DISTINCT_EXACT_LIMIT", 100):
+            a, b = DistinctCounter(), DistinctCounter()
+            for i in range(300):
+                a.add(str(i % 60))
+                b.add(str(i % 90 + 30))
+            self.assertEqual((a.count(), b.count()), (60, 90))
+            self.assertIsNone(a.hyperloglog)
+
+            # Union of 120 values outgrows the set
+            a.merge(b)
+            self.assertIsNone(a.values)
+            self.assertAlmostEqual(a.count(), 120, delta=3)
+
+            c = DistinctCounter()
+            for i in range(10):
+                c.add(str(i))
+            c.merge(a)
+            self.assertEqual(c.count(), a.count())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*-coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from pycsvschema import parallel, references
+from pycsvschema.checker import Validator
+
+
+class TestReferences(unittest.TestCase):
+    """Test reference of fields checked against a field of another CSV file."""
+
+    def setUp(self):
+        references.clear_cache()
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._countries = os.path.join(self._tmp_dir.name, "countries.csv")
+        with open(self._countries, "w") as f:
+            f.write("name,code\nFrance,FR\nJapan,JP\nPeru,PE\n")
+        self._schema = {
+            "fields": [
+                {"name": "id", "type": "integer"},
+                {"name": "country", "reference": {"file": self._countries, "field": "code"}},
+            ]
+        }
+        self._path = os.path.join(self._tmp_dir.name, "data.csv")
+        with open(self._path, "w") as f:
+            f.write("id,country\n")
+            for row_number in range(1, 2001):
+                f.write("{0},{1}\n".format(row_number, ["FR", "JP", "PE", "", "XX"][row_number % 5]))
+        self._expected = [("reference", row_number, "country", "XX") for row_number in range(4, 2001, 5)]
+
+    def tearDown(self):
+        references.clear_cache()
+        self._tmp_dir.cleanup()
+
+    def errors(self, schema=None, **kwargs):
+        v = Validator(csvfile=self._path, schema=schema or self._schema, errors="coerce", **kwargs)
+        return [(error.rule, error.row_number, error.column, error.value) for error in v.iter_errors()]
+
+    def test_reference(self):
+        self.assertEqual(self.errors(), self._expected)
+        self.assertEqual(self.errors(batch_size=64), self._expected)
+        self.assertEqual(self.errors(memory_map=True), self._expected)
+        with mock.patch.object(parallel, "MIN_CHUNK_SIZE", 1024):
+            self.assertEqual(self.errors(jobs=2), self._expected)
+            self.assertEqual(self.errors(jobs=2, batch_size=64), self._expected)
+
+        v = Validator(csvfile=self._path, schema=self._schema, errors="coerce")
+        self.assertEqual(next(v.iter_errors()).message, "Value XX is not in code of " + self._countries)
+
+    def test_numeric_reference(self):
+        with open(self._countries, "w") as f:
+            f.write("id\n1\n2\n3\n4\nx\n")
+        schema = {
+            "fields": [
+                {"name": "id", "type": "integer", "reference": {"file": self._countries, "field": "id"}},
+                {"name": "country"},
+            ]
+        }
+        self.assertEqual(
+            self.errors(schema=schema, batch_size=100),
+            [("reference", row_number, "id", row_number) for row_number in range(5, 2001)],
+        )
+
+    def test_cache(self):
+        self.errors()
+        index = references.load_index(self._schema["fields"][1]["reference"])
+
+        # Same content with a new mtime keeps the index
+        os.utime(self._countries, ns=(0, 0))
+        self.assertIs(references.load_index(self._schema["fields"][1]["reference"]), index)
+
+        with open(self._countries, "a") as f:
+            f.write("Unknown,XX\n")
+        self.assertEqual(self.errors(), [])
+
+    def test_exported_indexes(self):
+        indexes = references.export_indexes([self._schema["fields"][1]["reference"]])
+        references.clear_cache()
+        references.install_indexes(indexes)
+        with mock.patch.object(references, "read_index") as read_index:
+            self.assertEqual(self.errors(), self._expected)
+        read_index.assert_not_called()
+
+    def test_invalid_reference(self):
+        schema = {"fields": [{"name": "country", "reference": {"file": self._countries, "field": "iso"}}]}
+        with self.assertRaises(ValueError):
+            self.errors(schema=schema)
+
+
+if __name__ == "__main__":
+    unittest.main()
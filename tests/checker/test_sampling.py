@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*-coding: utf-8 -*-
+
+import gzip
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from pycsvschema import sampling
+from pycsvschema.checker import Validator
+from pycsvschema.sampling import Sampler
+
+
+class TestSampling(unittest.TestCase):
+    """Test checking the head and a sample of rows with estimated error rates."""
+
+    def setUp(self):
+        self._schema = {
+            "fields": [
+                {"name": "id", "type": "integer", "minimum": 1},
+                {"name": "value", "type": "integer", "maximum": 89},
+                {"name": "text", "enum": ["x", "a\nb,c"]},
+            ]
+        }
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._tmp_dir.name, "data.csv")
+        with open(self._path, "w") as f:
+            f.write("id,value,text\n")
+            for row_number in range(1, 20001):
+                # Every 10th value fails maximum, every 7th text is a quoted field with a line break
+                text = '"a\nb,c"' if row_number % 7 == 0 else "x"
+                f.write("{0},{1},{2}\n".format(row_number, row_number % 100, text))
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def errors(self, sampler, csvfile=None):
+        v = Validator(csvfile=csvfile or self._path, schema=self._schema, errors="coerce", sampler=sampler)
+        return list(v.iter_errors())
+
+    def test_sample(self):
+        for method in ("stratified", "random"):
+            with mock.patch.object(sampling, "SAMPLE_BLOCK_SIZE", 1024):
+                sampler = Sampler(fraction=0.1, head=100, method=method, seed=1, fail_fast=False)
+            errors = self.errors(sampler)
+
+            # Sampled rows are parsed from record boundaries, so only values fail
+            self.assertEqual(set(error.rule for error in errors), {"maximum"})
+            self.assertEqual(
+                [error.row_number for error in errors if error.row_number is not None], list(range(90, 100))
+            )
+            self.assertFalse(sampler.complete)
+            self.assertEqual((sampler.head_rows, sampler.head_errors), (100, 10))
+            self.assertGreater(sampler.blocks, 10)
+            self.assertGreater(sampler.rows, 1000)
+
+            estimates = sampler.report()["estimates"]
+            self.assertEqual([(item["column"], item["rule"]) for item in estimates], [("value", "maximum")])
+            self.assertLess(estimates[0]["low"], 0.1)
+            self.assertGreater(estimates[0]["high"], 0.1)
+
+    def test_head(self):
+        sampler = Sampler(fraction=0.01, head=95)
+        errors = self.errors(sampler)
+        self.assertEqual([error.row_number for error in errors], list(range(90, 96)))
+        self.assertTrue(sampler.stopped)
+        self.assertEqual(sampler.report()["estimates"], [])
+
+    def test_complete(self):
+        expected = [(error.row_number, error.rule) for error in self.errors(None)]
+        sampler = Sampler(fraction=1, head=10)
+        self.assertEqual([(error.row_number, error.rule) for error in self.errors(sampler)], expected)
+        self.assertTrue(sampler.complete)
+        self.assertEqual(sampler.rows, 20000)
+        self.assertEqual(
+            sampler.estimates(),
+            [{"column": "value", "rule": "maximum", "rows": 2000, "rate": 0.1, "low": 0.1, "high": 0.1}],
+        )
+
+    def test_stream(self):
+        compressed = self._path + ".gz"
+        with open(self._path, "rb") as f, gzip.open(compressed, "wb") as g:
+            g.write(f.read())
+
+        sampler = Sampler(fraction=0.1, seed=1)
+        errors = self.errors(sampler, csvfile=compressed)
+        self.assertTrue(all(error.row_number % 100 >= 90 for error in errors))
+        self.assertEqual(sampler.blocks, 0)
+        self.assertAlmostEqual(sampler.rows, 2000, delta=300)
+
+    def test_resync(self):
+        with open(self._path, "rb") as f:
+            data = f.read()
+        dialect = Validator(csvfile=None, schema=self._schema).csv_dialect
+        with open(self._path, "rb") as f:
+            # The line break in the quoted field of row 7 is not a record boundary
+            offset = data.index(b"a\nb") + 2
+            start = sampling.resync(f, offset, 1024, dialect, "utf-8", 3)
+        self.assertEqual(data[start:].split(b"\n", 1)[0], b"8,8,x")
+
+    def test_wilson_interval(self):
+        low, high = sampling.wilson_interval(10, 100, sampling.z_score(0.95))
+        self.assertAlmostEqual(sampling.z_score(0.95), 1.959964, places=5)
+        self.assertAlmostEqual(low, 0.0552, places=4)
+        self.assertAlmostEqual(high, 0.1744, places=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
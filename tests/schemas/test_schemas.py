@@ -6,7 +6,7 @@ import os
 import unittest
 
 import jsonschema
-from pycsvschema import definitions
+from pycsvschema import checker, definitions
 from tests import TEST_DIR
 
 
@@ -33,6 +33,17 @@ class TestSchemas(unittest.TestCase):
         schema_file = os.path.join(self._this_dir, filename)
         self.valdiate_schema(schema_file)
 
+    def test_validate_schema_memoized(self):
+        """Test that valid schemas are memoized by content and invalid schemas always raise."""
+        schema = {"fields": [{"name": "col1", "type": "integer", "maximum": 10}]}
+        checker.validate_schema(dict(schema))
+        cached = len(checker._valid_schemas)
+        checker.validate_schema(dict(schema))
+        self.assertEqual(len(checker._valid_schemas), cached)
+
+        for _ in range(2):
+            with self.assertRaises(jsonschema.ValidationError):
+                checker.validate_schema({"fields": [{"name": 1}]})
 
 
 if __name__ == "__main__":
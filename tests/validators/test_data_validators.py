@@ -0,0 +1,52 @@
+#!/usr/bin/python
+# -*-coding: utf-8 -*-
+
+import pickle
+import unittest
+
+from pycsvschema.exceptions import ValidationError
+from pycsvschema.validators import data_validators
+
+
+class TestDataValidators(unittest.TestCase):
+    """Test that compiled field validators return lazy error records."""
+
+    def test_error_record(self):
+        check = data_validators.field_enum(schema={}, field_schema={"name": "code", "enum": ["{a}", "b"]})
+        cell = data_validators.Cell(value="c", row_number=3, column_name="code", column_index=1)
+        error = check(cell)
+
+        self.assertEqual((error.rule, error.value, error.column, error.column_index), ("enum", "c", "code", 1))
+        self.assertEqual(error.message, "Value c is not in enum of ['{a}', 'b']")
+        self.assertEqual(str(error), str(error.to_exception()))
+        self.assertIsInstance(error.to_exception(), ValidationError)
+        self.assertEqual(str(pickle.loads(pickle.dumps(error))), str(error))
+        self.assertIsNone(check(data_validators.Cell(value="b", row_number=4)))
+
+    def test_type_converts_cell(self):
+        check = data_validators.field_type(schema={}, field_schema={"name": "n", "type": "number"})
+        cell = data_validators.Cell(value="1.5", row_number=1)
+        self.assertIsNone(check(cell))
+        self.assertEqual(cell.value, 1.5)
+
+        cell = data_validators.Cell(value="x", row_number=2)
+        self.assertEqual(check(cell).message, "Value x does not satisfy the type or format")
+        self.assertIsNone(cell.value)
+
+    def test_enum_values(self):
+        """Test that enum items are prepared once in the type of converted cell values."""
+        enum = data_validators.enum_values({"type": "number", "enum": [1, 2.5]})
+        self.assertIsInstance(enum, frozenset)
+        self.assertEqual([type(item) for item in sorted(enum)], [float, float])
+        self.assertIsInstance(data_validators.enum_values({"enum": ["a"]}), frozenset)
+
+        schema = {"missingValues": ["NA"]}
+        self.assertEqual(data_validators.find_missing_values(schema), frozenset(["NA"]))
+        missingvalues = data_validators.missingvalues(schema=schema, column_validators={})
+        cell = data_validators.Cell(value="NA")
+        missingvalues(cell)
+        self.assertIsNone(cell.value)
+
+
+if __name__ == "__main__":
+    unittest.main()
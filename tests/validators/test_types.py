@@ -0,0 +1,119 @@
+#!/usr/bin/python
+# -*-coding: utf-8 -*-
+
+import concurrent.futures
+import unittest
+
+from pycsvschema.validators import types
+
+
+class TestStringValidator(unittest.TestCase):
+    """Test that string formats and patterns are resolved once and validate values."""
+
+    def assert_values(self, field_schema, passed, failed):
+        validator = types.StringValidator(field_schema=field_schema)
+        for value in passed:
+            self.assertEqual(validator.validate(value), (True, value), value)
+        for value in failed:
+            self.assertEqual(validator.validate(value), (False, value), value)
+
+    def test_formats(self):
+        self.assert_values({"format": "email"}, ["ann@mail.com"], ["ann-at-mail"])
+        self.assert_values({"format": "hostname"}, ["example.com"], ["-example.com"])
+        self.assert_values({"format": "ipv4"}, ["127.0.0.1"], ["127.0.0.256"])
+        self.assert_values({"format": "ipv6"}, ["::1"], ["127.0.0.1"])
+        self.assert_values({"format": "uuid"}, ["0f6a4c4e-8a3b-4a1e-9c55-2d5b8f1b7a10"], ["0f6a4c4e"])
+        self.assert_values({"format": "uri"}, ["https://example.com/a"], ["example"])
+        self.assert_values(
+            {"format": "datetime", "datetimePattern": "%Y-%m-%d"}, ["2020-02-29"], ["2019-02-29", "2020-1-1x"]
+        )
+
+    def test_datetime(self):
+        """Test that compiled datetime checkers agree with strptime."""
+        values = {
+            "%Y-%m-%dT%H:%M:%S.%f%z": [
+                "2020-02-29T23:59:59.5+08:00",
+                "2020-2-9T1:2:3.123456Z",
+                "2019-02-29T00:00:00.0+0000",
+                "2020-01-01T00:00:60.0+0000",
+                "2020-01-01T00:00:00.0+24:00",
+                "2020-01-01T00:00:00.0-23:59:59.999999",
+                "2020-01-01T00:00:00.0+01:0000",
+                "0000-01-01T00:00:00.0Z",
+                "2020-01-01T00:00:00.0z",
+                "2020-01-01T00:00:00.0Z ",
+            ],
+            "%d/%m/%y": ["29/02/68", "29/02/69", " 1/1/00", "31/04/20"],
+            "%m-%d": ["02-28", "02-29"],
+            "%Y %y": ["1999 20", "2020 99"],
+            "%b %d %Y": ["Feb 29 2020", "feb 29 2019"],
+            "%Y-%m-%d %": ["2020-01-01 %"],
+            "(%Y) [%m]|%d+": ["(2020) [02]|29+", "(2020) [2]|30+", "2020 02 29"],
+            "%Y  %m\t%d": ["2020 \t 02 29", "2020 02\n29", "2020-02-29"],
+            "%H%%%M": ["23%59", "24%00"],
+        }
+        for pattern, pattern_values in values.items():
+            checker = types.compile_datetime_checker(pattern)
+            for value in pattern_values:
+                self.assertEqual(checker(value), types.check_strptime(value, pattern), (pattern, value))
+
+    def test_pattern(self):
+        self.assert_values({"pattern": r"\d{5}"}, ["06001", "123456"], ["8500", "a1234"])
+        # pattern is ignored when format is defined
+        self.assert_values({"format": "email", "pattern": r"\d{5}"}, ["ann@mail.com"], ["06001"])
+
+    def test_null(self):
+        self.assertEqual(types.StringValidator(field_schema={"format": "email"}).validate(None), (True, None))
+
+
+class TestNumericValidator(unittest.TestCase):
+    """Test that numeric validators return converted values."""
+
+    def test_number(self):
+        validator = types.NumberValidator(field_schema={"groupChar": ","})
+        self.assertEqual(validator.validate("1,000.5"), (True, 1000.5))
+        self.assertEqual(validator.validate("abc"), (False, None))
+
+    def test_integer(self):
+        validator = types.IntegerValidator(field_schema={})
+        self.assertEqual(validator.validate("42"), (True, 42))
+        self.assertEqual(validator.validate("4.2"), (False, None))
+
+    def test_boolean(self):
+        validator = types.BooleanValidator(field_schema={"trueValues": ["Y"], "falseValues": ["N"]})
+        self.assertEqual(validator.validate("Y"), (True, True))
+        self.assertEqual(validator.validate("N"), (True, False))
+        self.assertEqual(validator.validate("true"), (False, None))
+
+
+class TestSharedValidator(unittest.TestCase):
+    """Test that one type validator checks all values of a column without keeping the state of any value."""
+
+    def test_interleaved(self):
+        cases = [
+            (types.IntegerValidator(field_schema={}), [("1", (True, 1)), ("x", (False, None)), ("2", (True, 2))]),
+            (
+                types.StringValidator(field_schema={"format": "email"}),
+                [
+                    ("ann@mail.com", (True, "ann@mail.com")),
+                    ("ann", (False, "ann")),
+                    ("b@mail.com", (True, "b@mail.com")),
+                ],
+            ),
+        ]
+        for validator, results in cases:
+            # A failing value does not change the result of the next one
+            for _ in range(2):
+                for value, expected in results:
+                    self.assertEqual(validator.validate(value), expected, value)
+
+    def test_threads(self):
+        validator = types.IntegerValidator(field_schema={"groupChar": ","})
+        values = ["{0:,}".format(i) if i % 3 else "x{0}".format(i) for i in range(1000)]
+        expected = [(True, i) if i % 3 else (False, None) for i in range(1000)]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            self.assertEqual(list(executor.map(validator.validate, values)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()